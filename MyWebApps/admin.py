@@ -2,7 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import (
     Usuario, Categoria, Empresa, PerfilPostulante,
-    OfertaTrabajo, Postulacion, Favorito, Notificacion
+    OfertaTrabajo, Postulacion, Favorito, Notificacion, EventoNotificacion,
+    BusquedaGuardada
 )
 
 
@@ -72,7 +73,10 @@ class OfertaTrabajoAdmin(admin.ModelAdmin):
     list_filter = ['estado', 'modalidad', 'tipo_contrato', 'nivel_experiencia', 'aprobada_admin', 'categoria']
     search_fields = ['titulo', 'descripcion', 'empresa__nombre_empresa']
     ordering = ['-fecha_publicacion', '-fecha_creacion']
-    readonly_fields = ['vistas', 'fecha_creacion', 'fecha_actualizacion', 'fecha_aprobacion']
+    readonly_fields = [
+        'vistas', 'postulaciones_total', 'postulaciones_pendiente', 'postulaciones_aceptado',
+        'fecha_creacion', 'fecha_actualizacion', 'fecha_aprobacion'
+    ]
 
     fieldsets = (
         ('Información Básica', {
@@ -94,7 +98,7 @@ class OfertaTrabajoAdmin(admin.ModelAdmin):
             'fields': ('estado', 'aprobada_admin', 'fecha_aprobacion')
         }),
         ('Estadísticas', {
-            'fields': ('vistas', 'fecha_creacion', 'fecha_actualizacion')
+            'fields': ('vistas', 'postulaciones_total', 'postulaciones_pendiente', 'postulaciones_aceptado', 'fecha_creacion', 'fecha_actualizacion')
         }),
     )
 
@@ -154,3 +158,24 @@ class NotificacionAdmin(admin.ModelAdmin):
             'fields': ('leida', 'fecha_creacion', 'fecha_leida')
         }),
     )
+
+
+@admin.register(EventoNotificacion)
+class EventoNotificacionAdmin(admin.ModelAdmin):
+    """Admin para la cola de eventos de notificación"""
+
+    list_display = ['clave', 'tipo', 'estado', 'notificados', 'intentos', 'fecha_creacion', 'fecha_procesado']
+    list_filter = ['tipo', 'estado']
+    search_fields = ['clave']
+    ordering = ['-fecha_creacion']
+    readonly_fields = ['cursor', 'notificados', 'ultimo_error', 'fecha_creacion', 'fecha_procesado']
+
+
+@admin.register(BusquedaGuardada)
+class BusquedaGuardadaAdmin(admin.ModelAdmin):
+    """Admin para las búsquedas guardadas (alertas de empleo)"""
+
+    list_display = ['usuario', 'texto', 'categoria', 'modalidad', 'ubicacion', 'clave_indice', 'activa', 'fecha_creacion']
+    list_filter = ['activa', 'modalidad', 'tipo_contrato']
+    search_fields = ['usuario__email', 'texto', 'ubicacion', 'clave_indice']
+    readonly_fields = ['clave_indice', 'fecha_creacion']
@@ -0,0 +1,116 @@
+import re
+from bisect import bisect_left
+
+from django.db import transaction
+
+from . import match
+from .models import BusquedaGuardada, CoincidenciaAlerta
+
+# Alertas de ofertas nuevas a partir de búsquedas guardadas
+# Cada búsqueda se indexa por un solo término, el más selectivo que tenga
+# (clave_indice): el prefijo de su palabra más larga, su categoría, su
+# ubicación, su tipo de contrato o su modalidad, en ese orden. Una oferta nueva
+# genera todas las claves que podría satisfacer (los prefijos de sus palabras,
+# su categoría, etc.), y solo las búsquedas con esas claves se comprueban por
+# completo. El costo depende de las búsquedas candidatas, no del total guardado.
+#
+# El texto se compara como en el buscador: cada palabra de la búsqueda debe ser
+# el comienzo de alguna palabra de la oferta (título, descripción, requisitos o
+# empresa). La ubicación se compara como contenido, pero para encontrar la
+# búsqueda debe coincidir con el comienzo de una palabra de la ubicación.
+#
+# Los usuarios que coinciden se guardan en CoincidenciaAlerta, así el worker de
+# notificaciones los lee con una subconsulta en cada bloque en vez de arrastrar
+# una lista de ids que crece con las búsquedas guardadas.
+
+LARGO_PREFIJO = 4           # Caracteres de la palabra usados como clave
+MAXIMO_POR_USUARIO = 20
+CLAVE_TODAS = '*'           # Búsquedas sin filtros: reciben todas las ofertas
+
+
+def palabras(texto):
+    """Palabras en minúsculas y sin tildes, como las tokeniza el índice de búsqueda"""
+    return re.findall(r'\w+', match.normalizar(texto))
+
+
+def _clave_palabras(prefijo, texto):
+    terminos = palabras(texto)
+    if not terminos:
+        return None
+    return f'{prefijo}:{max(terminos, key=len)[:LARGO_PREFIJO]}'
+
+
+def clave_indice(busqueda):
+    """Clave por la que se indexa una búsqueda guardada"""
+    return (
+        _clave_palabras('texto', busqueda.texto) or
+        (busqueda.categoria_id and f'categoria:{busqueda.categoria_id}') or
+        _clave_palabras('ubicacion', busqueda.ubicacion) or
+        (busqueda.tipo_contrato and f'tipo_contrato:{busqueda.tipo_contrato}') or
+        (busqueda.modalidad and f'modalidad:{busqueda.modalidad}') or
+        CLAVE_TODAS
+    )
+
+
+def _prefijos(prefijo, terminos):
+    return {f'{prefijo}:{termino[:n]}' for termino in terminos for n in range(1, LARGO_PREFIJO + 1)}
+
+
+def _datos_oferta(oferta):
+    """(claves, palabras ordenadas, ubicación normalizada) de una oferta"""
+    texto = ' '.join(filter(None, [
+        oferta.titulo, oferta.descripcion, oferta.requisitos, oferta.empresa.nombre_empresa,
+    ]))
+    terminos = sorted(set(palabras(texto)))
+    claves = {
+        CLAVE_TODAS,
+        f'categoria:{oferta.categoria_id}',
+        f'tipo_contrato:{oferta.tipo_contrato}',
+        f'modalidad:{oferta.modalidad}',
+    }
+    claves |= _prefijos('texto', terminos)
+    claves |= _prefijos('ubicacion', palabras(oferta.ubicacion))
+    return claves, terminos, match.normalizar(oferta.ubicacion)
+
+
+def coincide(busqueda, oferta, terminos, ubicacion):
+    """Comprobar todos los filtros de una búsqueda contra la oferta"""
+    if busqueda.categoria_id and busqueda.categoria_id != oferta.categoria_id:
+        return False
+    if busqueda.modalidad and busqueda.modalidad != oferta.modalidad:
+        return False
+    if busqueda.tipo_contrato and busqueda.tipo_contrato != oferta.tipo_contrato:
+        return False
+    if busqueda.ubicacion and match.normalizar(busqueda.ubicacion).strip() not in ubicacion:
+        return False
+    for palabra in palabras(busqueda.texto):
+        i = bisect_left(terminos, palabra)
+        if i == len(terminos) or not terminos[i].startswith(palabra):
+            return False
+    return True
+
+
+def buscar_coincidencias(oferta, bloque=500):
+    """Búsquedas guardadas activas que coinciden con la oferta"""
+    claves, terminos, ubicacion = _datos_oferta(oferta)
+    claves = list(claves)
+    coincidencias = []
+    for i in range(0, len(claves), bloque):
+        candidatas = BusquedaGuardada.objects.filter(activa=True, clave_indice__in=claves[i:i + bloque])
+        coincidencias.extend(
+            busqueda for busqueda in candidatas
+            if coincide(busqueda, oferta, terminos, ubicacion)
+        )
+    return coincidencias
+
+
+def registrar_coincidencias(oferta):
+    """Guardar en CoincidenciaAlerta los usuarios cuyas búsquedas coinciden con la oferta; devuelve cuántos"""
+    usuarios = {busqueda.usuario_id for busqueda in buscar_coincidencias(oferta)}
+    with transaction.atomic():
+        CoincidenciaAlerta.objects.filter(oferta=oferta).delete()
+        CoincidenciaAlerta.objects.bulk_create(
+            [CoincidenciaAlerta(oferta=oferta, usuario_id=usuario_id) for usuario_id in usuarios],
+            batch_size=1000,
+        )
+    return len(usuarios)
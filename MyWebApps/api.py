@@ -0,0 +1,284 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from . import busqueda, facetas, portada
+from .models import Categoria, Empresa, OfertaTrabajo
+from .paginacion import PaginadorCursor
+
+# API JSON de solo lectura: ofertas, categorías y empresas
+# Cada recurso publica un conjunto fijo de campos (nombre en la API -> ruta del
+# ORM). Con ?fields= se eligen algunos y la consulta pide solo esas columnas
+# con values(), sin crear instancias de modelo; fechas y decimales se
+# convierten por columna y la página se serializa con un solo json.dumps.
+# Los listados se paginan por cursor (mismo paginador que el HTML).
+#
+# Las respuestas a usuarios anónimos se guardan en caché ya serializadas, con
+# una clave que incluye la URL completa y las generaciones de facetas y
+# portada (suben con cada cambio de ofertas, empresas o categorías), y se
+# envían con Cache-Control public para CDNs y proxies. Las de usuarios con
+# sesión son privadas y no se guardan.
+
+# Mismos órdenes que el listado HTML
+ORDENES_OFERTAS = ['-fecha_publicacion', 'fecha_publicacion', '-salario_max', '-vistas', 'relevancia']
+
+POR_PAGINA = getattr(settings, 'API_POR_PAGINA', 20)
+MAXIMO_POR_PAGINA = 100
+TTL = getattr(settings, 'API_CACHE_TTL', 60)
+
+# Subir al cambiar el formato de las respuestas, así no se sirven las viejas
+VERSION = 1
+
+
+class ErrorApi(Exception):
+    """Error con el código HTTP que debe responderse"""
+
+    def __init__(self, mensaje, estado=400):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _convertidor(campo):
+    if isinstance(campo, (models.DateTimeField, models.DateField)):
+        return lambda valor: valor.isoformat()
+    if isinstance(campo, models.DecimalField):
+        return str
+    return None
+
+
+class Recurso:
+    """Campos publicados de un modelo y cómo leerlos"""
+
+    def __init__(self, modelo, campos, por_defecto):
+        self.modelo = modelo
+        self.campos = campos
+        self.por_defecto = por_defecto
+        # Solo las columnas de fecha o decimal necesitan conversión para JSON
+        self.convertidores = {}
+        for nombre, ruta in campos.items():
+            convertidor = _convertidor(self._campo(ruta))
+            if convertidor:
+                self.convertidores[nombre] = convertidor
+
+    def _campo(self, ruta):
+        modelo = self.modelo
+        *relaciones, nombre = ruta.split('__')
+        for relacion in relaciones:
+            modelo = modelo._meta.get_field(relacion).related_model
+        return modelo._meta.get_field(nombre)
+
+    def seleccion(self, fields, todos=False):
+        """Campos pedidos con ?fields=a,b; sin el parámetro, los por defecto (o todos)"""
+        if not fields:
+            return list(self.campos) if todos else list(self.por_defecto)
+        nombres = [nombre.strip() for nombre in fields.split(',') if nombre.strip()]
+        desconocidos = [nombre for nombre in nombres if nombre not in self.campos]
+        if desconocidos:
+            raise ErrorApi(
+                f'Campos desconocidos: {", ".join(desconocidos)}. Disponibles: {", ".join(self.campos)}'
+            )
+        return list(dict.fromkeys(nombres))
+
+    def columnas(self, nombres, *extra):
+        """Rutas del ORM para values(): las pedidas más las que necesita el paginador"""
+        return list(dict.fromkeys([self.campos[nombre] for nombre in nombres] + list(extra)))
+
+    def serializar(self, filas, nombres):
+        """Diccionarios de values() -> diccionarios con los nombres de la API"""
+        rutas = [(nombre, self.campos[nombre], self.convertidores.get(nombre)) for nombre in nombres]
+        resultado = []
+        for fila in filas:
+            objeto = {}
+            for nombre, ruta, convertidor in rutas:
+                valor = fila[ruta]
+                objeto[nombre] = convertidor(valor) if convertidor and valor is not None else valor
+            resultado.append(objeto)
+        return resultado
+
+
+OFERTAS = Recurso(
+    OfertaTrabajo,
+    {
+        'id': 'id',
+        'titulo': 'titulo',
+        'empresa_id': 'empresa_id',
+        'empresa': 'empresa__nombre_empresa',
+        'categoria_id': 'categoria_id',
+        'categoria': 'categoria__nombre',
+        'descripcion': 'descripcion',
+        'requisitos': 'requisitos',
+        'responsabilidades': 'responsabilidades',
+        'beneficios': 'beneficios',
+        'ubicacion': 'ubicacion',
+        'modalidad': 'modalidad',
+        'tipo_contrato': 'tipo_contrato',
+        'nivel_experiencia': 'nivel_experiencia',
+        'salario_min': 'salario_min',
+        'salario_max': 'salario_max',
+        'moneda': 'moneda',
+        'vacantes_disponibles': 'vacantes_disponibles',
+        'fecha_publicacion': 'fecha_publicacion',
+        'fecha_expiracion': 'fecha_expiracion',
+        'fecha_actualizacion': 'fecha_actualizacion',
+        'vistas': 'vistas',
+        'postulaciones': 'postulaciones_total',
+    },
+    por_defecto=[
+        'id', 'titulo', 'empresa', 'categoria', 'ubicacion', 'modalidad', 'tipo_contrato',
+        'nivel_experiencia', 'salario_min', 'salario_max', 'moneda', 'fecha_publicacion',
+    ],
+)
+
+CATEGORIAS = Recurso(
+    Categoria,
+    {'id': 'id', 'nombre': 'nombre', 'descripcion': 'descripcion', 'icono': 'icono'},
+    por_defecto=['id', 'nombre', 'icono'],
+)
+
+EMPRESAS = Recurso(
+    Empresa,
+    {
+        'id': 'id',
+        'nombre': 'nombre_empresa',
+        'descripcion': 'descripcion',
+        'sector': 'sector',
+        'ubicacion': 'ubicacion',
+        'sitio_web': 'sitio_web',
+        'logo_url': 'logo_url',
+        'tamaño': 'tamaño_empresa',
+        'verificada': 'verificada',
+    },
+    por_defecto=['id', 'nombre', 'sector', 'ubicacion', 'verificada'],
+)
+
+
+def _limite(parametros):
+    valor = parametros.get('limite', '')
+    if not valor:
+        return POR_PAGINA
+    if not valor.isdigit() or not 1 <= int(valor) <= MAXIMO_POR_PAGINA:
+        raise ErrorApi(f'limite debe ser un entero entre 1 y {MAXIMO_POR_PAGINA}')
+    return int(valor)
+
+
+def _pagina(recurso, consulta, parametros, orden, nombres, *extra):
+    campo_orden = orden.lstrip('-')
+    columnas = recurso.columnas(nombres, 'id', *extra, *([] if campo_orden == 'relevancia' else [campo_orden]))
+    paginador = PaginadorCursor(consulta.values(*columnas), orden, por_pagina=_limite(parametros))
+    pagina = paginador.get_page(parametros.get('cursor'))
+    return {
+        'resultados': recurso.serializar(pagina, nombres),
+        'siguiente': pagina.cursor_siguiente,
+        'anterior': pagina.cursor_anterior,
+    }
+
+
+# ==================== RECURSOS ====================
+
+def ofertas_publicadas():
+    return OfertaTrabajo.objects.filter(estado='activa', aprobada_admin=True)
+
+
+def listar_ofertas(parametros):
+    """Ofertas activas con los filtros del listado HTML (search, categoria, modalidad...)"""
+    nombres = OFERTAS.seleccion(parametros.get('fields'))
+    ofertas = ofertas_publicadas()
+
+    search = parametros.get('search', '').strip()
+    orden = parametros.get('orden', '-fecha_publicacion')
+    if orden not in ORDENES_OFERTAS or (orden == 'relevancia' and not search):
+        orden = '-fecha_publicacion'
+    if search:
+        ofertas = busqueda.filtrar_ofertas(ofertas, search, relevancia=(orden == 'relevancia'))
+
+    ubicacion = parametros.get('ubicacion', '').strip()
+    if ubicacion:
+        ofertas = ofertas.filter(ubicacion__icontains=ubicacion)
+
+    categoria = parametros.get('categoria', '')
+    if categoria:
+        if not categoria.isdigit():
+            raise ErrorApi('categoria debe ser el id de una categoría')
+        ofertas = ofertas.filter(categoria_id=categoria)
+
+    for filtro in ('modalidad', 'tipo_contrato', 'nivel_experiencia'):
+        if parametros.get(filtro):
+            ofertas = ofertas.filter(**{filtro: parametros[filtro]})
+
+    extra = ['relevancia'] if orden == 'relevancia' else []
+    return _pagina(OFERTAS, ofertas, parametros, orden, nombres, *extra)
+
+
+def detalle_oferta(parametros, oferta_id):
+    """Una oferta activa; todos los campos salvo que se pida ?fields="""
+    nombres = OFERTAS.seleccion(parametros.get('fields'), todos=True)
+    fila = ofertas_publicadas().filter(pk=oferta_id).values(*OFERTAS.columnas(nombres)).first()
+    if fila is None:
+        raise ErrorApi('La oferta no existe o no está publicada', 404)
+    return OFERTAS.serializar([fila], nombres)[0]
+
+
+def listar_categorias(parametros):
+    """Categorías activas (son pocas: sin paginación)"""
+    nombres = CATEGORIAS.seleccion(parametros.get('fields'))
+    filas = Categoria.objects.filter(activa=True).order_by('nombre').values(*CATEGORIAS.columnas(nombres))
+    return {'resultados': CATEGORIAS.serializar(filas, nombres)}
+
+
+def listar_empresas(parametros):
+    """Empresas en orden de id, paginadas por cursor"""
+    nombres = EMPRESAS.seleccion(parametros.get('fields'))
+    return _pagina(EMPRESAS, Empresa.objects.all(), parametros, 'id', nombres)
+
+
+def detalle_empresa(parametros, empresa_id):
+    """Una empresa; todos los campos salvo que se pida ?fields="""
+    nombres = EMPRESAS.seleccion(parametros.get('fields'), todos=True)
+    fila = Empresa.objects.filter(pk=empresa_id).values(*EMPRESAS.columnas(nombres)).first()
+    if fila is None:
+        raise ErrorApi('La empresa no existe', 404)
+    return EMPRESAS.serializar([fila], nombres)[0]
+
+
+# ==================== RESPUESTA ====================
+
+def _clave(request):
+    generaciones = cache.get_many([facetas.CLAVE_GENERACION, portada.CLAVE_GENERACION])
+    url = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return (
+        f'api:{VERSION}:{generaciones.get(facetas.CLAVE_GENERACION, 0)}:'
+        f'{generaciones.get(portada.CLAVE_GENERACION, 0)}:{url}'
+    )
+
+
+def responder(request, generar):
+    """
+    Respuesta JSON con el resultado de generar(). Las de usuarios anónimos
+    se sirven desde caché si es posible y admiten cachés compartidas.
+    """
+    anonimo = not request.user.is_authenticated
+    clave = _clave(request) if anonimo else None
+    contenido = cache.get(clave) if clave else None
+    estado = 200
+
+    if contenido is None:
+        try:
+            datos = generar()
+        except ErrorApi as error:
+            estado, datos = error.estado, {'error': str(error)}
+        contenido = json.dumps(datos, ensure_ascii=False, separators=(',', ':')).encode()
+        if clave and estado == 200:
+            cache.set(clave, contenido, TTL)
+
+    response = HttpResponse(contenido, status=estado, content_type='application/json; charset=utf-8')
+    if anonimo and estado == 200:
+        patch_cache_control(response, public=True, max_age=TTL, s_maxage=TTL)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Cookie'])
+    return response
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MywebappsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'MyWebApps'
+
+    def ready(self):
+        # Registrar los signals de la aplicación
+        from . import signals  # noqa: F401
@@ -0,0 +1,149 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Búsqueda de texto completo para las ofertas de trabajo
+# Usa una tabla virtual FTS5 de SQLite (oferta_busqueda) con una fila por oferta.
+# En otros motores se vuelve a la búsqueda con icontains.
+
+TABLA = 'oferta_busqueda'
+TABLA_VOCABULARIO = 'oferta_busqueda_vocab'
+
+# Pesos BM25 por columna: titulo, descripcion, requisitos, empresa
+PESOS = (10.0, 2.0, 3.0, 5.0)
+
+_SELECT_DOCUMENTOS = '''
+    SELECT o.id, o.titulo, o.descripcion, COALESCE(o.requisitos, ''), e.nombre_empresa
+    FROM oferta_trabajo o
+    INNER JOIN empresa e ON e.id = o.empresa_id
+'''
+
+
+def disponible():
+    """Indica si la base de datos soporta el índice FTS5"""
+    return connection.vendor == 'sqlite'
+
+
+def crear_tabla(cursor):
+    """Crear la tabla virtual del índice (usada por la migración)"""
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA} USING fts5("
+        "titulo, descripcion, requisitos, empresa, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def crear_vocabulario(cursor):
+    """Crear la tabla fts5vocab con la frecuencia de cada término (usada por la migración)"""
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_VOCABULARIO} USING fts5vocab({TABLA}, 'row')"
+    )
+
+
+def frecuencias(terminos, bloque=500):
+    """Número de ofertas indexadas que contienen cada término: {termino: n}"""
+    terminos = list(terminos)
+    resultado = {}
+    if not disponible():
+        return resultado
+    with connection.cursor() as cursor:
+        for i in range(0, len(terminos), bloque):
+            parte = terminos[i:i + bloque]
+            marcadores = ', '.join(['%s'] * len(parte))
+            cursor.execute(f'SELECT term, doc FROM {TABLA_VOCABULARIO} WHERE term IN ({marcadores})', parte)
+            resultado.update(cursor.fetchall())
+    return resultado
+
+
+def construir_consulta(texto):
+    """
+    Convertir el texto del usuario en una consulta FTS5 segura.
+    Cada palabra se busca como prefijo y todas deben aparecer.
+    """
+    palabras = re.findall(r'\w+', texto.lower())
+    return ' '.join(f'"{palabra}"*' for palabra in palabras)
+
+
+def indexar_ofertas(ids):
+    """(Re)indexar las ofertas indicadas"""
+    ids = list(ids)
+    if not ids or not disponible():
+        return
+    marcadores = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA} WHERE rowid IN ({marcadores})', ids)
+        cursor.execute(
+            f'INSERT INTO {TABLA} (rowid, titulo, descripcion, requisitos, empresa) '
+            f'{_SELECT_DOCUMENTOS} WHERE o.id IN ({marcadores})',
+            ids
+        )
+
+
+def indexar_empresa(empresa_id):
+    """Reindexar todas las ofertas de una empresa (p. ej. si cambia su nombre)"""
+    if not disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TABLA} WHERE rowid IN (SELECT id FROM oferta_trabajo WHERE empresa_id = %s)',
+            [empresa_id]
+        )
+        cursor.execute(
+            f'INSERT INTO {TABLA} (rowid, titulo, descripcion, requisitos, empresa) '
+            f'{_SELECT_DOCUMENTOS} WHERE o.empresa_id = %s',
+            [empresa_id]
+        )
+
+
+def eliminar_oferta(oferta_id):
+    """Quitar una oferta del índice"""
+    if not disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA} WHERE rowid = %s', [oferta_id])
+
+
+def reconstruir_indice():
+    """Vaciar y volver a llenar el índice completo. Devuelve el número de ofertas indexadas"""
+    if not disponible():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA}')
+        cursor.execute(
+            f'INSERT INTO {TABLA} (rowid, titulo, descripcion, requisitos, empresa) {_SELECT_DOCUMENTOS}'
+        )
+        cursor.execute(f"INSERT INTO {TABLA} ({TABLA}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {TABLA}')
+        return cursor.fetchone()[0]
+
+
+def ordenar_por_relevancia(ofertas):
+    """Anotar `relevancia` (BM25) en un queryset ya filtrado con __match"""
+    pesos = ', '.join(str(peso) for peso in PESOS)
+    return ofertas.annotate(relevancia=RawSQL(f'bm25("{TABLA}", {pesos})', []))
+
+
+def filtrar_ofertas(ofertas, texto, relevancia=False):
+    """
+    Filtrar un queryset de OfertaTrabajo por texto.
+    Si relevancia=True se anota `relevancia` (BM25, menor es mejor).
+    """
+    consulta = construir_consulta(texto)
+
+    if not consulta or not disponible():
+        ofertas = ofertas.filter(
+            Q(titulo__icontains=texto) |
+            Q(descripcion__icontains=texto) |
+            Q(requisitos__icontains=texto) |
+            Q(empresa__nombre_empresa__icontains=texto)
+        )
+        if relevancia:
+            ofertas = ofertas.annotate(relevancia=Value(0.0, output_field=FloatField()))
+        return ofertas
+
+    ofertas = ofertas.filter(indice_busqueda__documento__match=consulta)
+    if relevancia:
+        ofertas = ordenar_por_relevancia(ofertas)
+    return ofertas
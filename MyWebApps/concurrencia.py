@@ -0,0 +1,74 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.shortcuts import render
+
+from . import instrumentacion
+
+# Consultas independientes de una vista async ejecutadas a la vez
+# Los dashboards piden varias cosas que no dependen unas de otras
+# (estadísticas, últimas ofertas, últimas postulaciones, recomendaciones). Las
+# versiones async de esas vistas las pasan a simultaneas(), que ejecuta cada
+# función en un hilo de un pool propio, así la vista tarda lo que la más lenta
+# y no la suma de todas. El ORM de Django es síncrono: cada hilo usa su propia
+# conexión, que se cierra al terminar la tarea salvo que CONN_MAX_AGE la
+# mantenga abierta (entonces hay hasta CONSULTAS_SIMULTANEAS_HILOS conexiones
+# más por proceso).
+#
+# Si la conexión de la petición está dentro de una transacción (los TestCase,
+# ATOMIC_REQUESTS) las funciones se ejecutan una tras otra en el hilo de la
+# petición: desde otra conexión no se verían los datos sin confirmar. Lo mismo
+# con CONSULTAS_SIMULTANEAS = False.
+#
+# Funciona con WSGI (Django ejecuta la vista async en su propio event loop) y
+# con ASGI, donde además no se ocupa un hilo por petición mientras se espera
+# (ver "Despliegue con ASGI" en el README).
+
+HABILITADA = getattr(settings, 'CONSULTAS_SIMULTANEAS', True)
+HILOS = getattr(settings, 'CONSULTAS_SIMULTANEAS_HILOS', 8)
+
+_ejecutor = ThreadPoolExecutor(max_workers=HILOS, thread_name_prefix='consultas')
+
+
+def _en_hilo(funcion):
+    with instrumentacion.medir_conexiones():
+        try:
+            return funcion()
+        finally:
+            for conexion in connections.all(initialized_only=True):
+                conexion.close_if_unusable_or_obsolete()
+
+
+def _en_transaccion():
+    return any(conexion.in_atomic_block for conexion in connections.all(initialized_only=True))
+
+
+def _una_tras_otra(funciones):
+    return [funcion() for funcion in funciones]
+
+
+async def simultaneas(*funciones):
+    """Ejecutar a la vez funciones síncronas que consultan la base; sus resultados en orden"""
+    if not HABILITADA or await sync_to_async(_en_transaccion)():
+        return await sync_to_async(_una_tras_otra)(funciones)
+    loop = asyncio.get_running_loop()
+    # Cada tarea con su copia del contexto: así se mide dentro de la petición
+    return await asyncio.gather(*(
+        loop.run_in_executor(_ejecutor, contextvars.copy_context().run, _en_hilo, funcion)
+        for funcion in funciones
+    ))
+
+
+async def usuario(request):
+    """request.auser() que además lo deja en request.user (las plantillas no lo vuelven a cargar)"""
+    request.user = await request.auser()
+    return request.user
+
+
+async def renderizar(request, plantilla, contexto):
+    """render() desde una vista async: las plantillas y context processors pueden consultar la base"""
+    return await sync_to_async(render)(request, plantilla, contexto)
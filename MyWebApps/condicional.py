@@ -0,0 +1,118 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from . import facetas
+from .models import Categoria, OfertaTrabajo, Postulacion
+
+# GET condicional (ETag / Last-Modified) del detalle y del listado de ofertas
+# Antes de ejecutar la vista se calculan los validadores con una consulta
+# barata: fecha_actualizacion de la oferta, su empresa y su categoría en el
+# detalle; en el listado, la última fecha_actualizacion de todas las ofertas y
+# categorías más la generación de facetas (que cambia también al borrar). Si el
+# cliente ya tiene esa versión se responde 304 sin consultar nada más ni
+# renderizar.
+#
+# El listado usa una marca global y no una por filtro porque la página muestra
+# los conteos de todas las facetas, que dependen de ofertas fuera del filtro.
+# Las vistas y el "hace X días" no entran en los validadores: con un 304 el
+# navegador muestra los de su copia.
+#
+# Para usuarios con sesión la ETag incluye al usuario y lo que la página le
+# muestra (notificaciones sin leer, si ya postuló), y no se envía
+# Last-Modified, que no los tendría en cuenta. Si hay mensajes pendientes la
+# página se genera completa y sin validadores.
+#
+# Las páginas llevan el token CSRF en sus formularios, así que la ETag incluye
+# también las cookies de CSRF y de sesión: si rotan (login, logout, cambio de
+# contraseña) la copia del navegador ya no vale y se genera de nuevo. En el
+# detalle entra además fecha_similares, que cambia al recalcular la lista de
+# ofertas similares (similares.py).
+
+# Subir al cambiar las plantillas de estas páginas, así no se sirve una copia vieja
+VERSION = 2
+
+
+def _etag(*partes):
+    return '"' + hashlib.md5('|'.join(map(str, partes)).encode()).hexdigest() + '"'
+
+
+def _usuario(request):
+    usuario = request.user
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    if not usuario.is_authenticated:
+        return ('anonimo', csrf)
+    sesion = request.COOKIES.get(settings.SESSION_COOKIE_NAME, '')
+    return (usuario.pk, usuario.notificaciones_no_leidas, csrf, sesion)
+
+
+def _aplica(request):
+    return request.method in ('GET', 'HEAD') and not len(messages.get_messages(request))
+
+
+def validadores_oferta(request, oferta_id):
+    """(etag, última modificación) del detalle de una oferta; None si no aplica"""
+    if not _aplica(request):
+        return None
+    fechas = OfertaTrabajo.objects.filter(pk=oferta_id, estado='activa').values_list(
+        'fecha_actualizacion', 'empresa__fecha_actualizacion', 'categoria__fecha_actualizacion',
+        'fecha_similares',
+    ).first()
+    if fechas is None:
+        return None
+
+    partes = [VERSION, 'oferta', oferta_id, *fechas, *_usuario(request)]
+    if getattr(request.user, 'tipo_usuario', None) == 'postulante':
+        partes.append(Postulacion.objects.filter(
+            oferta_id=oferta_id, postulante__usuario=request.user
+        ).exists())
+    return _etag(*partes), max(fecha for fecha in fechas if fecha)
+
+
+def validadores_listado(request):
+    """(etag, última modificación) del listado con los filtros de la petición; None si no aplica"""
+    if not _aplica(request):
+        return None
+    ultima_oferta = OfertaTrabajo.objects.aggregate(ultima=Max('fecha_actualizacion'))['ultima']
+    ultima_categoria = Categoria.objects.aggregate(ultima=Max('fecha_actualizacion'))['ultima']
+    fechas = [fecha for fecha in (ultima_oferta, ultima_categoria) if fecha]
+    if not fechas:
+        return None
+
+    partes = [
+        VERSION, 'listado', request.GET.urlencode(), cache.get(facetas.CLAVE_GENERACION, 0),
+        ultima_oferta, ultima_categoria, *_usuario(request),
+    ]
+    return _etag(*partes), max(fechas)
+
+
+def no_modificada(request, validadores):
+    """Respuesta 304 si el cliente tiene la versión vigente; None si hay que generar la página"""
+    if validadores is None:
+        return None
+    etag, ultima = validadores
+    if request.user.is_authenticated:
+        ultima = None
+    response = get_conditional_response(
+        request, etag=etag, last_modified=ultima and int(ultima.timestamp())
+    )
+    return response and marcar(request, response, validadores)
+
+
+def marcar(request, response, validadores):
+    """Agregar los validadores a la respuesta; el navegador revalida en cada visita"""
+    if validadores is None or response.status_code not in (200, 304):
+        return response
+    etag, ultima = validadores
+    response['ETag'] = etag
+    if request.user.is_authenticated:
+        patch_cache_control(response, no_cache=True, private=True)
+    else:
+        response['Last-Modified'] = http_date(ultima.timestamp())
+        patch_cache_control(response, no_cache=True)
+    return response
@@ -0,0 +1,94 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import OfertaTrabajo, Postulacion
+
+# Contadores de postulaciones guardados en cada OfertaTrabajo
+# Se actualizan con UPDATE ... SET campo = campo + n (ver signals.py) para que
+# los listados del empleador no cuenten postulaciones oferta por oferta.
+
+ESTADOS = [estado for estado, _ in Postulacion.ESTADO_CHOICES]
+
+
+def campo_estado(estado):
+    """Nombre de la columna contador para un estado de postulación"""
+    return f'postulaciones_{estado}'
+
+
+def sumar_postulacion(oferta_id, estado, cantidad=1):
+    """Sumar (o restar) postulaciones a una oferta en un estado"""
+    cambios = {'postulaciones_total': F('postulaciones_total') + cantidad}
+    if estado in ESTADOS:
+        cambios[campo_estado(estado)] = F(campo_estado(estado)) + cantidad
+    OfertaTrabajo.objects.filter(pk=oferta_id).update(**cambios)
+
+
+def mover_postulaciones(oferta_id, estado_anterior, estado_nuevo, cantidad=1):
+    """Pasar postulaciones de un estado a otro sin cambiar el total"""
+    if estado_anterior == estado_nuevo:
+        return
+    cambios = {}
+    if estado_anterior in ESTADOS:
+        cambios[campo_estado(estado_anterior)] = F(campo_estado(estado_anterior)) - cantidad
+    if estado_nuevo in ESTADOS:
+        cambios[campo_estado(estado_nuevo)] = F(campo_estado(estado_nuevo)) + cantidad
+    if cambios:
+        OfertaTrabajo.objects.filter(pk=oferta_id).update(**cambios)
+
+
+def mover_conteos(oferta_id, conteos_anteriores, estado_nuevo):
+    """Pasar al estado nuevo postulaciones de varios estados, {estado: n}, en un solo UPDATE"""
+    cambios = {}
+    movidas = 0
+    for estado, cantidad in conteos_anteriores.items():
+        if estado == estado_nuevo or estado not in ESTADOS or not cantidad:
+            continue
+        cambios[campo_estado(estado)] = F(campo_estado(estado)) - cantidad
+        movidas += cantidad
+    if movidas and estado_nuevo in ESTADOS:
+        cambios[campo_estado(estado_nuevo)] = F(campo_estado(estado_nuevo)) + movidas
+    if cambios:
+        OfertaTrabajo.objects.filter(pk=oferta_id).update(**cambios)
+
+
+def conteos_reales(oferta_ids):
+    """Contar las postulaciones reales de las ofertas indicadas, en una sola consulta"""
+    agregados = {'postulaciones_total': Count('id')}
+    for estado in ESTADOS:
+        agregados[campo_estado(estado)] = Count('id', filter=Q(estado=estado))
+
+    conteos = {
+        fila.pop('oferta_id'): fila
+        for fila in Postulacion.objects.filter(
+            oferta_id__in=oferta_ids
+        ).order_by().values('oferta_id').annotate(**agregados)
+    }
+    vacio = {campo: 0 for campo in agregados}
+    return {oferta_id: conteos.get(oferta_id, vacio) for oferta_id in oferta_ids}
+
+
+def reconciliar(oferta_ids, corregir=True):
+    """
+    Recalcular los contadores de un bloque de ofertas.
+    Devuelve la lista de ids cuyos contadores estaban desfasados.
+    """
+    campos = ['postulaciones_total'] + [campo_estado(estado) for estado in ESTADOS]
+
+    with transaction.atomic():
+        ofertas = OfertaTrabajo.objects.filter(pk__in=oferta_ids).only('pk', *campos)
+        if corregir:
+            ofertas = ofertas.select_for_update()
+        ofertas = list(ofertas)
+        reales = conteos_reales([oferta.pk for oferta in ofertas])
+
+        desfasadas = []
+        for oferta in ofertas:
+            esperado = reales[oferta.pk]
+            if any(getattr(oferta, campo) != esperado[campo] for campo in campos):
+                for campo in campos:
+                    setattr(oferta, campo, esperado[campo])
+                desfasadas.append(oferta)
+
+        if corregir and desfasadas:
+            OfertaTrabajo.objects.bulk_update(desfasadas, campos)
+    return [oferta.pk for oferta in desfasadas]
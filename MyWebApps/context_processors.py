@@ -0,0 +1,9 @@
+# Context processors del sistema EMPLEOYA
+
+
+def notificaciones(request):
+    """Número de notificaciones sin leer para el badge del navbar (sin consultas extra)"""
+    usuario = getattr(request, 'user', None)
+    if usuario is None or not usuario.is_authenticated:
+        return {}
+    return {'notificaciones_no_leidas': usuario.notificaciones_no_leidas}
@@ -0,0 +1,143 @@
+import gzip
+import mimetypes
+import re
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils._os import safe_join
+
+try:
+    import brotli
+except ImportError:  # opcional: sin brotli solo se generan los .gz
+    brotli = None
+
+# Archivos estáticos con nombre por contenido, minificados y precomprimidos
+# collectstatic (con AlmacenEstaticos como storage) copia los archivos a
+# STATIC_ROOT, les agrega el hash del contenido al nombre (empleoya.css ->
+# empleoya.3f2a9c1b6d0e.css) y guarda la correspondencia en staticfiles.json,
+# que {% static %} usa para armar las URLs. Luego minifica los .css con hash
+# (el hash es el del archivo fuente, así que cambia cuando este cambia) y
+# escribe al lado de cada archivo de texto su versión .gz (y .br si está
+# instalado brotli), así no se comprime nada al servir.
+#
+# EstaticosMiddleware sirve STATIC_ROOT eligiendo la versión comprimida según
+# Accept-Encoding. Los nombres con hash nunca cambian de contenido, así que se
+# envían con caché de un año (immutable); el resto con una caché corta.
+#
+# Sin collectstatic (desarrollo y tests) las URLs apuntan al archivo original y
+# runserver lo sirve desde la aplicación.
+#
+#   python manage.py collectstatic --noinput
+
+# Extensiones que vale la pena comprimir
+COMPRIMIBLES = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map', '.xml')
+# No se escribe la versión comprimida si ahorra menos que esto
+AHORRO_MINIMO = 0.05
+
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_CORTA = 'public, max-age=60'
+
+_COMENTARIO_CSS = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CADENA_CSS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+
+
+def minificar_css(css):
+    """Quitar comentarios y espacios sobrantes, sin tocar el texto entre comillas"""
+    partes = _CADENA_CSS.split(css)
+    for i in range(0, len(partes), 2):
+        parte = _COMENTARIO_CSS.sub('', partes[i])
+        parte = re.sub(r'\s+', ' ', parte)
+        parte = re.sub(r'\s*([{};,>])\s*', r'\1', parte)
+        # Los ":" de los selectores (a :hover) sí importan; solo se quitan dentro de bloques
+        parte = re.sub(r'([{;])\s*([-\w]+)\s*:\s*', r'\1\2:', parte)
+        partes[i] = parte.replace(';}', '}')
+    return ''.join(partes).strip()
+
+
+def _comprimidos(contenido):
+    """Versiones comprimidas [(sufijo, bytes)] que ahorran al menos AHORRO_MINIMO"""
+    versiones = [('.gz', gzip.compress(contenido, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        versiones.append(('.br', brotli.compress(contenido, quality=11)))
+    return [(sufijo, datos) for sufijo, datos in versiones if len(datos) < len(contenido) * (1 - AHORRO_MINIMO)]
+
+
+class AlmacenEstaticos(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage que además minifica el CSS y precomprime"""
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Sin collectstatic todavía: se usa el archivo original
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        procesados = set()
+        for original, procesado, hubo_cambio in super().post_process(paths, dry_run, **options):
+            if procesado and not isinstance(hubo_cambio, Exception):
+                procesados.add(procesado)
+            yield original, procesado, hubo_cambio
+
+        if dry_run:
+            return
+        for nombre in sorted(procesados):
+            ruta = Path(self.path(nombre))
+            if nombre.endswith('.css'):
+                ruta.write_text(minificar_css(ruta.read_text(encoding='utf-8')), encoding='utf-8')
+            if nombre.endswith(COMPRIMIBLES):
+                for sufijo, datos in _comprimidos(ruta.read_bytes()):
+                    ruta.with_name(ruta.name + sufijo).write_bytes(datos)
+
+
+class EstaticosMiddleware:
+    """Sirve STATIC_ROOT con la versión precomprimida y caché larga para los nombres con hash"""
+
+    def __init__(self, get_response):
+        if not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefijo = urlparse(settings.STATIC_URL).path
+        self.raiz = str(settings.STATIC_ROOT)
+        self._inmutables = None
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefijo):
+            response = self.servir(request, request.path_info[len(self.prefijo):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def inmutables(self):
+        """Nombres con hash según el manifest (se lee una vez por proceso)"""
+        if self._inmutables is None:
+            self._inmutables = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        return self._inmutables
+
+    def servir(self, request, nombre):
+        try:
+            ruta = Path(safe_join(self.raiz, nombre))
+        except SuspiciousFileOperation:
+            return None
+        if not ruta.is_file():
+            return None
+
+        archivo, codificacion = ruta, None
+        aceptadas = request.headers.get('Accept-Encoding', '')
+        for sufijo, candidata in (('.br', 'br'), ('.gz', 'gzip')):
+            comprimido = ruta.with_name(ruta.name + sufijo)
+            if candidata in aceptadas and comprimido.is_file():
+                archivo, codificacion = comprimido, candidata
+                break
+
+        tipo, _ = mimetypes.guess_type(ruta.name)
+        response = FileResponse(archivo.open('rb'), content_type=tipo or 'application/octet-stream')
+        if codificacion:
+            response['Content-Encoding'] = codificacion
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = CACHE_INMUTABLE if nombre in self.inmutables() else CACHE_CORTA
+        return response
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import facetas, notificaciones, portada, recomendaciones, similares
+from .models import OfertaTrabajo
+
+# Expiración automática de ofertas
+# El comando expirar_ofertas busca las ofertas activas con fecha_expiracion
+# vencida usando el índice (estado, fecha_expiracion) y las pasa a 'expirada'
+# por bloques, cada uno en su propia transacción, así el bloqueo de escritura
+# dura lo que tarda un UPDATE de pocas filas. Como es un UPDATE en bloque no se
+# disparan los signals de OfertaTrabajo; por eso aquí se hace lo mismo que
+# ellos: retirar las ofertas de recomendaciones y similares, invalidar las
+# cachés del buscador y de la página de inicio, y encolar el aviso a la empresa.
+#
+# Cada bloque bloquea (select_for_update) las filas que siguen activas y
+# vencidas, y solo esas se actualizan, se retiran y se avisan: una oferta que
+# otra ejecución ya expiró, o que se editó mientras tanto, queda fuera. Como el
+# evento de notificación además tiene clave única, se puede ejecutar cada
+# minuto y dos ejecuciones superpuestas no duplican nada.
+
+BLOQUE = getattr(settings, 'EXPIRACION_BLOQUE', 200)
+
+
+def vencidas(ahora=None):
+    """Ofertas activas cuya fecha de expiración ya pasó"""
+    return OfertaTrabajo.objects.filter(
+        estado='activa',
+        fecha_expiracion__lte=ahora or timezone.now(),
+    )
+
+
+def _avisar(ids):
+    """Encolar un aviso por oferta para su empresa"""
+    notificaciones.encolar_varios('oferta_expirada', [
+        (f'oferta_expirada:{pk}', {'oferta_id': pk}) for pk in ids
+    ])
+
+
+def expirar_bloque(ids, ahora):
+    """Expirar un bloque de ofertas. Devuelve cuántas cambiaron de estado"""
+    with transaction.atomic():
+        # Solo las que siguen vencidas: otra ejecución o una edición pudo cambiarlas
+        pendientes = OfertaTrabajo.objects.filter(pk__in=ids, estado='activa', fecha_expiracion__lte=ahora)
+        expiradas = list(pendientes.select_for_update().values_list('pk', flat=True))
+        if expiradas:
+            OfertaTrabajo.objects.filter(pk__in=expiradas).update(estado='expirada', fecha_actualizacion=ahora)
+            _avisar(expiradas)
+    if expiradas:
+        recomendaciones.retirar_ofertas(expiradas)
+        similares.retirar_ofertas(expiradas)
+    return len(expiradas)
+
+
+def expirar_vencidas(bloque=BLOQUE, ahora=None):
+    """Expirar todas las ofertas vencidas. Devuelve cuántas cambiaron de estado"""
+    ahora = ahora or timezone.now()
+    pendientes = vencidas(ahora).order_by('pk').values_list('pk', flat=True)
+    total = 0
+    ultimo_id = 0
+    while True:
+        ids = list(pendientes.filter(pk__gt=ultimo_id)[:bloque])
+        if not ids:
+            break
+        total += expirar_bloque(ids, ahora)
+        ultimo_id = ids[-1]
+
+    if total:
+        facetas.invalidar()
+        portada.invalidar()
+    return total
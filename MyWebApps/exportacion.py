@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .models import Postulacion
+
+# Exportación de postulaciones para empleadores (CSV o JSONL)
+# Las filas se leen con values_list(...).iterator(chunk_size), así la base
+# entrega solo las columnas exportadas y por bloques, sin crear instancias de
+# modelo ni acumular resultados; cada bloque se convierte a texto y se envía
+# enseguida con StreamingHttpResponse. La memoria usada no depende del número
+# de postulaciones exportadas. Las conversiones se hacen solo en las columnas
+# que las necesitan (fechas, decimales, texto libre), no celda por celda.
+
+BLOQUE = getattr(settings, 'EXPORTACION_BLOQUE', 2000)
+
+# (encabezado, campo) de cada columna exportada
+COLUMNAS = [
+    ('postulacion_id', 'id'),
+    ('oferta_id', 'oferta_id'),
+    ('oferta', 'oferta__titulo'),
+    ('oferta_id_externo', 'oferta__id_externo'),
+    ('fecha_postulacion', 'fecha_postulacion'),
+    ('estado', 'estado'),
+    ('fecha_cambio_estado', 'fecha_cambio_estado'),
+    ('puntuacion_match', 'puntuacion_match'),
+    ('nombre', 'postulante__usuario__first_name'),
+    ('apellido', 'postulante__usuario__last_name'),
+    ('email', 'postulante__usuario__email'),
+    ('telefono', 'postulante__usuario__telefono'),
+    ('titulo_profesional', 'postulante__titulo_profesional'),
+    ('nivel_experiencia', 'postulante__nivel_experiencia'),
+    ('años_experiencia', 'postulante__años_experiencia'),
+    ('habilidades', 'postulante__habilidades'),
+    ('idiomas', 'postulante__idiomas'),
+    ('ubicacion', 'postulante__ubicacion'),
+    ('salario_esperado', 'postulante__salario_esperado'),
+    ('moneda_salario', 'postulante__moneda_salario'),
+    ('disponibilidad', 'postulante__disponibilidad'),
+    ('cv_url', 'cv_url_postulacion'),
+    ('cv_url_perfil', 'postulante__cv_url'),
+    ('linkedin_url', 'postulante__linkedin_url'),
+    ('carta_presentacion', 'carta_presentacion'),
+    ('notas_empleador', 'notas_empleador'),
+]
+
+ENCABEZADOS = [encabezado for encabezado, _ in COLUMNAS]
+
+
+def _campo(ruta):
+    """Campo de modelo al que apunta una ruta como 'postulante__usuario__email'"""
+    modelo = Postulacion
+    *relaciones, nombre = ruta.split('__')
+    for relacion in relaciones:
+        modelo = modelo._meta.get_field(relacion).related_model
+    return modelo._meta.get_field(nombre)
+
+
+def _indices(*tipos, sin_opciones=False):
+    return [
+        i for i, (_, ruta) in enumerate(COLUMNAS)
+        if isinstance(_campo(ruta), tipos) and not (sin_opciones and _campo(ruta).choices)
+    ]
+
+
+INDICES_FECHA = _indices(models.DateTimeField)
+INDICES_DECIMAL = _indices(models.DecimalField)
+# Texto escrito por los usuarios (los campos con opciones tienen valores fijos)
+INDICES_TEXTO = _indices(models.CharField, models.TextField, sin_opciones=True)
+
+# Primeros caracteres con los que una hoja de cálculo interpreta una fórmula
+# (los de la guía de OWASP sobre inyección en CSV, tabulador y retorno incluidos)
+INICIO_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+TIPOS_CONTENIDO = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def postulaciones(oferta=None, empresa=None):
+    """Postulaciones a exportar, de una oferta o de todas las ofertas de una empresa"""
+    consulta = Postulacion.objects.all()
+    if oferta is not None:
+        consulta = consulta.filter(oferta=oferta)
+    if empresa is not None:
+        consulta = consulta.filter(oferta__empresa=empresa)
+    return consulta
+
+
+def filas(consulta, bloque=BLOQUE):
+    """Tuplas con las columnas exportadas, leídas por bloques en orden de id"""
+    return consulta.order_by('pk').values_list(
+        *(campo for _, campo in COLUMNAS)
+    ).iterator(chunk_size=bloque)
+
+
+def _fecha(valor):
+    return (timezone.localtime(valor) if timezone.is_aware(valor) else valor).isoformat()
+
+
+def _fila_json(fila):
+    fila = list(fila)
+    for i in INDICES_FECHA:
+        if fila[i] is not None:
+            fila[i] = _fecha(fila[i])
+    for i in INDICES_DECIMAL:
+        if fila[i] is not None:
+            fila[i] = str(fila[i])
+    return fila
+
+
+def _fila_csv(fila):
+    fila = _fila_json(fila)
+    # Evitar que una hoja de cálculo ejecute como fórmula el texto de un usuario
+    for i in INDICES_TEXTO:
+        if fila[i] and fila[i].startswith(INICIO_FORMULA):
+            fila[i] = "'" + fila[i]
+    return fila
+
+
+def generar_csv(filas, bloque=BLOQUE):
+    """Texto CSV por trozos de `bloque` filas"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    # BOM para que Excel reconozca UTF-8
+    buffer.write('\ufeff')
+    escritor.writerow(ENCABEZADOS)
+    for n, fila in enumerate(filas, start=1):
+        escritor.writerow(_fila_csv(fila))
+        if n % bloque == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def generar_jsonl(filas, bloque=BLOQUE):
+    """Un objeto JSON por línea, por trozos de `bloque` filas"""
+    lineas = []
+    for fila in filas:
+        lineas.append(json.dumps(dict(zip(ENCABEZADOS, _fila_json(fila))), ensure_ascii=False) + '\n')
+        if len(lineas) >= bloque:
+            yield ''.join(lineas)
+            lineas = []
+    yield ''.join(lineas)
+
+
+GENERADORES = {
+    'csv': generar_csv,
+    'jsonl': generar_jsonl,
+}
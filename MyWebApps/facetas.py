@@ -0,0 +1,88 @@
+import hashlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import OfertaTrabajo
+
+# Conteos por faceta para el buscador de ofertas
+# Una sola consulta agrupa las ofertas que cumplen los filtros que no son
+# facetas (texto y ubicación) por la combinación (categoría, modalidad,
+# tipo de contrato, nivel). Son pocas filas, y a partir de ellas se calcula
+# en Python el conteo de cada valor de cada faceta respetando lo que el
+# usuario ya eligió en las demás. El resultado se guarda en caché por filtros.
+
+FACETAS = ['categoria', 'modalidad', 'tipo_contrato', 'nivel_experiencia']
+
+_COLUMNAS = {
+    'categoria': 'categoria_id',
+    'modalidad': 'modalidad',
+    'tipo_contrato': 'tipo_contrato',
+    'nivel_experiencia': 'nivel_experiencia',
+}
+
+CLAVE_GENERACION = 'facetas:generacion'
+
+
+def _normalizar(texto):
+    return ' '.join((texto or '').lower().split())
+
+
+def invalidar():
+    """Descartar todos los conteos en caché (cambió alguna oferta)"""
+    try:
+        cache.incr(CLAVE_GENERACION)
+    except ValueError:
+        cache.set(CLAVE_GENERACION, 1, None)
+
+
+def _combinaciones(base, search, ubicacion):
+    """Filas (categoria, modalidad, tipo_contrato, nivel, n) para los filtros de texto"""
+    generacion = cache.get(CLAVE_GENERACION, 0)
+    estado = f'{generacion}|{_normalizar(search)}|{_normalizar(ubicacion)}'
+    clave = 'facetas:' + hashlib.md5(estado.encode()).hexdigest()
+
+    filas = cache.get(clave)
+    if filas is None:
+        columnas = [_COLUMNAS[faceta] for faceta in FACETAS]
+        filas = [
+            tuple('' if valor is None else str(valor) for valor in fila[:-1]) + (fila[-1],)
+            for fila in base.order_by().values_list(*columnas).annotate(n=Count('id'))
+        ]
+        cache.set(clave, filas, getattr(settings, 'FACETAS_TTL', 300))
+    return filas
+
+
+def contar(base, search='', ubicacion='', seleccion=None):
+    """
+    Conteos de cada faceta para la búsqueda actual.
+
+    `base` es el queryset ya filtrado por texto y ubicación (sin facetas);
+    `seleccion` es un dict faceta -> valor elegido ('' si ninguno).
+    Devuelve (conteos, total) donde conteos es {faceta: Counter(valor -> n)}
+    y total el número de ofertas que cumplen todos los filtros.
+    """
+    seleccion = {faceta: str((seleccion or {}).get(faceta) or '') for faceta in FACETAS}
+    conteos = {faceta: Counter() for faceta in FACETAS}
+    total = 0
+
+    for fila in _combinaciones(base, search, ubicacion):
+        valores, n = fila[:-1], fila[-1]
+        coincide = [not seleccion[faceta] or seleccion[faceta] == valor
+                    for faceta, valor in zip(FACETAS, valores)]
+        for i, faceta in enumerate(FACETAS):
+            # Cada faceta se cuenta aplicando solo los filtros de las otras
+            if all(coincide[:i] + coincide[i + 1:]):
+                conteos[faceta][valores[i]] += n
+        if all(coincide):
+            total += n
+
+    return conteos, total
+
+
+def opciones(choices, conteos_faceta):
+    """Lista [(valor, etiqueta, n)] para pintar un select con sus conteos"""
+    return [(valor, etiqueta, conteos_faceta.get(valor, 0)) for valor, etiqueta in choices]
+
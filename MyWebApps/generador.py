@@ -0,0 +1,395 @@
+import itertools
+import math
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from . import busqueda, contadores, facetas, metricas, portada
+from .models import (
+    Categoria, Empresa, Favorito, Notificacion, OfertaTrabajo, PerfilPostulante, Postulacion, Usuario,
+)
+
+# Generador de datos sintéticos para pruebas de carga y benchmarks
+# Crea usuarios, empresas, perfiles, ofertas, postulaciones, favoritos y
+# notificaciones con distribuciones parecidas a las reales: pocas empresas
+# publican la mayoría de las ofertas (cola larga, ley de potencias), unas pocas
+# categorías concentran la demanda, y unas ofertas reciben muchas más
+# postulaciones que otras. Todo sale de un random.Random con semilla, así la
+# misma semilla y escala producen siempre los mismos datos.
+#
+# Las filas se insertan con bulk_create por bloques y la contraseña se hashea
+# una sola vez para todos los usuarios. bulk_create no dispara signals, así que
+# al final se reconstruyen el índice de búsqueda, los contadores y las métricas
+# diarias de las ofertas y se invalidan las cachés.
+
+SEMILLA = 42
+BLOQUE = 5000
+DIAS_HISTORIA = 365
+
+# Proporciones respecto del número de postulantes
+EMPRESAS_POR_POSTULANTE = 1 / 40
+OFERTAS_POR_POSTULANTE = 1 / 4
+
+POSTULACIONES_MEDIA = 6
+FAVORITOS_MEDIA = 2
+NOTIFICACIONES_MEDIA = 4
+
+# Nombre, icono, peso en la demanda, puestos y habilidades de cada categoría
+CATEGORIAS = [
+    ('Tecnología', 'laptop', 30,
+     ['Desarrollador Backend', 'Desarrollador Frontend', 'Desarrollador Full Stack', 'Analista de Datos',
+      'Ingeniero DevOps', 'QA Tester', 'Soporte Técnico', 'Administrador de Base de Datos'],
+     ['python', 'django', 'javascript', 'react', 'java', 'sql', 'postgresql', 'docker', 'aws', 'git',
+      'linux', 'node.js', 'typescript', 'power bi', 'excel', 'scrum']),
+    ('Ventas', 'chart-line', 18,
+     ['Ejecutivo de Ventas', 'Asesor Comercial', 'Vendedor de Tienda', 'Jefe de Ventas', 'Key Account Manager'],
+     ['ventas', 'negociación', 'crm', 'prospección', 'atención al cliente', 'excel', 'salesforce', 'inglés']),
+    ('Administración', 'briefcase', 12,
+     ['Asistente Administrativo', 'Analista de Recursos Humanos', 'Recepcionista', 'Coordinador Administrativo'],
+     ['excel', 'office', 'sap', 'gestión documentaria', 'planillas', 'organización', 'inglés']),
+    ('Atención al Cliente', 'headset', 10,
+     ['Asesor de Call Center', 'Representante de Servicio', 'Supervisor de Atención', 'Agente de Soporte'],
+     ['atención al cliente', 'comunicación', 'crm', 'zendesk', 'resolución de problemas', 'inglés']),
+    ('Salud', 'heartbeat', 8,
+     ['Enfermero', 'Técnico de Farmacia', 'Médico General', 'Asistente Dental', 'Tecnólogo Médico'],
+     ['primeros auxilios', 'atención al paciente', 'farmacología', 'bioseguridad', 'historia clínica']),
+    ('Logística', 'truck', 7,
+     ['Asistente de Almacén', 'Analista de Logística', 'Conductor Repartidor', 'Jefe de Operaciones'],
+     ['inventarios', 'sap', 'excel', 'licencia de conducir', 'cadena de suministro', 'montacargas']),
+    ('Educación', 'graduation-cap', 6,
+     ['Docente de Primaria', 'Profesor de Inglés', 'Tutor Académico', 'Coordinador Pedagógico'],
+     ['pedagogía', 'inglés', 'planificación curricular', 'tic', 'evaluación', 'comunicación']),
+    ('Marketing', 'bullhorn', 5,
+     ['Community Manager', 'Analista de Marketing Digital', 'Diseñador Gráfico', 'Especialista SEO'],
+     ['redes sociales', 'google ads', 'seo', 'photoshop', 'illustrator', 'copywriting', 'analytics']),
+    ('Finanzas', 'coins', 3,
+     ['Contador', 'Analista Financiero', 'Asistente Contable', 'Tesorero'],
+     ['contabilidad', 'excel', 'nif', 'sap', 'tributación', 'finanzas', 'auditoría']),
+    ('Construcción', 'hard-hat', 3,
+     ['Ingeniero Civil', 'Maestro de Obra', 'Arquitecto', 'Supervisor de Seguridad'],
+     ['autocad', 'revit', 'metrados', 'seguridad industrial', 's10', 'lectura de planos']),
+]
+
+CIUDADES = [('Lima', 55), ('Arequipa', 8), ('Trujillo', 7), ('Chiclayo', 5), ('Piura', 5), ('Cusco', 4),
+            ('Huancayo', 3), ('Iquitos', 3), ('Tacna', 2), ('Ica', 2), ('Puno', 2), ('Cajamarca', 2)]
+
+NOMBRES = ['Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Rosa', 'Jorge', 'Carmen', 'José', 'Lucía', 'Miguel',
+           'Sofía', 'Pedro', 'Valeria', 'Diego', 'Camila', 'Andrés', 'Daniela', 'Renzo', 'Fiorella']
+APELLIDOS = ['Pérez', 'García', 'Rodríguez', 'Quispe', 'Flores', 'Sánchez', 'Ramírez', 'Torres', 'Mamani',
+             'Vargas', 'Castillo', 'Rojas', 'Chávez', 'Mendoza', 'Huamán', 'Díaz', 'Gutiérrez', 'Salazar']
+PALABRAS_EMPRESA = ['Andina', 'Pacífico', 'Inca', 'Global', 'Norte', 'Sur', 'Digital', 'Servicios', 'Grupo',
+                    'Consultores', 'Soluciones', 'Tech', 'Comercial', 'Industrial', 'Logística', 'Salud']
+SUFIJOS_EMPRESA = ['S.A.C.', 'S.A.', 'E.I.R.L.', 'S.R.L.']
+
+ESTADOS_OFERTA = [('activa', 80), ('cerrada', 10), ('pausada', 5), ('borrador', 3), ('pendiente_aprobacion', 2)]
+ESTADOS_POSTULACION = [('pendiente', 45), ('en_revision', 20), ('rechazado', 15), ('preseleccionado', 10),
+                       ('entrevista', 7), ('aceptado', 3)]
+TAMANOS = [('startup', 40), ('pyme', 35), ('mediana', 15), ('grande', 8), ('corporacion', 2)]
+NIVELES = [valor for valor, _ in OfertaTrabajo.NIVEL_EXPERIENCIA_CHOICES]
+MODALIDADES = [('presencial', 55), ('hibrido', 25), ('remoto', 20)]
+CONTRATOS = [('tiempo_completo', 60), ('medio_tiempo', 12), ('por_proyecto', 8), ('temporal', 8),
+             ('practicas', 7), ('freelance', 5)]
+DISPONIBILIDADES = [valor for valor, _ in PerfilPostulante.DISPONIBILIDAD_CHOICES]
+
+# Campos con auto_now/auto_now_add a los que se les da una fecha del pasado
+FECHAS_HISTORICAS = [
+    (OfertaTrabajo, 'fecha_creacion'), (OfertaTrabajo, 'fecha_actualizacion'),
+    (Postulacion, 'fecha_postulacion'), (Favorito, 'fecha_agregado'), (Notificacion, 'fecha_creacion'),
+]
+
+
+@contextmanager
+def fechas_manuales():
+    """Desactivar auto_now/auto_now_add de FECHAS_HISTORICAS mientras se generan los datos"""
+    campos = [modelo._meta.get_field(nombre) for modelo, nombre in FECHAS_HISTORICAS]
+    originales = [(campo.auto_now, campo.auto_now_add) for campo in campos]
+    for campo in campos:
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, (auto_now, auto_now_add) in zip(campos, originales):
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+def _acumulados(pesos):
+    return list(itertools.accumulate(pesos))
+
+
+class Generador:
+    """Genera un conjunto de datos reproducible para `postulantes` postulantes"""
+
+    def __init__(self, postulantes, semilla=SEMILLA, password='1234', bloque=BLOQUE, progreso=None):
+        self.postulantes = postulantes
+        self.semilla = semilla
+        self.bloque = bloque
+        self.progreso = progreso or (lambda mensaje: None)
+        self.azar = random.Random(semilla)
+        self.dominio = f's{semilla}.empleoya.test'
+        # Hashear la contraseña es lo más caro de crear un usuario: se hace una vez
+        self.password = make_password(password)
+        self.ahora = timezone.now()
+        self.totales = {}
+
+    # ---------- utilidades ----------
+
+    def _elegir(self, opciones, k=1):
+        valores = [valor for valor, _ in opciones]
+        return self.azar.choices(valores, weights=[peso for _, peso in opciones], k=k)
+
+    def _fecha_pasada(self, dias=DIAS_HISTORIA):
+        return self.ahora - timedelta(seconds=self.azar.uniform(0, dias * 86400))
+
+    def _cantidad(self, media):
+        """Entero >= 0 con distribución geométrica de la media indicada"""
+        if media <= 0:
+            return 0
+        return int(math.log(1 - self.azar.random()) / math.log(media / (media + 1)))
+
+    def _usuarios(self, prefijo, inicio, cantidad, tipo, no_leidas=None):
+        usuarios = []
+        for i in range(cantidad):
+            usuarios.append(Usuario(
+                email=f'{prefijo}{inicio + i}@{self.dominio}',
+                password=self.password,
+                first_name=self.azar.choice(NOMBRES),
+                last_name=f'{self.azar.choice(APELLIDOS)} {self.azar.choice(APELLIDOS)}',
+                tipo_usuario=tipo,
+                email_verificado=self.azar.random() < 0.7,
+                date_joined=self._fecha_pasada(),
+                notificaciones_no_leidas=no_leidas[i] if no_leidas else 0,
+            ))
+        return Usuario.objects.bulk_create(usuarios, batch_size=self.bloque)
+
+    def _contar(self, nombre, cantidad):
+        self.totales[nombre] = self.totales.get(nombre, 0) + cantidad
+
+    # ---------- etapas ----------
+
+    def existe(self):
+        """True si esta semilla ya generó datos en la base"""
+        return Usuario.objects.filter(email__endswith=f'@{self.dominio}').exists()
+
+    def generar(self):
+        """Generar todo el conjunto. Devuelve {modelo: filas creadas}"""
+        with fechas_manuales():
+            self._categorias()
+            self._empresas()
+            self._ofertas()
+            self._postulantes()
+        self._derivados()
+        return self.totales
+
+    def _categorias(self):
+        existentes = dict(Categoria.objects.values_list('nombre', 'pk'))
+        nuevas = Categoria.objects.bulk_create([
+            Categoria(nombre=nombre, icono=icono, descripcion=f'Empleos de {nombre.lower()}')
+            for nombre, icono, *_ in CATEGORIAS if nombre not in existentes
+        ])
+        existentes.update((categoria.nombre, categoria.pk) for categoria in nuevas)
+        self.categorias = [(existentes[nombre], nombre, puestos, habilidades)
+                           for nombre, _, _, puestos, habilidades in CATEGORIAS]
+        self.pesos_categorias = _acumulados([peso for _, _, peso, _, _ in CATEGORIAS])
+        self._contar('categorias', len(nuevas))
+
+    def _empresas(self):
+        cantidad = max(1, round(self.postulantes * EMPRESAS_POR_POSTULANTE))
+        usuarios = self._usuarios('empresa', 0, cantidad, 'empleador')
+        empresas = []
+        for usuario in usuarios:
+            nombre = ' '.join(self.azar.sample(PALABRAS_EMPRESA, 2))
+            empresas.append(Empresa(
+                usuario_id=usuario.pk,
+                nombre_empresa=f'{nombre} {usuario.pk} {self.azar.choice(SUFIJOS_EMPRESA)}',
+                sector=self.azar.choices(self.categorias, cum_weights=self.pesos_categorias)[0][1],
+                ubicacion=self._elegir(CIUDADES)[0],
+                tamaño_empresa=self._elegir(TAMANOS)[0],
+                verificada=self.azar.random() < 0.4,
+            ))
+        self.empresas = [empresa.pk for empresa in Empresa.objects.bulk_create(empresas, batch_size=self.bloque)]
+        self._contar('usuarios', len(usuarios))
+        self._contar('empresas', len(self.empresas))
+        self.progreso(f'{len(self.empresas)} empresas')
+
+    def _ofertas(self):
+        cantidad = max(1, round(self.postulantes * OFERTAS_POR_POSTULANTE))
+        # Cola larga: la empresa en el puesto r publica en proporción a 1 / r^1.2
+        pesos_empresas = _acumulados([1 / (rango ** 1.2) for rango in range(1, len(self.empresas) + 1)])
+        self.empresas_orden = self.empresas[:]
+        self.azar.shuffle(self.empresas_orden)
+
+        self.ofertas = []           # ids de las ofertas que aceptan postulaciones
+        self.fechas_ofertas = []    # fecha de publicación de cada una
+        self.categorias_ofertas = []
+        pesos_ofertas = []
+        for inicio in range(0, cantidad, self.bloque):
+            lote = []
+            for _ in range(min(self.bloque, cantidad - inicio)):
+                lote.append(self._oferta(pesos_empresas))
+            with transaction.atomic():
+                OfertaTrabajo.objects.bulk_create(lote, batch_size=self.bloque)
+            for oferta in lote:
+                if oferta.fecha_publicacion:
+                    self.ofertas.append(oferta.pk)
+                    self.fechas_ofertas.append(oferta.fecha_publicacion)
+                    self.categorias_ofertas.append(oferta.categoria_id)
+                    # Popularidad log-normal: unas pocas ofertas reciben la mayoría de postulaciones
+                    pesos_ofertas.append(self.azar.lognormvariate(0, 1.2))
+            self._contar('ofertas', len(lote))
+            self.progreso(f'{inicio + len(lote)} ofertas')
+        self.pesos_ofertas = _acumulados(pesos_ofertas)
+
+    def _oferta(self, pesos_empresas):
+        categoria_id, _, puestos, habilidades = self.azar.choices(
+            self.categorias, cum_weights=self.pesos_categorias
+        )[0]
+        nivel = self.azar.choice(NIVELES)
+        puesto = self.azar.choice(puestos)
+        ciudad = self._elegir(CIUDADES)[0]
+        estado = self._elegir(ESTADOS_OFERTA)[0]
+        creada = self._fecha_pasada()
+        publicada = creada if estado in ('activa', 'cerrada', 'pausada') else None
+        base = self.azar.choice([1025, 1500, 2000, 2500, 3500, 5000, 8000])
+        requisitos = self.azar.sample(habilidades, min(len(habilidades), self.azar.randint(3, 6)))
+        return OfertaTrabajo(
+            empresa_id=self.azar.choices(self.empresas_orden, cum_weights=pesos_empresas)[0],
+            categoria_id=categoria_id,
+            titulo=f'{puesto} {dict(OfertaTrabajo.NIVEL_EXPERIENCIA_CHOICES)[nivel]}',
+            descripcion=(
+                f'Buscamos {puesto.lower()} para unirse a nuestro equipo en {ciudad}. '
+                f'Trabajarás con {", ".join(requisitos[:2])} en proyectos de alto impacto.'
+            ),
+            requisitos=', '.join(requisitos),
+            beneficios='Planilla completa, seguro EPS, capacitaciones',
+            salario_min=base if self.azar.random() < 0.7 else None,
+            salario_max=round(base * self.azar.uniform(1.2, 1.8)),
+            ubicacion=ciudad,
+            modalidad=self._elegir(MODALIDADES)[0],
+            tipo_contrato=self._elegir(CONTRATOS)[0],
+            nivel_experiencia=nivel,
+            vacantes_disponibles=1 + self._cantidad(0.5),
+            estado=estado,
+            aprobada_admin=publicada is not None,
+            fecha_publicacion=publicada,
+            fecha_aprobacion=publicada,
+            fecha_expiracion=self._expiracion(estado, publicada),
+            vistas=int(self.azar.lognormvariate(3, 1.3)) if publicada else 0,
+            fecha_creacion=creada,
+            fecha_actualizacion=creada,
+        )
+
+    def _expiracion(self, estado, publicada):
+        """Vence 30-90 días después de publicada; si sigue activa, 30-90 días después de hoy"""
+        if not publicada:
+            return None
+        duracion = timedelta(days=self.azar.randint(30, 90))
+        if estado == 'activa':
+            return max(publicada, self.ahora) + duracion
+        return publicada + duracion
+
+    def _postulantes(self):
+        for inicio in range(0, self.postulantes, self.bloque):
+            cantidad = min(self.bloque, self.postulantes - inicio)
+            notificaciones = [
+                [self.azar.random() < 0.6 for _ in range(self._cantidad(NOTIFICACIONES_MEDIA))]
+                for _ in range(cantidad)
+            ]
+            with transaction.atomic():
+                usuarios = self._usuarios(
+                    'postulante', inicio, cantidad, 'postulante',
+                    no_leidas=[leidas.count(False) for leidas in notificaciones],
+                )
+                perfiles = PerfilPostulante.objects.bulk_create(
+                    [self._perfil(usuario) for usuario in usuarios], batch_size=self.bloque
+                )
+                self._actividad(usuarios, perfiles, notificaciones)
+            self._contar('usuarios', len(usuarios))
+            self._contar('perfiles', len(perfiles))
+            self.progreso(f'{inicio + cantidad} postulantes')
+
+    def _perfil(self, usuario):
+        _, _, puestos, habilidades = self.azar.choices(self.categorias, cum_weights=self.pesos_categorias)[0]
+        años = self._cantidad(4)
+        return PerfilPostulante(
+            usuario_id=usuario.pk,
+            titulo_profesional=self.azar.choice(puestos),
+            resumen_profesional=f'Profesional con {años} años de experiencia.',
+            nivel_experiencia=NIVELES[min(len(NIVELES) - 1, años // 3)],
+            años_experiencia=min(años, 50),
+            habilidades=', '.join(self.azar.sample(habilidades, min(len(habilidades), self.azar.randint(3, 7)))),
+            idiomas='Español' + (', Inglés' if self.azar.random() < 0.35 else ''),
+            ubicacion=self._elegir(CIUDADES)[0],
+            salario_esperado=self.azar.choice([1200, 1800, 2500, 3500, 5000, 7000]),
+            disponibilidad=self.azar.choice(DISPONIBILIDADES),
+        )
+
+    def _ofertas_distintas(self, cantidad):
+        """Índices de `cantidad` ofertas distintas, elegidas según su popularidad"""
+        cantidad = min(cantidad, len(self.ofertas))
+        elegidas = set()
+        while len(elegidas) < cantidad:
+            elegidas.update(self.azar.choices(
+                range(len(self.ofertas)), cum_weights=self.pesos_ofertas, k=cantidad - len(elegidas)
+            ))
+        return elegidas
+
+    def _actividad(self, usuarios, perfiles, notificaciones):
+        """Postulaciones, favoritos y notificaciones de un bloque de postulantes"""
+        postulaciones = []
+        favoritos = []
+        avisos = []
+        for usuario, perfil, leidas in zip(usuarios, perfiles, notificaciones):
+            if self.ofertas:
+                for i in self._ofertas_distintas(self._cantidad(POSTULACIONES_MEDIA)):
+                    estado = self._elegir(ESTADOS_POSTULACION)[0]
+                    fecha = self._despues_de(self.fechas_ofertas[i], dias=30)
+                    postulaciones.append(Postulacion(
+                        oferta_id=self.ofertas[i],
+                        postulante_id=perfil.pk,
+                        estado=estado,
+                        fecha_postulacion=fecha,
+                        fecha_cambio_estado=self._despues_de(fecha, dias=15) if estado != 'pendiente' else None,
+                    ))
+                for i in self._ofertas_distintas(self._cantidad(FAVORITOS_MEDIA)):
+                    favoritos.append(Favorito(
+                        usuario_id=usuario.pk,
+                        oferta_id=self.ofertas[i],
+                        fecha_agregado=self._despues_de(self.fechas_ofertas[i], dias=30),
+                    ))
+            for leida in leidas:
+                fecha = self._despues_de(usuario.date_joined, dias=DIAS_HISTORIA)
+                avisos.append(Notificacion(
+                    usuario_id=usuario.pk,
+                    tipo=self.azar.choice(['estado_postulacion', 'nueva_oferta']),
+                    titulo='Tu postulación cambió de estado',
+                    mensaje='Revisa el estado de tus postulaciones',
+                    leida=leida,
+                    fecha_creacion=fecha,
+                    fecha_leida=fecha + timedelta(hours=self.azar.uniform(1, 72)) if leida else None,
+                ))
+        Postulacion.objects.bulk_create(postulaciones, batch_size=self.bloque)
+        Favorito.objects.bulk_create(favoritos, batch_size=self.bloque)
+        Notificacion.objects.bulk_create(avisos, batch_size=self.bloque)
+        self._contar('postulaciones', len(postulaciones))
+        self._contar('favoritos', len(favoritos))
+        self._contar('notificaciones', len(avisos))
+
+    def _despues_de(self, fecha, dias):
+        """Fecha al azar entre `fecha` y `dias` días después, sin pasar de ahora"""
+        limite = min((self.ahora - fecha).total_seconds(), dias * 86400)
+        return fecha + timedelta(seconds=self.azar.uniform(0, max(limite, 0)))
+
+    def _derivados(self):
+        """Estructuras que los signals mantendrían si las filas se crearan una a una"""
+        self.progreso('Reconstruyendo índice de búsqueda, contadores y métricas')
+        with transaction.atomic():
+            busqueda.reconstruir_indice()
+        for inicio in range(0, len(self.ofertas), 1000):
+            contadores.reconciliar(self.ofertas[inicio:inicio + 1000])
+            metricas.reconstruir(self.ofertas[inicio:inicio + 1000])
+        facetas.invalidar()
+        portada.invalidar()
@@ -0,0 +1,315 @@
+import csv
+import json
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from . import busqueda, facetas, match, notificaciones, portada, similares
+from .models import Categoria, Empresa, OfertaTrabajo
+
+# Importación masiva de ofertas desde archivos CSV o JSONL
+# El archivo se lee fila a fila (nunca entero en memoria) y se procesa por
+# bloques: cada bloque se valida, se guarda con un solo bulk_create dentro de
+# una transacción y se descarta. Empresas y categorías se resuelven con
+# diccionarios en memoria, así cada una se consulta una sola vez por archivo.
+#
+# Las filas con id_externo se insertan o actualizan (upsert) sobre la pareja
+# (empresa, id_externo); las que no lo tienen siempre crean una oferta nueva.
+# bulk_create no dispara signals, así que cada bloque reindexa sus ofertas y
+# encola el aviso de las publicadas; de las actualizadas descarta las similares
+# viejas (las calcula recalcular_similares) y vuelve a puntuar sus postulaciones
+# abiertas. Al final se invalidan las cachés del buscador y de inicio.
+# Las recomendaciones las incorpora actualizar_recomendaciones, que toma las
+# ofertas por fecha_actualizacion.
+
+BLOQUE = getattr(settings, 'IMPORTACION_BLOQUE', 500)
+
+CAMPOS_TEXTO = ['titulo', 'descripcion', 'requisitos', 'responsabilidades', 'beneficios', 'ubicacion']
+CAMPOS_OBLIGATORIOS = ['titulo', 'descripcion', 'modalidad', 'tipo_contrato', 'nivel_experiencia']
+
+# Campos que una fila puede cambiar en una oferta ya importada; el estado, la
+# aprobación y las fechas de publicación los maneja el sitio
+CAMPOS_ACTUALIZABLES = CAMPOS_TEXTO + [
+    'categoria', 'salario_min', 'salario_max', 'moneda', 'modalidad', 'tipo_contrato',
+    'nivel_experiencia', 'vacantes_disponibles', 'fecha_expiracion', 'fecha_actualizacion',
+]
+
+SALARIO_MAXIMO = Decimal('99999999.99')
+
+
+# ==================== LECTURA ====================
+
+def leer_csv(archivo):
+    """Filas de un CSV con encabezados: (número de línea, dict)"""
+    lector = csv.DictReader(archivo)
+    for fila in lector:
+        yield lector.line_num, fila
+
+
+def leer_jsonl(archivo):
+    """Filas de un archivo con un objeto JSON por línea: (número de línea, dict)"""
+    for numero, linea in enumerate(archivo, start=1):
+        if not linea.strip():
+            continue
+        try:
+            fila = json.loads(linea)
+        except json.JSONDecodeError as error:
+            yield numero, ValueError(f'JSON inválido: {error.msg}')
+            continue
+        yield numero, fila if isinstance(fila, dict) else ValueError('Se esperaba un objeto JSON')
+
+
+LECTORES = {
+    'csv': leer_csv,
+    'jsonl': leer_jsonl,
+}
+
+
+def formato_archivo(ruta):
+    """Formato según la extensión del archivo"""
+    extension = Path(ruta).suffix.lower().lstrip('.')
+    return 'jsonl' if extension in ('jsonl', 'ndjson') else extension
+
+
+# ==================== VALIDACIÓN ====================
+
+def _texto(fila, campo):
+    valor = fila.get(campo)
+    return '' if valor is None else str(valor).strip()
+
+
+def _opciones(choices):
+    """Acepta tanto el valor ('tiempo_completo') como la etiqueta ('Tiempo Completo')"""
+    opciones = {}
+    for valor, etiqueta in choices:
+        opciones[match.normalizar(valor)] = valor
+        opciones[match.normalizar(etiqueta)] = valor
+    return opciones
+
+
+OPCIONES = {
+    'modalidad': _opciones(OfertaTrabajo.MODALIDAD_CHOICES),
+    'tipo_contrato': _opciones(OfertaTrabajo.TIPO_CONTRATO_CHOICES),
+    'nivel_experiencia': _opciones(OfertaTrabajo.NIVEL_EXPERIENCIA_CHOICES),
+}
+
+
+def _salario(fila, campo):
+    valor = _texto(fila, campo)
+    if not valor:
+        return None
+    try:
+        salario = Decimal(valor.replace(',', '')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f'{campo}: "{valor}" no es un número')
+    if not 0 <= salario <= SALARIO_MAXIMO:
+        raise ValueError(f'{campo}: fuera de rango')
+    return salario
+
+
+def _fecha(fila, campo):
+    valor = _texto(fila, campo)
+    if not valor:
+        return None
+    dia = parse_date(valor)
+    if dia is not None:
+        # Una fecha sin hora vence al terminar ese día
+        fecha = datetime.combine(dia, time.max)
+    else:
+        fecha = parse_datetime(valor)
+        if fecha is None:
+            raise ValueError(f'{campo}: "{valor}" no es una fecha (AAAA-MM-DD)')
+    if timezone.is_naive(fecha):
+        fecha = timezone.make_aware(fecha)
+    return fecha
+
+
+class Catalogo:
+    """Empresas y categorías ya resueltas durante la importación"""
+
+    def __init__(self, empresa_defecto=None):
+        self.empresa_defecto = empresa_defecto
+        self.empresas_ruc = {}
+        self.empresas_nombre = None
+        self.categorias = {
+            match.normalizar(nombre): pk for pk, nombre in Categoria.objects.values_list('pk', 'nombre')
+        }
+
+    def _por_nombre(self, nombre):
+        if self.empresas_nombre is None:
+            # Se compara sin mayúsculas ni tildes, así que el índice se arma aquí
+            self.empresas_nombre = {}
+            for pk, nombre_empresa in Empresa.objects.values_list('pk', 'nombre_empresa').iterator():
+                self.empresas_nombre.setdefault(match.normalizar(nombre_empresa).strip(), []).append(pk)
+        return self.empresas_nombre.get(match.normalizar(nombre), [])
+
+    def _por_ruc(self, ruc):
+        if ruc not in self.empresas_ruc:
+            # También se recuerdan los RUC que no existen
+            self.empresas_ruc[ruc] = list(Empresa.objects.filter(ruc=ruc).values_list('pk', flat=True))
+        return self.empresas_ruc[ruc]
+
+    def empresa(self, fila):
+        ruc = _texto(fila, 'empresa_ruc')
+        nombre = _texto(fila, 'empresa')
+        if not ruc and not nombre:
+            if self.empresa_defecto is None:
+                raise ValueError('Falta la empresa (columna empresa o empresa_ruc)')
+            return self.empresa_defecto
+
+        ids = self._por_ruc(ruc) if ruc else self._por_nombre(nombre)
+        if len(ids) != 1:
+            problema = 'no existe' if not ids else 'es ambigua, use empresa_ruc'
+            raise ValueError(f'La empresa "{ruc or nombre}" {problema}')
+        return ids[0]
+
+    def categoria(self, fila):
+        nombre = _texto(fila, 'categoria')
+        if not nombre:
+            return None
+        try:
+            return self.categorias[match.normalizar(nombre)]
+        except KeyError:
+            raise ValueError(f'La categoría "{nombre}" no existe')
+
+
+def validar(fila, catalogo):
+    """Construir (sin guardar) la oferta de una fila; ValueError si la fila no es válida"""
+    if isinstance(fila, Exception):
+        raise fila
+
+    faltantes = [campo for campo in CAMPOS_OBLIGATORIOS if not _texto(fila, campo)]
+    if faltantes:
+        raise ValueError(f'Faltan campos obligatorios: {", ".join(faltantes)}')
+
+    datos = {campo: _texto(fila, campo) for campo in CAMPOS_TEXTO}
+    if len(datos['titulo']) > 200 or len(datos['ubicacion']) > 200:
+        raise ValueError('titulo y ubicacion admiten hasta 200 caracteres')
+
+    for campo, opciones in OPCIONES.items():
+        valor = _texto(fila, campo)
+        try:
+            datos[campo] = opciones[match.normalizar(valor)]
+        except KeyError:
+            raise ValueError(f'{campo}: valor no válido "{valor}"')
+
+    datos['salario_min'] = _salario(fila, 'salario_min')
+    datos['salario_max'] = _salario(fila, 'salario_max')
+    if datos['salario_min'] and datos['salario_max'] and datos['salario_min'] > datos['salario_max']:
+        raise ValueError('salario_min es mayor que salario_max')
+
+    vacantes = _texto(fila, 'vacantes_disponibles') or '1'
+    if not vacantes.isdigit() or int(vacantes) < 1:
+        raise ValueError(f'vacantes_disponibles: "{vacantes}" no es un entero positivo')
+
+    id_externo = _texto(fila, 'id_externo')
+    if len(id_externo) > 100:
+        raise ValueError('id_externo admite hasta 100 caracteres')
+
+    return OfertaTrabajo(
+        empresa_id=catalogo.empresa(fila),
+        categoria_id=catalogo.categoria(fila),
+        id_externo=id_externo or None,
+        moneda=(_texto(fila, 'moneda') or 'PEN').upper()[:3],
+        vacantes_disponibles=int(vacantes),
+        fecha_expiracion=_fecha(fila, 'fecha_expiracion'),
+        **datos,
+    )
+
+
+# ==================== GUARDADO ====================
+
+def guardar_bloque(ofertas, publicar=False):
+    """
+    Insertar o actualizar un bloque de ofertas válidas en una transacción.
+    Devuelve (creadas, actualizadas).
+    """
+    # Si un id_externo se repite en el bloque, gana la última fila
+    unicas = {}
+    for oferta in ofertas:
+        clave = (oferta.empresa_id, oferta.id_externo) if oferta.id_externo else id(oferta)
+        unicas[clave] = oferta
+    ofertas = list(unicas.values())
+
+    ahora = timezone.now()
+    for oferta in ofertas:
+        if publicar:
+            oferta.estado = 'activa'
+            oferta.aprobada_admin = True
+            oferta.fecha_publicacion = oferta.fecha_aprobacion = ahora
+        else:
+            oferta.estado = 'pendiente_aprobacion'
+
+    with transaction.atomic():
+        existentes = set(OfertaTrabajo.objects.filter(
+            empresa_id__in={oferta.empresa_id for oferta in ofertas},
+            id_externo__in=[oferta.id_externo for oferta in ofertas if oferta.id_externo],
+        ).values_list('empresa_id', 'id_externo'))
+
+        con_id = [oferta for oferta in ofertas if oferta.id_externo]
+        sin_id = [oferta for oferta in ofertas if not oferta.id_externo]
+        OfertaTrabajo.objects.bulk_create(
+            con_id,
+            update_conflicts=True,
+            unique_fields=['empresa', 'id_externo'],
+            update_fields=CAMPOS_ACTUALIZABLES,
+        )
+        OfertaTrabajo.objects.bulk_create(sin_id)
+
+        actualizadas = [o.pk for o in con_id if (o.empresa_id, o.id_externo) in existentes]
+        nuevas = [o.pk for o in ofertas if (o.empresa_id, o.id_externo) not in existentes]
+
+        busqueda.indexar_ofertas([oferta.pk for oferta in ofertas])
+        # El texto de las actualizadas cambió; recalcular_similares completa sus listas
+        similares.retirar_ofertas(actualizadas)
+        if publicar:
+            notificaciones.encolar_varios('nueva_oferta', [
+                (f'nueva_oferta:{pk}', {'oferta_id': pk}) for pk in nuevas
+            ])
+
+    # Como el signal de una oferta editada: volver a puntuar sus postulaciones
+    # abiertas, fuera de la transacción del bloque para no alargarla
+    if actualizadas:
+        match.recalcular_ofertas(actualizadas)
+
+    return len(nuevas), len(actualizadas)
+
+
+def importar(filas, empresa_defecto=None, bloque=BLOQUE, publicar=False, simular=False, al_avanzar=None):
+    """
+    Importar las filas [(línea, dict)] por bloques.
+    Devuelve {'leidas', 'creadas', 'actualizadas', 'errores': [(línea, mensaje)]}.
+    """
+    catalogo = Catalogo(empresa_defecto)
+    resultado = {'leidas': 0, 'creadas': 0, 'actualizadas': 0, 'errores': []}
+
+    filas = iter(filas)
+    while True:
+        lote = list(islice(filas, bloque))
+        if not lote:
+            break
+        validas = []
+        for linea, fila in lote:
+            try:
+                validas.append(validar(fila, catalogo))
+            except ValueError as error:
+                resultado['errores'].append((linea, str(error)))
+        resultado['leidas'] += len(lote)
+
+        if validas and not simular:
+            creadas, actualizadas = guardar_bloque(validas, publicar)
+            resultado['creadas'] += creadas
+            resultado['actualizadas'] += actualizadas
+        if al_avanzar:
+            al_avanzar(resultado)
+
+    if resultado['creadas'] or resultado['actualizadas']:
+        facetas.invalidar()
+        portada.invalidar()
+    return resultado
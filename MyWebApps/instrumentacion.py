@@ -0,0 +1,257 @@
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+# Medición de cada petición: consultas SQL, tiempo en la base, tiempo de
+# plantillas y tiempo total
+# El middleware abre una Medicion por petición (en una ContextVar) y envuelve
+# las conexiones con execute_wrapper para contar las consultas y su duración.
+# El backend de plantillas PlantillasInstrumentadas mide cada render de primer
+# nivel (los {% include %} y {% extends %} quedan dentro) descontando las
+# consultas que se ejecutan mientras se renderiza, así "db", "tpl" y "app"
+# (el resto: Python de la vista y los middlewares) no se solapan.
+#
+# Al terminar se agrega la cabecera Server-Timing, se escribe una línea de log
+# con los mismos valores y se suman a histogramas por nombre de ruta. Los
+# histogramas viven en memoria del proceso: con varios workers cada uno tiene
+# los suyos y se pierden al reiniciar. En las respuestas por streaming solo se
+# mide hasta que la vista devuelve la respuesta, no el envío del cuerpo.
+#
+# Las consultas que una vista lanza en otros hilos (ver concurrencia.py) se
+# miden con medir_conexiones() en ese hilo; como se solapan, "db" es la suma de
+# sus duraciones y puede superar al tiempo real que pasó esperando a la base.
+
+HABILITADA = getattr(settings, 'INSTRUMENTACION_HABILITADA', True)
+CABECERA = getattr(settings, 'INSTRUMENTACION_SERVER_TIMING', True)
+# Límite superior (ms) de cada intervalo de los histogramas; el último es abierto
+LIMITES_MS = getattr(settings, 'INSTRUMENTACION_LIMITES_MS', [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000])
+
+_medicion_actual = contextvars.ContextVar('medicion_actual', default=None)
+
+
+class Medicion:
+    """Consultas y tiempos (en segundos) de una petición"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.db = 0.0
+        self.plantillas = 0.0
+        self.renderizando = False
+        # Varias consultas de la misma petición pueden terminar a la vez en hilos distintos
+        self.candado = threading.Lock()
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = time.perf_counter() - inicio
+        with medicion.candado:
+            medicion.consultas += 1
+            medicion.db += duracion
+
+
+@contextmanager
+def medir_conexiones():
+    """Medir las consultas de las conexiones de este hilo (si hay una medición en curso)"""
+    with ExitStack() as envolturas:
+        if HABILITADA:
+            for conexion in connections.all():
+                envolturas.enter_context(conexion.execute_wrapper(_medir_consulta))
+        yield
+
+
+# ==================== PLANTILLAS ====================
+
+class PlantillaInstrumentada:
+    """Plantilla del backend de Django que suma su tiempo de render a la medición"""
+
+    def __init__(self, plantilla):
+        self.plantilla = plantilla
+
+    def __getattr__(self, nombre):
+        return getattr(self.plantilla, nombre)
+
+    def render(self, context=None, request=None):
+        medicion = _medicion_actual.get()
+        if medicion is None or medicion.renderizando:
+            return self.plantilla.render(context, request)
+        medicion.renderizando = True
+        db_antes = medicion.db
+        inicio = time.perf_counter()
+        try:
+            return self.plantilla.render(context, request)
+        finally:
+            # Las consultas lanzadas desde la plantilla ya cuentan como tiempo de base
+            medicion.plantillas += time.perf_counter() - inicio - (medicion.db - db_antes)
+            medicion.renderizando = False
+
+
+class PlantillasInstrumentadas(DjangoTemplates):
+    """Backend DjangoTemplates que mide el tiempo de render de cada plantilla"""
+
+    def from_string(self, template_code):
+        return PlantillaInstrumentada(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return PlantillaInstrumentada(super().get_template(template_name))
+
+
+# ==================== HISTOGRAMAS ====================
+
+class Histograma:
+    """Cantidad de valores (ms) por intervalo de LIMITES_MS"""
+
+    def __init__(self):
+        self.cuentas = [0] * (len(LIMITES_MS) + 1)
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def agregar(self, valor):
+        self.cuentas[bisect_left(LIMITES_MS, valor)] += 1
+        self.total += 1
+        self.suma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def promedio(self):
+        return self.suma / self.total if self.total else 0.0
+
+    def percentil(self, p):
+        """Límite superior del intervalo donde cae el percentil p (el máximo si es el último)"""
+        objetivo = p / 100 * self.total
+        acumulado = 0
+        for limite, cuenta in zip(LIMITES_MS, self.cuentas):
+            acumulado += cuenta
+            if cuenta and acumulado >= objetivo:
+                return min(limite, self.maximo)
+        return self.maximo
+
+
+class EstadisticasRuta:
+    """Histogramas de una ruta"""
+
+    def __init__(self):
+        self.total = Histograma()
+        self.db = Histograma()
+        self.plantillas = Histograma()
+        self.consultas = 0
+        self.maximo_consultas = 0
+        self.errores = 0
+
+    def agregar(self, total_ms, db_ms, plantillas_ms, consultas, estado):
+        self.total.agregar(total_ms)
+        self.db.agregar(db_ms)
+        self.plantillas.agregar(plantillas_ms)
+        self.consultas += consultas
+        self.maximo_consultas = max(self.maximo_consultas, consultas)
+        if estado >= 500:
+            self.errores += 1
+
+
+_estadisticas = {}
+_candado = threading.Lock()
+
+
+def registrar(ruta, total_ms, db_ms, plantillas_ms, consultas, estado):
+    """Sumar una petición a los histogramas de su ruta"""
+    with _candado:
+        if ruta not in _estadisticas:
+            _estadisticas[ruta] = EstadisticasRuta()
+        _estadisticas[ruta].agregar(total_ms, db_ms, plantillas_ms, consultas, estado)
+
+
+def reiniciar():
+    """Vaciar los histogramas de este proceso"""
+    with _candado:
+        _estadisticas.clear()
+
+
+def resumen():
+    """Estadísticas por ruta, primero las que más tiempo suman en total"""
+    with _candado:
+        filas = []
+        for ruta, datos in _estadisticas.items():
+            peticiones = datos.total.total
+            filas.append({
+                'ruta': ruta,
+                'peticiones': peticiones,
+                'errores': datos.errores,
+                'p50_ms': datos.total.percentil(50),
+                'p95_ms': datos.total.percentil(95),
+                'p99_ms': datos.total.percentil(99),
+                'maximo_ms': datos.total.maximo,
+                'promedio_ms': datos.total.promedio(),
+                'db_ms': datos.db.promedio(),
+                'plantillas_ms': datos.plantillas.promedio(),
+                'app_ms': datos.total.promedio() - datos.db.promedio() - datos.plantillas.promedio(),
+                'consultas': datos.consultas / peticiones,
+                'maximo_consultas': datos.maximo_consultas,
+                'tiempo_acumulado_s': datos.total.suma / 1000,
+                'histograma': list(datos.total.cuentas),
+            })
+    return sorted(filas, key=lambda fila: fila['tiempo_acumulado_s'], reverse=True)
+
+
+# ==================== MIDDLEWARE ====================
+
+class InstrumentacionMiddleware:
+    """Mide cada petición; va primero en MIDDLEWARE para incluir a los demás"""
+
+    def __init__(self, get_response):
+        if not HABILITADA:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        medicion = Medicion()
+        token = _medicion_actual.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            with medir_conexiones():
+                response = self.get_response(request)
+        finally:
+            _medicion_actual.reset(token)
+
+        total_ms = (time.perf_counter() - inicio) * 1000
+        db_ms = medicion.db * 1000
+        plantillas_ms = medicion.plantillas * 1000
+        app_ms = max(0.0, total_ms - db_ms - plantillas_ms)
+        coincidencia = getattr(request, 'resolver_match', None)
+        ruta = coincidencia.view_name if coincidencia else '(sin ruta)'
+
+        if CABECERA:
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{medicion.consultas} consultas", '
+                f'tpl;dur={plantillas_ms:.1f}, app;dur={app_ms:.1f}, total;dur={total_ms:.1f}'
+            )
+        logger.info(
+            'ruta=%s metodo=%s estado=%s consultas=%d db_ms=%.1f plantillas_ms=%.1f app_ms=%.1f total_ms=%.1f',
+            ruta, request.method, response.status_code, medicion.consultas, db_ms, plantillas_ms, app_ms, total_ms,
+            extra={'rendimiento': {
+                'ruta': ruta,
+                'metodo': request.method,
+                'estado': response.status_code,
+                'consultas': medicion.consultas,
+                'db_ms': round(db_ms, 1),
+                'plantillas_ms': round(plantillas_ms, 1),
+                'app_ms': round(app_ms, 1),
+                'total_ms': round(total_ms, 1),
+            }},
+        )
+        registrar(ruta, total_ms, db_ms, plantillas_ms, medicion.consultas, response.status_code)
+        return response
@@ -0,0 +1,69 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from MyWebApps import match, recomendaciones
+from MyWebApps.models import PerfilPostulante
+
+
+class Command(BaseCommand):
+    help = 'Incorpora a las recomendaciones las ofertas nuevas o editadas, o las recalcula por completo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutos', type=int, default=60,
+                            help='Ofertas modificadas en los últimos N minutos (por defecto 60). '
+                                 'Programarlo con un intervalo menor para que las ventanas se solapen')
+        parser.add_argument('--completo', action='store_true',
+                            help='Recalcular desde cero las recomendaciones de todos los perfiles')
+        parser.add_argument('--perfil', type=int, action='append', dest='perfiles',
+                            help='Id de perfil a recalcular desde cero (se puede repetir)')
+        parser.add_argument('--bloque', type=int, default=1000,
+                            help='Perfiles por bloque (por defecto 1000)')
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+
+        if options['completo'] or options['perfiles']:
+            perfiles = PerfilPostulante.objects.order_by('pk').only(*match.CAMPOS_PERFIL)
+            if options['perfiles']:
+                perfiles = perfiles.filter(pk__in=options['perfiles'])
+            # Las ofertas candidatas se normalizan una sola vez para todos los perfiles
+            ofertas = recomendaciones.candidatas()
+            total = 0
+            for perfil in perfiles.iterator(chunk_size=options['bloque']):
+                recomendaciones.calcular_perfil(perfil, ofertas)
+                total += 1
+            mensaje = f'{total} perfiles recalculados'
+        else:
+            desde = timezone.now() - timedelta(minutes=options['minutos'])
+            ids = list(recomendaciones.ofertas_recomendables().filter(
+                fecha_actualizacion__gte=desde
+            ).values_list('pk', flat=True))
+            total = recomendaciones.incorporar_ofertas(ids, bloque=options['bloque']) if ids else 0
+            mensaje = f'{len(ids)} ofertas incorporadas a {total} perfiles'
+
+            # Perfiles pendientes: editados o que nunca se calcularon
+            pendientes = PerfilPostulante.objects.filter(
+                fecha_recomendaciones__isnull=True
+            ).order_by('pk').only(*match.CAMPOS_PERFIL)
+            nuevos = 0
+            ofertas = None
+            ultimo_id = 0
+            # Por bloques de pk: calcular_perfil marca las filas que se van recorriendo
+            while True:
+                lote = list(pendientes.filter(pk__gt=ultimo_id)[:options['bloque']])
+                if not lote:
+                    break
+                ultimo_id = lote[-1].pk
+                if ofertas is None:
+                    ofertas = recomendaciones.candidatas()
+                for perfil in lote:
+                    recomendaciones.calcular_perfil(perfil, ofertas)
+                nuevos += len(lote)
+            if nuevos:
+                mensaje += f', {nuevos} perfiles pendientes recalculados'
+
+        duracion = time.monotonic() - inicio
+        self.stdout.write(self.style.SUCCESS(f'{mensaje} en {duracion:.2f}s'))
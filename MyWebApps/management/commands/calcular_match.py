@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from MyWebApps import match
+from MyWebApps.models import Postulacion
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la puntuación de match de las postulaciones abiertas, por bloques'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--oferta', type=int, action='append', dest='ofertas',
+                            help='Id de oferta a recalcular (se puede repetir). Por defecto, todas')
+        parser.add_argument('--bloque', type=int, default=2000,
+                            help='Postulaciones por bloque (por defecto 2000)')
+        parser.add_argument('--incluir-cerradas', action='store_true',
+                            help='Incluir también postulaciones aceptadas o rechazadas')
+
+    def handle(self, *args, **options):
+        postulaciones = Postulacion.objects.all()
+        if options['ofertas']:
+            postulaciones = postulaciones.filter(oferta_id__in=options['ofertas'])
+        if not options['incluir_cerradas']:
+            postulaciones = postulaciones.exclude(estado__in=match.ESTADOS_CERRADOS)
+
+        inicio = time.monotonic()
+        total = match.recalcular(postulaciones, bloque=options['bloque'])
+        duracion = time.monotonic() - inicio
+
+        velocidad = total / duracion if duracion else total
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} postulaciones puntuadas en {duracion:.2f}s ({velocidad:.0f}/s)'
+        ))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from MyWebApps import expiracion
+
+
+class Command(BaseCommand):
+    help = 'Pasa a "expirada" las ofertas activas con fecha de expiración vencida, por bloques'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bloque', type=int, default=expiracion.BLOQUE,
+                            help=f'Ofertas por transacción (por defecto {expiracion.BLOQUE})')
+        parser.add_argument('--continuo', action='store_true',
+                            help='No terminar: repetir el barrido cada --intervalo segundos')
+        parser.add_argument('--intervalo', type=float, default=60,
+                            help='Segundos entre barridos en modo continuo (por defecto 60)')
+
+    def handle(self, *args, **options):
+        while True:
+            inicio = time.monotonic()
+            expiradas = expiracion.expirar_vencidas(bloque=options['bloque'])
+            if expiradas or not options['continuo']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{expiradas} ofertas expiradas en {time.monotonic() - inicio:.2f}s'
+                ))
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from MyWebApps import generador
+
+
+class Command(BaseCommand):
+    help = 'Genera un conjunto de datos sintéticos, reproducible y a la escala indicada, para pruebas de carga'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--postulantes', type=int, default=10000,
+                            help='Número de postulantes; empresas, ofertas y demás filas escalan con él '
+                                 '(por defecto 10000)')
+        parser.add_argument('--semilla', type=int, default=generador.SEMILLA,
+                            help=f'Semilla del generador (por defecto {generador.SEMILLA}). '
+                                 'La misma semilla produce los mismos datos')
+        parser.add_argument('--password', default='1234',
+                            help='Contraseña de todos los usuarios generados (por defecto 1234)')
+        parser.add_argument('--bloque', type=int, default=generador.BLOQUE,
+                            help=f'Filas por bulk_create (por defecto {generador.BLOQUE})')
+
+    def handle(self, *args, **options):
+        if options['postulantes'] < 1:
+            raise CommandError('--postulantes debe ser mayor que cero')
+
+        inicio = time.monotonic()
+
+        def progreso(mensaje):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'  [{time.monotonic() - inicio:.1f}s] {mensaje}')
+
+        datos = generador.Generador(
+            options['postulantes'],
+            semilla=options['semilla'],
+            password=options['password'],
+            bloque=options['bloque'],
+            progreso=progreso,
+        )
+        if datos.existe():
+            raise CommandError(
+                f'Ya existen datos generados con la semilla {options["semilla"]} '
+                f'(usuarios @{datos.dominio}); use otra --semilla'
+            )
+
+        totales = datos.generar()
+        duracion = time.monotonic() - inicio
+        filas = sum(totales.values())
+        detalle = ', '.join(f'{cantidad} {nombre}' for nombre, cantidad in totales.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'{filas} filas en {duracion:.1f}s ({filas / duracion:.0f} filas/s): {detalle}'
+        ))
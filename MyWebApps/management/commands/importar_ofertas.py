@@ -0,0 +1,74 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from MyWebApps import importacion
+from MyWebApps.models import Empresa
+
+
+class Command(BaseCommand):
+    help = 'Importa ofertas desde un archivo CSV o JSONL, por bloques y sin cargarlo entero en memoria'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo .csv o .jsonl')
+        parser.add_argument('--formato', choices=sorted(importacion.LECTORES),
+                            help='Formato del archivo (por defecto, según la extensión)')
+        parser.add_argument('--empresa', type=int,
+                            help='Id de la empresa para las filas sin columna empresa/empresa_ruc')
+        parser.add_argument('--bloque', type=int, default=importacion.BLOQUE,
+                            help=f'Filas por transacción (por defecto {importacion.BLOQUE})')
+        parser.add_argument('--publicar', action='store_true',
+                            help='Publicar y aprobar las ofertas nuevas (por defecto quedan pendientes de aprobación)')
+        parser.add_argument('--simular', action='store_true',
+                            help='Solo validar el archivo, sin guardar nada')
+        parser.add_argument('--errores',
+                            help='Guardar las filas rechazadas (línea, error) en este CSV')
+
+    def handle(self, *args, **options):
+        formato = options['formato'] or importacion.formato_archivo(options['archivo'])
+        if formato not in importacion.LECTORES:
+            raise CommandError(f'Formato no soportado: "{formato}". Use --formato csv o jsonl')
+        if options['empresa'] and not Empresa.objects.filter(pk=options['empresa']).exists():
+            raise CommandError(f'No existe la empresa {options["empresa"]}')
+
+        inicio = time.monotonic()
+
+        def al_avanzar(resultado):
+            if options['verbosity'] >= 2:
+                self.stdout.write(
+                    f'  {resultado["leidas"]} filas, {resultado["leidas"] / (time.monotonic() - inicio):.0f} filas/s'
+                )
+
+        try:
+            archivo = open(options['archivo'], encoding='utf-8-sig', newline='')
+        except OSError as error:
+            raise CommandError(f'No se pudo abrir el archivo: {error}')
+        with archivo:
+            resultado = importacion.importar(
+                importacion.LECTORES[formato](archivo),
+                empresa_defecto=options['empresa'],
+                bloque=options['bloque'],
+                publicar=options['publicar'],
+                simular=options['simular'],
+                al_avanzar=al_avanzar,
+            )
+
+        errores = resultado['errores']
+        for linea, mensaje in errores[:20]:
+            self.stdout.write(self.style.WARNING(f'Línea {linea}: {mensaje}'))
+        if len(errores) > 20:
+            self.stdout.write(self.style.WARNING(f'... y {len(errores) - 20} errores más'))
+        if errores and options['errores']:
+            with open(options['errores'], 'w', encoding='utf-8', newline='') as salida:
+                escritor = csv.writer(salida)
+                escritor.writerow(['linea', 'error'])
+                escritor.writerows(errores)
+
+        duracion = time.monotonic() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado["leidas"]} filas leídas ({resultado["leidas"] / duracion:.0f} filas/s): '
+            f'{resultado["creadas"]} creadas, {resultado["actualizadas"]} actualizadas, '
+            f'{len(errores)} con errores en {duracion:.2f}s'
+            + (' (simulación, no se guardó nada)' if options['simular'] else '')
+        ))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from MyWebApps import notificaciones
+
+
+class Command(BaseCommand):
+    help = 'Convierte los eventos de notificación pendientes en notificaciones, por bloques'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bloque', type=int, default=notificaciones.BLOQUE,
+                            help=f'Destinatarios por bloque (por defecto {notificaciones.BLOQUE})')
+        parser.add_argument('--max-eventos', type=int, default=None,
+                            help='Procesar como máximo N eventos y terminar')
+        parser.add_argument('--continuo', action='store_true',
+                            help='No terminar: seguir revisando la cola cada --intervalo segundos')
+        parser.add_argument('--intervalo', type=float, default=5,
+                            help='Segundos de espera con la cola vacía en modo continuo (por defecto 5)')
+
+    def handle(self, *args, **options):
+        while True:
+            inicio = time.monotonic()
+            eventos, creadas = notificaciones.procesar_pendientes(
+                bloque=options['bloque'],
+                maximo_eventos=options['max_eventos'],
+            )
+            if eventos or not options['continuo']:
+                duracion = time.monotonic() - inicio
+                self.stdout.write(self.style.SUCCESS(
+                    f'{eventos} eventos procesados, {creadas} notificaciones creadas en {duracion:.2f}s'
+                ))
+            if not options['continuo']:
+                break
+            if not eventos:
+                time.sleep(options['intervalo'])
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from MyWebApps import similares
+
+
+class Command(BaseCommand):
+    help = 'Calcula las ofertas similares de las ofertas activas que tienen la lista incompleta'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--oferta', type=int, action='append', dest='ofertas',
+                            help='Id de oferta a recalcular (se puede repetir)')
+        parser.add_argument('--todas', action='store_true',
+                            help='Recalcular todas las ofertas activas, no solo las incompletas')
+
+    def handle(self, *args, **options):
+        ofertas = similares.ofertas_comparables()
+        if options['ofertas']:
+            ofertas = ofertas.filter(pk__in=options['ofertas'])
+        elif not options['todas']:
+            ofertas = ofertas.annotate(n=Count('similares')).filter(n__lt=similares.K)
+        # Los ids primero: calcular una oferta cambia las listas de otras
+        ids = list(ofertas.order_by('pk').values_list('pk', flat=True))
+
+        inicio = time.monotonic()
+        for i in range(0, len(ids), 500):
+            for oferta in similares.ofertas_comparables().filter(pk__in=ids[i:i + 500]).only(
+                *similares.CAMPOS_TEXTO, 'categoria_id'
+            ):
+                similares.calcular_oferta(oferta)
+        duracion = time.monotonic() - inicio
+
+        self.stdout.write(self.style.SUCCESS(f'{len(ids)} ofertas recalculadas en {duracion:.2f}s'))
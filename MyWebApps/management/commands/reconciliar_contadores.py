@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from MyWebApps import contadores
+from MyWebApps.models import OfertaTrabajo
+
+
+class Command(BaseCommand):
+    help = 'Recalcula en bloque los contadores de postulaciones de las ofertas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--oferta', type=int, action='append', dest='ofertas',
+                            help='Id de oferta a reconciliar (se puede repetir). Por defecto, todas')
+        parser.add_argument('--bloque', type=int, default=1000,
+                            help='Ofertas por transacción (por defecto 1000)')
+        parser.add_argument('--solo-revisar', action='store_true',
+                            help='Informar las diferencias sin corregirlas')
+
+    def handle(self, *args, **options):
+        ids = OfertaTrabajo.objects.order_by('pk').values_list('pk', flat=True)
+        if options['ofertas']:
+            ids = ids.filter(pk__in=options['ofertas'])
+
+        bloque = options['bloque']
+        corregir = not options['solo_revisar']
+        inicio = time.monotonic()
+        revisadas = 0
+        desfasadas = []
+
+        ultimo_id = 0
+        while True:
+            lote = list(ids.filter(pk__gt=ultimo_id)[:bloque])
+            if not lote:
+                break
+            desfasadas += contadores.reconciliar(lote, corregir=corregir)
+            revisadas += len(lote)
+            ultimo_id = lote[-1]
+
+        if desfasadas:
+            accion = 'corregidas' if corregir else 'con diferencias'
+            muestra = ', '.join(str(pk) for pk in desfasadas[:20])
+            self.stdout.write(self.style.WARNING(f'Ofertas {accion}: {len(desfasadas)} ({muestra})'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{revisadas} ofertas revisadas en {time.monotonic() - inicio:.2f}s'
+        ))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from MyWebApps import busqueda
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye desde cero el índice de búsqueda de texto completo de las ofertas'
+
+    def handle(self, *args, **options):
+        if not busqueda.disponible():
+            raise CommandError('El índice FTS5 solo está disponible con SQLite')
+
+        inicio = time.monotonic()
+        with transaction.atomic():
+            total = busqueda.reconstruir_indice()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Índice reconstruido: {total} ofertas en {time.monotonic() - inicio:.2f}s'
+        ))
@@ -0,0 +1,48 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from MyWebApps import metricas
+from MyWebApps.models import OfertaTrabajo
+
+
+class Command(BaseCommand):
+    help = 'Recalcula desde las postulaciones las métricas diarias de las ofertas (las vistas se conservan)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--oferta', type=int, action='append', dest='ofertas',
+                            help='Id de oferta a recalcular (se puede repetir). Por defecto, todas')
+        parser.add_argument('--desde', help='Recalcular solo desde esta fecha (AAAA-MM-DD). Por defecto, todo')
+        parser.add_argument('--bloque', type=int, default=1000,
+                            help='Ofertas por transacción (por defecto 1000)')
+
+    def handle(self, *args, **options):
+        desde = None
+        if options['desde']:
+            try:
+                desde = date.fromisoformat(options['desde'])
+            except ValueError:
+                raise CommandError('--desde debe tener el formato AAAA-MM-DD')
+
+        ids = OfertaTrabajo.objects.order_by('pk').values_list('pk', flat=True)
+        if options['ofertas']:
+            ids = ids.filter(pk__in=options['ofertas'])
+
+        bloque = options['bloque']
+        inicio = time.monotonic()
+        revisadas = 0
+        filas = 0
+
+        ultimo_id = 0
+        while True:
+            lote = list(ids.filter(pk__gt=ultimo_id)[:bloque])
+            if not lote:
+                break
+            filas += metricas.reconstruir(lote, desde=desde)
+            revisadas += len(lote)
+            ultimo_id = lote[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{revisadas} ofertas recalculadas ({filas} días con postulaciones) en {time.monotonic() - inicio:.2f}s'
+        ))
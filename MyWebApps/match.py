@@ -0,0 +1,244 @@
+import re
+import unicodedata
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .models import OfertaTrabajo, PerfilPostulante, Postulacion
+
+# Puntuación de compatibilidad (match) entre un postulante y una oferta
+# Compara habilidades contra el texto de la oferta, nivel de experiencia,
+# ubicación y salario esperado. Cada lado se reduce primero a un "perfil"
+# con los datos ya normalizados, así en el modo masivo cada oferta y cada
+# postulante se procesan una sola vez aunque aparezcan en miles de postulaciones.
+
+PESOS = {
+    'habilidades': 50,
+    'nivel': 20,
+    'ubicacion': 15,
+    'salario': 15,
+}
+
+NIVELES = ['sin_experiencia', 'junior', 'semi_senior', 'senior', 'lead']
+
+# Palabras que no aportan al comparar habilidades con requisitos
+PALABRAS_VACIAS = {
+    'de', 'del', 'la', 'el', 'los', 'las', 'y', 'o', 'en', 'con', 'para', 'por', 'a', 'un', 'una',
+    'al', 'se', 'que', 'es', 'su', 'sus', 'como', 'mas', 'anos', 'experiencia', 'conocimiento',
+    'conocimientos', 'manejo', 'nivel', 'the', 'and', 'of', 'in',
+}
+
+# Campos que necesita cada lado (para cargar solo esas columnas)
+CAMPOS_PERFIL = ['habilidades', 'nivel_experiencia', 'años_experiencia', 'ubicacion', 'salario_esperado']
+CAMPOS_OFERTA = [
+    'titulo', 'descripcion', 'requisitos', 'nivel_experiencia', 'ubicacion',
+    'modalidad', 'salario_min', 'salario_max',
+]
+
+# Postulaciones ya resueltas: su puntuación no se recalcula al cambiar la oferta
+ESTADOS_CERRADOS = ['aceptado', 'rechazado']
+
+# Perfiles u ofertas normalizados que se guardan a la vez en el modo masivo
+MAXIMO_EN_MEMORIA = 50000
+
+DatosPerfil = namedtuple('DatosPerfil', 'habilidades nivel años ubicacion salario')
+DatosOferta = namedtuple('DatosOferta', 'terminos nivel años ubicacion remoto salario_min salario_max')
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes"""
+    texto = unicodedata.normalize('NFKD', (texto or '').lower())
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+def terminos(texto):
+    """Conjunto de palabras significativas de un texto"""
+    palabras = (palabra.strip('.') for palabra in re.findall(r'[\w#+.]+', normalizar(texto)))
+    return {palabra for palabra in palabras if palabra and palabra not in PALABRAS_VACIAS}
+
+
+def _habilidades(texto):
+    """Separar '- Python, Django / SQL' en habilidades, cada una como conjunto de palabras"""
+    partes = re.split(r'[,;\n/|•]+', texto or '')
+    resultado = []
+    for parte in partes:
+        palabras = frozenset(terminos(parte))
+        if palabras:
+            resultado.append(palabras)
+    return resultado
+
+
+def _entero(valor):
+    """Entero desde un valor del modelo o de un formulario; 0 si no es válido"""
+    try:
+        return max(0, int(valor or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _decimal(valor):
+    """Decimal desde un valor del modelo o de un formulario; None si falta o no es válido"""
+    if valor in (None, ''):
+        return None
+    try:
+        numero = Decimal(str(valor).strip())
+    except InvalidOperation:
+        return None
+    return numero if numero.is_finite() else None
+
+
+def _años_requeridos(texto):
+    coincidencia = re.search(r'(\d+)\s*\+?\s*anos', normalizar(texto))
+    return int(coincidencia.group(1)) if coincidencia else None
+
+
+def _rango_nivel(nivel):
+    return NIVELES.index(nivel) if nivel in NIVELES else None
+
+
+def datos_perfil(perfil):
+    """
+    Reducir un PerfilPostulante a los datos que usa la puntuación.
+    Acepta perfiles sin guardar con los valores del formulario (textos).
+    """
+    return DatosPerfil(
+        habilidades=_habilidades(perfil.habilidades),
+        nivel=_rango_nivel(perfil.nivel_experiencia),
+        años=_entero(perfil.años_experiencia),
+        ubicacion=terminos(perfil.ubicacion),
+        salario=_decimal(perfil.salario_esperado),
+    )
+
+
+def datos_oferta(oferta):
+    """Reducir una OfertaTrabajo a los datos que usa la puntuación"""
+    texto = ' '.join(filter(None, [oferta.titulo, oferta.requisitos, oferta.descripcion]))
+    return DatosOferta(
+        terminos=terminos(texto),
+        nivel=_rango_nivel(oferta.nivel_experiencia),
+        años=_años_requeridos(oferta.requisitos),
+        ubicacion=terminos(oferta.ubicacion),
+        remoto=oferta.modalidad == 'remoto',
+        salario_min=_decimal(oferta.salario_min),
+        salario_max=_decimal(oferta.salario_max),
+    )
+
+
+# ==================== COMPONENTES ====================
+
+def _puntaje_habilidades(perfil, oferta):
+    if not perfil.habilidades or not oferta.terminos:
+        return 0.0
+    coincidencias = sum(1 for habilidad in perfil.habilidades if habilidad <= oferta.terminos)
+    # Mezcla de proporción y cantidad absoluta: 3 habilidades pedidas ya es un buen match
+    return 0.5 * coincidencias / len(perfil.habilidades) + 0.5 * min(1.0, coincidencias / 3)
+
+
+def _puntaje_nivel(perfil, oferta):
+    puntaje = 0.5
+    if perfil.nivel is not None and oferta.nivel is not None:
+        diferencia = perfil.nivel - oferta.nivel
+        if diferencia == 0:
+            puntaje = 1.0
+        elif diferencia == 1:
+            puntaje = 0.75   # Un nivel por encima
+        elif diferencia == -1:
+            puntaje = 0.4    # Un nivel por debajo
+        else:
+            puntaje = 0.0
+    if oferta.años is not None and perfil.años < oferta.años:
+        puntaje *= max(0.0, perfil.años / oferta.años)
+    return puntaje
+
+
+def _puntaje_ubicacion(perfil, oferta):
+    if oferta.remoto:
+        return 1.0
+    if not perfil.ubicacion or not oferta.ubicacion:
+        return 0.5
+    comunes = perfil.ubicacion & oferta.ubicacion
+    if comunes == oferta.ubicacion or comunes == perfil.ubicacion:
+        return 1.0
+    return 0.5 if comunes else 0.0
+
+
+def _puntaje_salario(perfil, oferta):
+    if perfil.salario is None or oferta.salario_max is None:
+        return 0.5
+    esperado = perfil.salario
+    if esperado <= oferta.salario_max:
+        return 1.0
+    exceso = (esperado - oferta.salario_max) / oferta.salario_max if oferta.salario_max else 1
+    return max(0.0, 1.0 - float(exceso))
+
+
+def puntuar(datos_p, datos_o):
+    """Puntuación 0-100 a partir de los datos ya normalizados"""
+    total = (
+        PESOS['habilidades'] * _puntaje_habilidades(datos_p, datos_o) +
+        PESOS['nivel'] * _puntaje_nivel(datos_p, datos_o) +
+        PESOS['ubicacion'] * _puntaje_ubicacion(datos_p, datos_o) +
+        PESOS['salario'] * _puntaje_salario(datos_p, datos_o)
+    )
+    return max(0, min(100, round(total)))
+
+
+def calcular_puntuacion(perfil, oferta):
+    """Puntuación de match entre un PerfilPostulante y una OfertaTrabajo"""
+    return puntuar(datos_perfil(perfil), datos_oferta(oferta))
+
+
+# ==================== MODO MASIVO ====================
+
+def recalcular(postulaciones, bloque=2000):
+    """
+    Recalcular puntuacion_match de un queryset de postulaciones por bloques.
+    Cada oferta y cada perfil se normalizan una sola vez. Devuelve el número
+    de postulaciones procesadas.
+    """
+    ofertas = {}
+    perfiles = {}
+    procesadas = 0
+    ultimo_id = 0
+
+    postulaciones = postulaciones.order_by('pk').only('pk', 'oferta_id', 'postulante_id', 'puntuacion_match')
+
+    while True:
+        lote = list(postulaciones.filter(pk__gt=ultimo_id)[:bloque])
+        if not lote:
+            break
+        ultimo_id = lote[-1].pk
+
+        # Cargar de una vez las ofertas y perfiles que faltan en este bloque
+        faltan = {p.oferta_id for p in lote} - ofertas.keys()
+        for oferta in OfertaTrabajo.objects.filter(pk__in=faltan).only(*CAMPOS_OFERTA):
+            ofertas[oferta.pk] = datos_oferta(oferta)
+        faltan = {p.postulante_id for p in lote} - perfiles.keys()
+        for perfil in PerfilPostulante.objects.filter(pk__in=faltan).only(*CAMPOS_PERFIL):
+            perfiles[perfil.pk] = datos_perfil(perfil)
+
+        cambiadas = []
+        for postulacion in lote:
+            puntuacion = puntuar(perfiles[postulacion.postulante_id], ofertas[postulacion.oferta_id])
+            if puntuacion != postulacion.puntuacion_match:
+                postulacion.puntuacion_match = puntuacion
+                cambiadas.append(postulacion)
+        if cambiadas:
+            with transaction.atomic():
+                Postulacion.objects.bulk_update(cambiadas, ['puntuacion_match'])
+        procesadas += len(lote)
+
+        # No acumular perfiles sin límite al recorrer toda la tabla
+        if len(perfiles) > MAXIMO_EN_MEMORIA:
+            perfiles.clear()
+        if len(ofertas) > MAXIMO_EN_MEMORIA:
+            ofertas.clear()
+
+    return procesadas
+
+
+def recalcular_ofertas(ids, bloque=2000):
+    """Recalcular las postulaciones abiertas de ofertas cuyo texto o requisitos cambiaron"""
+    postulaciones = Postulacion.objects.filter(oferta_id__in=ids).exclude(estado__in=ESTADOS_CERRADOS)
+    return recalcular(postulaciones, bloque=bloque)
@@ -0,0 +1,218 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import MetricaDiariaOferta, OfertaTrabajo, Postulacion
+
+# Métricas diarias de cada oferta (vistas, postulaciones y embudo de estados)
+# La tabla MetricaDiariaOferta tiene una fila por oferta y día que se mantiene
+# a medida que ocurren los eventos: el volcado del contador de vistas suma las
+# vistas del día (vistas.py), y crear una postulación o cambiarla de estado
+# (signals.py y transiciones.py) suma a las columnas del embudo. Cada suma es
+# un INSERT que ignora la fila si ya existe más un UPDATE campo = campo + n,
+# así dos procesos no se pisan. La página de analíticas del empleador lee
+# solo esta tabla, sin recorrer postulaciones ni historial.
+#
+# Embudo: pendiente -> en revisión -> entrevista -> aceptado. preseleccionado
+# cuenta como revisión. Los estados solo avanzan (TRANSICIONES_PERMITIDAS),
+# así que cada postulación suma como mucho una vez a cada etapa, el día en que
+# la alcanza; las que saltan etapas suman también a las intermedias. Borrar
+# una postulación no resta: las métricas registran lo que pasó ese día.
+#
+# reconstruir() (comando reconstruir_metricas) recalcula las columnas de
+# postulaciones desde la tabla de postulaciones. Como no se guarda el historial
+# de estados, cada postulación suma sus etapas en la fecha de su último cambio
+# de estado. Las vistas por día no se pueden reconstruir: se conservan.
+
+# Nivel en el embudo de cada estado; rechazado queda fuera
+NIVELES = {'pendiente': 0, 'en_revision': 1, 'preseleccionado': 1, 'entrevista': 2, 'aceptado': 3}
+CAMPOS_NIVEL = {1: 'revisadas', 2: 'entrevistas', 3: 'aceptadas'}
+
+CAMPOS = ['vistas', 'postulaciones', 'revisadas', 'entrevistas', 'aceptadas', 'rechazadas']
+CAMPOS_POSTULACIONES = CAMPOS[1:]
+
+ETAPAS = [
+    ('postulaciones', 'Postulaciones'),
+    ('revisadas', 'En revisión'),
+    ('entrevistas', 'Entrevista'),
+    ('aceptadas', 'Aceptadas'),
+]
+
+# Períodos (días) que ofrece la página de analíticas
+PERIODOS = [7, 30, 90]
+
+
+# ==================== REGISTRO ====================
+
+def _asegurar_filas(fecha, oferta_ids):
+    MetricaDiariaOferta.objects.bulk_create(
+        [MetricaDiariaOferta(oferta_id=oferta_id, fecha=fecha) for oferta_id in oferta_ids],
+        ignore_conflicts=True,
+    )
+
+
+def sumar_vistas(por_cantidad, fecha=None):
+    """Sumar vistas del día a varias ofertas, {cantidad: [oferta_ids]} como las vuelca vistas.py"""
+    fecha = fecha or timezone.localdate()
+    ids = [oferta_id for oferta_ids in por_cantidad.values() for oferta_id in oferta_ids]
+    # Una oferta pudo borrarse mientras sus vistas esperaban el volcado
+    _asegurar_filas(fecha, OfertaTrabajo.objects.filter(pk__in=ids).values_list('pk', flat=True))
+    for cantidad, oferta_ids in por_cantidad.items():
+        MetricaDiariaOferta.objects.filter(
+            fecha=fecha, oferta_id__in=oferta_ids
+        ).update(vistas=F('vistas') + cantidad)
+
+
+def _sumar(oferta_id, cambios, fecha=None):
+    cambios = {campo: cantidad for campo, cantidad in cambios.items() if cantidad}
+    if not cambios:
+        return
+    fecha = fecha or timezone.localdate()
+    _asegurar_filas(fecha, [oferta_id])
+    MetricaDiariaOferta.objects.filter(oferta_id=oferta_id, fecha=fecha).update(
+        **{campo: F(campo) + cantidad for campo, cantidad in cambios.items()}
+    )
+
+
+def cambios_transicion(conteos_anteriores, estado_nuevo):
+    """Sumas {campo: n} por pasar a estado_nuevo postulaciones de varios estados, {estado: n}"""
+    cambios = defaultdict(int)
+    nivel_nuevo = NIVELES.get(estado_nuevo)
+    for estado, cantidad in conteos_anteriores.items():
+        if estado == estado_nuevo or not cantidad:
+            continue
+        if estado_nuevo == 'rechazado':
+            cambios['rechazadas'] += cantidad
+        elif nivel_nuevo is not None:
+            for nivel in range(NIVELES.get(estado, 0) + 1, nivel_nuevo + 1):
+                cambios[CAMPOS_NIVEL[nivel]] += cantidad
+    return cambios
+
+
+def registrar_postulacion(oferta_id, estado='pendiente'):
+    """Una postulación nueva (si ya nace en otro estado, también sus etapas)"""
+    cambios = cambios_transicion({'pendiente': 1}, estado)
+    cambios['postulaciones'] += 1
+    _sumar(oferta_id, cambios)
+
+
+def registrar_transiciones(oferta_id, conteos_anteriores, estado_nuevo):
+    """Postulaciones de una oferta que pasaron de {estado: n} a estado_nuevo, en un solo UPDATE"""
+    _sumar(oferta_id, cambios_transicion(conteos_anteriores, estado_nuevo))
+
+
+# ==================== RECONSTRUCCIÓN ====================
+
+def conteos_historicos(oferta_ids, desde=None):
+    """Columnas de postulaciones por (oferta_id, fecha), calculadas desde las postulaciones"""
+    filas = defaultdict(lambda: dict.fromkeys(CAMPOS_POSTULACIONES, 0))
+    postulaciones = Postulacion.objects.filter(oferta_id__in=oferta_ids).order_by()
+
+    creadas = postulaciones.annotate(
+        dia=TruncDate('fecha_postulacion')
+    ).values('oferta_id', 'dia').annotate(cantidad=Count('id'))
+    for fila in creadas:
+        filas[fila['oferta_id'], fila['dia']]['postulaciones'] += fila['cantidad']
+
+    avanzadas = postulaciones.exclude(estado='pendiente').annotate(
+        dia=TruncDate(Coalesce('fecha_cambio_estado', 'fecha_postulacion'))
+    ).values('oferta_id', 'dia', 'estado').annotate(cantidad=Count('id'))
+    for fila in avanzadas:
+        for campo, cantidad in cambios_transicion({'pendiente': fila['cantidad']}, fila['estado']).items():
+            filas[fila['oferta_id'], fila['dia']][campo] += cantidad
+
+    return {clave: valores for clave, valores in filas.items() if desde is None or clave[1] >= desde}
+
+
+def reconstruir(oferta_ids, desde=None):
+    """
+    Recalcular las columnas de postulaciones de un bloque de ofertas desde
+    `desde` (todo el historial si es None). Las vistas no se tocan.
+    Devuelve el número de filas (oferta, día) con postulaciones.
+    """
+    historico = conteos_historicos(oferta_ids, desde)
+
+    with transaction.atomic():
+        existentes = MetricaDiariaOferta.objects.filter(oferta_id__in=oferta_ids)
+        if desde is not None:
+            existentes = existentes.filter(fecha__gte=desde)
+        existentes.update(**dict.fromkeys(CAMPOS_POSTULACIONES, 0))
+        MetricaDiariaOferta.objects.bulk_create(
+            [
+                MetricaDiariaOferta(oferta_id=oferta_id, fecha=fecha, **valores)
+                for (oferta_id, fecha), valores in historico.items()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['oferta', 'fecha'],
+            update_fields=CAMPOS_POSTULACIONES,
+        )
+        # Días que quedaron sin nada
+        existentes.filter(**dict.fromkeys(CAMPOS, 0)).delete()
+    return len(historico)
+
+
+# ==================== LECTURA ====================
+
+def rango(dias):
+    """(desde, hasta) de los últimos `dias` días, hoy incluido"""
+    hasta = timezone.localdate()
+    return hasta - timedelta(days=dias - 1), hasta
+
+
+def _porcentaje(parte, total):
+    return round(parte * 100 / total, 1) if total else None
+
+
+def serie_diaria(metricas, desde, hasta):
+    """Sumas por día de `metricas` (todos los días del rango, con ceros) y totales del período"""
+    guardadas = {
+        fila['fecha']: fila
+        for fila in metricas.filter(fecha__range=(desde, hasta)).order_by('fecha').values('fecha').annotate(
+            **{campo: Sum(campo) for campo in CAMPOS}
+        )
+    }
+    dias = []
+    fecha = desde
+    while fecha <= hasta:
+        dias.append(guardadas.get(fecha) or {'fecha': fecha, **dict.fromkeys(CAMPOS, 0)})
+        fecha += timedelta(days=1)
+
+    totales = {campo: sum(dia[campo] for dia in dias) for campo in CAMPOS}
+    totales['conversion'] = _porcentaje(totales['postulaciones'], totales['vistas'])
+    # Altura de cada barra de los gráficos, relativa al día con más
+    for campo in ('vistas', 'postulaciones'):
+        maximo = max(dia[campo] for dia in dias)
+        for dia in dias:
+            dia[f'{campo}_altura'] = round(dia[campo] * 100 / maximo) if maximo else 0
+    return dias, totales
+
+
+def embudo(totales):
+    """Etapas del embudo con su porcentaje sobre las postulaciones y sobre la etapa anterior"""
+    etapas = []
+    anterior = None
+    for campo, nombre in ETAPAS:
+        cantidad = totales[campo]
+        etapas.append({
+            'nombre': nombre,
+            'cantidad': cantidad,
+            'porcentaje': _porcentaje(cantidad, totales['postulaciones']) or 0,
+            'conversion': None if anterior is None else _porcentaje(cantidad, anterior),
+        })
+        anterior = cantidad
+    return etapas
+
+
+def por_oferta(metricas, desde, hasta):
+    """Totales del período por oferta, primero las que más postulaciones recibieron"""
+    filas = list(metricas.filter(fecha__range=(desde, hasta)).values('oferta_id', 'oferta__titulo').annotate(
+        **{campo: Sum(campo) for campo in CAMPOS}
+    ).order_by('-postulaciones', '-vistas', 'oferta_id'))
+    for fila in filas:
+        fila['conversion'] = _porcentaje(fila['postulaciones'], fila['vistas'])
+    return filas
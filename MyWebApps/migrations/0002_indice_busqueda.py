@@ -0,0 +1,51 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+import MyWebApps.models
+
+
+def crear_indice(apps, schema_editor):
+    """Crear y llenar la tabla virtual FTS5 (solo SQLite)"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from MyWebApps import busqueda
+    with schema_editor.connection.cursor() as cursor:
+        busqueda.crear_tabla(cursor)
+        cursor.execute(
+            f'INSERT INTO {busqueda.TABLA} (rowid, titulo, descripcion, requisitos, empresa) '
+            f'{busqueda._SELECT_DOCUMENTOS}'
+        )
+
+
+def eliminar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS oferta_busqueda')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndiceBusquedaOferta',
+            fields=[
+                ('oferta', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='indice_busqueda', serialize=False, to='MyWebApps.ofertatrabajo', verbose_name='Oferta')),
+                ('titulo', models.TextField(verbose_name='Título')),
+                ('descripcion', models.TextField(verbose_name='Descripción')),
+                ('requisitos', models.TextField(verbose_name='Requisitos')),
+                ('empresa', models.TextField(verbose_name='Empresa')),
+                ('documento', MyWebApps.models.CampoBusqueda(db_column='oferta_busqueda', editable=False)),
+            ],
+            options={
+                'verbose_name': 'Índice de Búsqueda',
+                'verbose_name_plural': 'Índice de Búsqueda',
+                'db_table': 'oferta_busqueda',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
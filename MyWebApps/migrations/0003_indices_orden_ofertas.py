@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0002_indice_busqueda'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='usuario',
+            managers=[
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='ofertatrabajo',
+            index=models.Index(fields=['estado', 'salario_max'], name='oferta_trab_estado_c1c600_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertatrabajo',
+            index=models.Index(fields=['estado', 'vistas'], name='oferta_trab_estado_05c3cb_idx'),
+        ),
+    ]
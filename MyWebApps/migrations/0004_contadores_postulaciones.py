@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+ESTADOS = ['pendiente', 'en_revision', 'preseleccionado', 'entrevista', 'rechazado', 'aceptado']
+
+
+def calcular_contadores(apps, schema_editor):
+    """Llenar los contadores con las postulaciones existentes"""
+    OfertaTrabajo = apps.get_model('MyWebApps', 'OfertaTrabajo')
+    Postulacion = apps.get_model('MyWebApps', 'Postulacion')
+
+    agregados = {'postulaciones_total': Count('id')}
+    for estado in ESTADOS:
+        agregados[f'postulaciones_{estado}'] = Count('id', filter=Q(estado=estado))
+
+    for fila in Postulacion.objects.order_by().values('oferta_id').annotate(**agregados):
+        OfertaTrabajo.objects.filter(pk=fila.pop('oferta_id')).update(**fila)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0003_indices_orden_ofertas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='postulaciones_aceptado',
+            field=models.IntegerField(default=0, verbose_name='Postulaciones Aceptadas'),
+        ),
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='postulaciones_en_revision',
+            field=models.IntegerField(default=0, verbose_name='Postulaciones En Revisión'),
+        ),
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='postulaciones_entrevista',
+            field=models.IntegerField(default=0, verbose_name='Postulaciones En Entrevista'),
+        ),
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='postulaciones_pendiente',
+            field=models.IntegerField(default=0, verbose_name='Postulaciones Pendientes'),
+        ),
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='postulaciones_preseleccionado',
+            field=models.IntegerField(default=0, verbose_name='Postulaciones Preseleccionadas'),
+        ),
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='postulaciones_rechazado',
+            field=models.IntegerField(default=0, verbose_name='Postulaciones Rechazadas'),
+        ),
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='postulaciones_total',
+            field=models.IntegerField(default=0, verbose_name='Postulaciones'),
+        ),
+        migrations.RunPython(calcular_contadores, migrations.RunPython.noop),
+    ]
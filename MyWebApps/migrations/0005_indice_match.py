@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0004_contadores_postulaciones'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='postulacion',
+            index=models.Index(fields=['oferta', '-puntuacion_match'], name='postulacion_oferta__beee96_idx'),
+        ),
+    ]
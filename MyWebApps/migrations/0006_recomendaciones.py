@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0005_indice_match'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recomendacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('puntuacion', models.IntegerField(verbose_name='Puntuación')),
+                ('fecha_calculo', models.DateTimeField(auto_now=True, verbose_name='Fecha de Cálculo')),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recomendaciones', to='MyWebApps.ofertatrabajo', verbose_name='Oferta')),
+                ('perfil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recomendaciones', to='MyWebApps.perfilpostulante', verbose_name='Postulante')),
+            ],
+            options={
+                'verbose_name': 'Recomendación',
+                'verbose_name_plural': 'Recomendaciones',
+                'db_table': 'recomendacion',
+                'ordering': ['-puntuacion'],
+                'indexes': [models.Index(fields=['perfil', '-puntuacion'], name='recomendaci_perfil__080f60_idx')],
+                'unique_together': {('perfil', 'oferta')},
+            },
+        ),
+    ]
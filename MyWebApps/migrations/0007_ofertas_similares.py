@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def crear_vocabulario(apps, schema_editor):
+    """Tabla fts5vocab sobre el índice de búsqueda (solo SQLite)"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from MyWebApps import busqueda
+    with schema_editor.connection.cursor() as cursor:
+        busqueda.crear_vocabulario(cursor)
+
+
+def eliminar_vocabulario(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS oferta_busqueda_vocab')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0006_recomendaciones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfertaSimilar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('puntuacion', models.FloatField(verbose_name='Similitud')),
+                ('fecha_calculo', models.DateTimeField(auto_now=True, verbose_name='Fecha de Cálculo')),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similares', to='MyWebApps.ofertatrabajo', verbose_name='Oferta')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='MyWebApps.ofertatrabajo', verbose_name='Oferta Similar')),
+            ],
+            options={
+                'verbose_name': 'Oferta Similar',
+                'verbose_name_plural': 'Ofertas Similares',
+                'db_table': 'oferta_similar',
+                'ordering': ['-puntuacion'],
+                'indexes': [models.Index(fields=['oferta', '-puntuacion'], name='oferta_simi_oferta__562962_idx')],
+                'unique_together': {('oferta', 'similar')},
+            },
+        ),
+        migrations.RunPython(crear_vocabulario, eliminar_vocabulario),
+    ]
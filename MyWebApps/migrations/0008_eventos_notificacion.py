@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0007_ofertas_similares'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoNotificacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('postulacion', 'Nueva Postulación'), ('estado_postulacion', 'Cambio Estado Postulación'), ('nueva_oferta', 'Nueva Oferta'), ('mensaje', 'Mensaje'), ('alerta', 'Alerta'), ('sistema', 'Sistema')], max_length=30, verbose_name='Tipo')),
+                ('clave', models.CharField(max_length=200, unique=True, verbose_name='Clave de Idempotencia')),
+                ('datos', models.JSONField(default=dict, verbose_name='Datos')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesado', 'Procesado'), ('error', 'Error')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('cursor', models.BigIntegerField(default=0, verbose_name='Último Usuario Notificado')),
+                ('notificados', models.IntegerField(default=0, verbose_name='Notificaciones Creadas')),
+                ('intentos', models.IntegerField(default=0, verbose_name='Intentos Fallidos')),
+                ('ultimo_error', models.TextField(blank=True, null=True, verbose_name='Último Error')),
+                ('bloqueado_hasta', models.DateTimeField(blank=True, null=True, verbose_name='Bloqueado Hasta')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('fecha_procesado', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Procesado')),
+            ],
+            options={
+                'verbose_name': 'Evento de Notificación',
+                'verbose_name_plural': 'Eventos de Notificación',
+                'db_table': 'evento_notificacion',
+                'ordering': ['fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_creacion'], name='evento_noti_estado_97b144_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='notificacion',
+            name='evento',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notificaciones', to='MyWebApps.eventonotificacion', verbose_name='Evento'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='notificacion',
+            unique_together={('evento', 'usuario')},
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:52
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def contar_no_leidas(apps, schema_editor):
+    """Llenar el contador con las notificaciones sin leer existentes"""
+    Usuario = apps.get_model('MyWebApps', 'Usuario')
+    Notificacion = apps.get_model('MyWebApps', 'Notificacion')
+
+    for fila in Notificacion.objects.filter(leida=False).order_by().values('usuario_id').annotate(n=Count('id')):
+        Usuario.objects.filter(pk=fila['usuario_id']).update(notificaciones_no_leidas=fila['n'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0008_eventos_notificacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='notificaciones_no_leidas',
+            field=models.PositiveIntegerField(default=0, verbose_name='Notificaciones sin Leer'),
+        ),
+        migrations.RunPython(contar_no_leidas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0009_notificaciones_no_leidas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusquedaGuardada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('texto', models.CharField(blank=True, default='', max_length=200, verbose_name='Texto de Búsqueda')),
+                ('modalidad', models.CharField(blank=True, choices=[('presencial', 'Presencial'), ('remoto', 'Remoto'), ('hibrido', 'Híbrido')], default='', max_length=20, verbose_name='Modalidad')),
+                ('tipo_contrato', models.CharField(blank=True, choices=[('tiempo_completo', 'Tiempo Completo'), ('medio_tiempo', 'Medio Tiempo'), ('por_proyecto', 'Por Proyecto'), ('freelance', 'Freelance'), ('practicas', 'Prácticas'), ('temporal', 'Temporal')], default='', max_length=20, verbose_name='Tipo de Contrato')),
+                ('ubicacion', models.CharField(blank=True, default='', max_length=200, verbose_name='Ubicación')),
+                ('clave_indice', models.CharField(db_index=True, editable=False, max_length=60, verbose_name='Clave de Índice')),
+                ('activa', models.BooleanField(default=True, verbose_name='Activa')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('categoria', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='MyWebApps.categoria', verbose_name='Categoría')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='busquedas_guardadas', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Búsqueda Guardada',
+                'verbose_name_plural': 'Búsquedas Guardadas',
+                'db_table': 'busqueda_guardada',
+                'ordering': ['-fecha_creacion'],
+            },
+        ),
+    ]
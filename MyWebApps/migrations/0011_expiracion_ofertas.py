@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0010_busquedas_guardadas'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventonotificacion',
+            name='tipo',
+            field=models.CharField(choices=[('postulacion', 'Nueva Postulación'), ('estado_postulacion', 'Cambio Estado Postulación'), ('nueva_oferta', 'Nueva Oferta'), ('oferta_expirada', 'Oferta Expirada'), ('mensaje', 'Mensaje'), ('alerta', 'Alerta'), ('sistema', 'Sistema')], max_length=30, verbose_name='Tipo'),
+        ),
+        migrations.AlterField(
+            model_name='notificacion',
+            name='tipo',
+            field=models.CharField(choices=[('postulacion', 'Nueva Postulación'), ('estado_postulacion', 'Cambio Estado Postulación'), ('nueva_oferta', 'Nueva Oferta'), ('oferta_expirada', 'Oferta Expirada'), ('mensaje', 'Mensaje'), ('alerta', 'Alerta'), ('sistema', 'Sistema')], max_length=30, verbose_name='Tipo'),
+        ),
+        migrations.AddIndex(
+            model_name='ofertatrabajo',
+            index=models.Index(fields=['estado', 'fecha_expiracion'], name='oferta_trab_estado_d3ae7e_idx'),
+        ),
+    ]
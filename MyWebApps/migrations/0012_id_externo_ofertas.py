@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0011_expiracion_ofertas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='id_externo',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='ID Externo'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ofertatrabajo',
+            unique_together={('empresa', 'id_externo')},
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0012_id_externo_ofertas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categoria',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última Actualización'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0013_categoria_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ofertatrabajo',
+            index=models.Index(fields=['fecha_actualizacion'], name='oferta_trab_fecha_a_2a4ed0_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0014_indice_fecha_actualizacion_ofertas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricaDiariaOferta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('vistas', models.IntegerField(default=0, verbose_name='Vistas')),
+                ('postulaciones', models.IntegerField(default=0, verbose_name='Postulaciones')),
+                ('revisadas', models.IntegerField(default=0, verbose_name='Pasaron a Revisión')),
+                ('entrevistas', models.IntegerField(default=0, verbose_name='Pasaron a Entrevista')),
+                ('aceptadas', models.IntegerField(default=0, verbose_name='Aceptadas')),
+                ('rechazadas', models.IntegerField(default=0, verbose_name='Rechazadas')),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metricas_diarias', to='MyWebApps.ofertatrabajo', verbose_name='Oferta')),
+            ],
+            options={
+                'verbose_name': 'Métrica Diaria de Oferta',
+                'verbose_name_plural': 'Métricas Diarias de Ofertas',
+                'db_table': 'metrica_diaria_oferta',
+                'ordering': ['oferta', 'fecha'],
+                'unique_together': {('oferta', 'fecha')},
+            },
+        ),
+    ]
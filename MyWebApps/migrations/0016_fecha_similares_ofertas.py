@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0015_metricas_diarias_ofertas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ofertatrabajo',
+            name='fecha_similares',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Similares'),
+        ),
+    ]
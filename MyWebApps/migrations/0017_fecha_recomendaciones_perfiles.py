@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0016_fecha_similares_ofertas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfilpostulante',
+            name='fecha_recomendaciones',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Recomendaciones'),
+        ),
+    ]
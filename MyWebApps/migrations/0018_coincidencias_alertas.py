@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyWebApps', '0017_fecha_recomendaciones_perfiles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoincidenciaAlerta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('oferta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='MyWebApps.ofertatrabajo', verbose_name='Oferta')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Coincidencia de Alerta',
+                'verbose_name_plural': 'Coincidencias de Alertas',
+                'db_table': 'coincidencia_alerta',
+                'unique_together': {('oferta', 'usuario')},
+            },
+        ),
+    ]
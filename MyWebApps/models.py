@@ -72,6 +72,8 @@ class Usuario(AbstractUser):
         verbose_name='Estado'
     )
     email_verificado = models.BooleanField(default=False, verbose_name='Email Verificado')
+    # Contador de notificaciones sin leer (se actualiza con UPDATE, ver notificaciones.py)
+    notificaciones_no_leidas = models.PositiveIntegerField(default=0, verbose_name='Notificaciones sin Leer')
 
     # Usar el manager personalizado
     objects = UsuarioManager()
@@ -93,6 +95,15 @@ class Usuario(AbstractUser):
     def nombre_completo(self):
         return f"{self.first_name} {self.last_name}".strip()
 
+    def save(self, *args, **kwargs):
+        # Al editar un usuario existente no pisar el contador de notificaciones
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name != 'notificaciones_no_leidas'
+            ]
+        super().save(*args, **kwargs)
+
 
 class Categoria(models.Model):
     """Categorías de ofertas de trabajo"""
@@ -102,6 +113,7 @@ class Categoria(models.Model):
     icono = models.CharField(max_length=50, blank=True, null=True, verbose_name='Icono')
     activa = models.BooleanField(default=True, verbose_name='Activa')
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Última Actualización')
 
     class Meta:
         db_table = 'categoria'
@@ -223,6 +235,11 @@ class PerfilPostulante(models.Model):
     completado = models.BooleanField(default=False, verbose_name='Perfil Completado')
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
     fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Última Actualización')
+    # Última vez que se calcularon sus recomendaciones (recomendaciones.py); None si nunca
+    fecha_recomendaciones = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Recomendaciones')
+
+    # Campos que mantienen otros módulos con UPDATE; save() no los toca
+    CAMPOS_CALCULADOS = ['fecha_recomendaciones']
 
     class Meta:
         db_table = 'perfil_postulante'
@@ -230,6 +247,15 @@ class PerfilPostulante(models.Model):
         verbose_name_plural = 'Perfiles de Postulantes'
         ordering = ['-fecha_actualizacion']
 
+    def save(self, *args, **kwargs):
+        # Al editar un perfil existente no pisar los campos calculados
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name not in self.CAMPOS_CALCULADOS
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.usuario.nombre_completo} - {self.titulo_profesional or 'Sin título'}"
 
@@ -335,18 +361,56 @@ class OfertaTrabajo(models.Model):
     aprobada_admin = models.BooleanField(default=False, verbose_name='Aprobada por Admin')
     fecha_aprobacion = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Aprobación')
     vistas = models.IntegerField(default=0, verbose_name='Número de Vistas')
+    # Identificador de la oferta en el sistema del socio que la envía (importar_ofertas)
+    id_externo = models.CharField(max_length=100, blank=True, null=True, verbose_name='ID Externo')
+
+    # Contadores de postulaciones (desnormalizados, ver contadores.py)
+    postulaciones_total = models.IntegerField(default=0, verbose_name='Postulaciones')
+    postulaciones_pendiente = models.IntegerField(default=0, verbose_name='Postulaciones Pendientes')
+    postulaciones_en_revision = models.IntegerField(default=0, verbose_name='Postulaciones En Revisión')
+    postulaciones_preseleccionado = models.IntegerField(default=0, verbose_name='Postulaciones Preseleccionadas')
+    postulaciones_entrevista = models.IntegerField(default=0, verbose_name='Postulaciones En Entrevista')
+    postulaciones_rechazado = models.IntegerField(default=0, verbose_name='Postulaciones Rechazadas')
+    postulaciones_aceptado = models.IntegerField(default=0, verbose_name='Postulaciones Aceptadas')
+
+    # Último cambio de su lista de similares; None si nunca se calculó (ver similares.py)
+    fecha_similares = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Similares')
+
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
     fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Última Actualización')
 
+    # Campos que solo se modifican con UPDATE ... SET campo = campo + n;
+    # un save() normal no debe sobrescribirlos con valores viejos
+    CAMPOS_CONTADORES = [
+        'vistas',
+        'postulaciones_total',
+        'postulaciones_pendiente',
+        'postulaciones_en_revision',
+        'postulaciones_preseleccionado',
+        'postulaciones_entrevista',
+        'postulaciones_rechazado',
+        'postulaciones_aceptado',
+    ]
+    # Campos que mantienen otros módulos con UPDATE; save() tampoco los toca
+    CAMPOS_CALCULADOS = ['fecha_similares']
+
     class Meta:
         db_table = 'oferta_trabajo'
         verbose_name = 'Oferta de Trabajo'
         verbose_name_plural = 'Ofertas de Trabajo'
         ordering = ['-fecha_publicacion', '-fecha_creacion']
+        unique_together = ['empresa', 'id_externo']
         indexes = [
             models.Index(fields=['estado', 'fecha_publicacion']),
             models.Index(fields=['categoria', 'estado']),
             models.Index(fields=['modalidad', 'estado']),
+            # Paginación por cursor en los demás órdenes del listado
+            models.Index(fields=['estado', 'salario_max']),
+            models.Index(fields=['estado', 'vistas']),
+            # Barrido de ofertas vencidas (expirar_ofertas)
+            models.Index(fields=['estado', 'fecha_expiracion']),
+            # Marca de última modificación del listado (GET condicional)
+            models.Index(fields=['fecha_actualizacion']),
         ]
 
     def __str__(self):
@@ -356,6 +420,14 @@ class OfertaTrabajo(models.Model):
         # Si la oferta se activa y no tiene fecha de publicación, asignarla
         if self.estado == 'activa' and not self.fecha_publicacion:
             self.fecha_publicacion = timezone.now()
+
+        # Al editar una oferta existente no tocar los contadores ni los campos calculados
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            excluidos = {*self.CAMPOS_CONTADORES, *self.CAMPOS_CALCULADOS}
+            kwargs['update_fields'] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name not in excluidos
+            ]
         super().save(*args, **kwargs)
 
 
@@ -371,6 +443,16 @@ class Postulacion(models.Model):
         ('aceptado', 'Aceptado'),
     ]
 
+    # Estados a los que puede pasar una postulación desde cada estado
+    TRANSICIONES_PERMITIDAS = {
+        'pendiente': ['en_revision', 'preseleccionado', 'rechazado'],
+        'en_revision': ['preseleccionado', 'entrevista', 'rechazado'],
+        'preseleccionado': ['entrevista', 'rechazado'],
+        'entrevista': ['aceptado', 'rechazado'],
+        'rechazado': [],
+        'aceptado': [],
+    }
+
     oferta = models.ForeignKey(
         OfertaTrabajo,
         on_delete=models.CASCADE,
@@ -411,18 +493,44 @@ class Postulacion(models.Model):
             models.Index(fields=['estado', 'fecha_postulacion']),
             models.Index(fields=['oferta', 'estado']),
             models.Index(fields=['postulante', 'estado']),
+            models.Index(fields=['oferta', '-puntuacion_match']),
         ]
 
     def __str__(self):
         return f"{self.postulante.usuario.nombre_completo} -> {self.oferta.titulo}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado leído de la base de datos, para detectar cambios sin volver a consultar
+        instance._estado_original = instance.__dict__.get('estado')
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or 'estado' in fields:
+            self._estado_original = self.estado
+
+    def puede_cambiar_a(self, estado):
+        """Indica si la postulación puede pasar al estado indicado"""
+        return estado in self.TRANSICIONES_PERMITIDAS.get(self.estado, ())
+
     def save(self, *args, **kwargs):
         # Actualizar fecha de cambio de estado si cambió el estado
+        self._estado_anterior = None
         if self.pk:
-            old_instance = Postulacion.objects.get(pk=self.pk)
-            if old_instance.estado != self.estado:
+            estado_anterior = getattr(self, '_estado_original', None)
+            if estado_anterior is None:
+                # Instancia que no se cargó de la base de datos (o con el estado diferido)
+                estado_anterior = Postulacion.objects.filter(pk=self.pk).values_list('estado', flat=True).first()
+            self._estado_anterior = estado_anterior
+            if estado_anterior is not None and estado_anterior != self.estado:
                 self.fecha_cambio_estado = timezone.now()
+                update_fields = kwargs.get('update_fields')
+                if update_fields is not None and 'estado' in update_fields:
+                    kwargs['update_fields'] = {*update_fields, 'fecha_cambio_estado'}
         super().save(*args, **kwargs)
+        self._estado_original = self.estado
 
 
 class Favorito(models.Model):
@@ -453,6 +561,80 @@ class Favorito(models.Model):
         return f"{self.usuario.nombre_completo} - {self.oferta.titulo}"
 
 
+class BusquedaGuardada(models.Model):
+    """Búsquedas de ofertas guardadas para recibir alertas de ofertas nuevas (ver alertas.py)"""
+
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name='busquedas_guardadas',
+        verbose_name='Usuario'
+    )
+    texto = models.CharField(max_length=200, blank=True, default='', verbose_name='Texto de Búsqueda')
+    categoria = models.ForeignKey(
+        Categoria,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name='+',
+        verbose_name='Categoría'
+    )
+    modalidad = models.CharField(
+        max_length=20,
+        choices=OfertaTrabajo.MODALIDAD_CHOICES,
+        blank=True,
+        default='',
+        verbose_name='Modalidad'
+    )
+    tipo_contrato = models.CharField(
+        max_length=20,
+        choices=OfertaTrabajo.TIPO_CONTRATO_CHOICES,
+        blank=True,
+        default='',
+        verbose_name='Tipo de Contrato'
+    )
+    ubicacion = models.CharField(max_length=200, blank=True, default='', verbose_name='Ubicación')
+    # Término por el que se indexa la búsqueda para encontrarla desde una oferta nueva
+    clave_indice = models.CharField(max_length=60, db_index=True, editable=False, verbose_name='Clave de Índice')
+    activa = models.BooleanField(default=True, verbose_name='Activa')
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
+
+    class Meta:
+        db_table = 'busqueda_guardada'
+        verbose_name = 'Búsqueda Guardada'
+        verbose_name_plural = 'Búsquedas Guardadas'
+        ordering = ['-fecha_creacion']
+
+    def __str__(self):
+        return f"{self.usuario.email} - {self.texto or 'Todas las ofertas'}"
+
+
+class CoincidenciaAlerta(models.Model):
+    """Usuarios con búsquedas guardadas que coinciden con una oferta: destinatarios de su alerta (ver alertas.py)"""
+
+    oferta = models.ForeignKey(
+        OfertaTrabajo,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Oferta'
+    )
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Usuario'
+    )
+
+    class Meta:
+        db_table = 'coincidencia_alerta'
+        verbose_name = 'Coincidencia de Alerta'
+        verbose_name_plural = 'Coincidencias de Alertas'
+        unique_together = ['oferta', 'usuario']
+
+    def __str__(self):
+        return f"{self.oferta_id} -> {self.usuario_id}"
+
+
 class Notificacion(models.Model):
     """Notificaciones para usuarios"""
 
@@ -460,6 +642,7 @@ class Notificacion(models.Model):
         ('postulacion', 'Nueva Postulación'),
         ('estado_postulacion', 'Cambio Estado Postulación'),
         ('nueva_oferta', 'Nueva Oferta'),
+        ('oferta_expirada', 'Oferta Expirada'),
         ('mensaje', 'Mensaje'),
         ('alerta', 'Alerta'),
         ('sistema', 'Sistema'),
@@ -478,15 +661,201 @@ class Notificacion(models.Model):
     leida = models.BooleanField(default=False, verbose_name='Leída')
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
     fecha_leida = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Lectura')
+    evento = models.ForeignKey(
+        'EventoNotificacion',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='notificaciones',
+        verbose_name='Evento'
+    )
 
     class Meta:
         db_table = 'notificacion'
         verbose_name = 'Notificación'
         verbose_name_plural = 'Notificaciones'
         ordering = ['-fecha_creacion']
+        # Un evento no genera dos notificaciones al mismo usuario aunque se reintente
+        unique_together = ['evento', 'usuario']
         indexes = [
             models.Index(fields=['usuario', 'leida', '-fecha_creacion']),
         ]
 
     def __str__(self):
         return f"{self.tipo} - {self.usuario.email} - {self.titulo}"
+
+
+class EventoNotificacion(models.Model):
+    """Eventos en cola para generar notificaciones en segundo plano (ver notificaciones.py)"""
+
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('procesado', 'Procesado'),
+        ('error', 'Error'),
+    ]
+
+    tipo = models.CharField(max_length=30, choices=Notificacion.TIPO_CHOICES, verbose_name='Tipo')
+    clave = models.CharField(max_length=200, unique=True, verbose_name='Clave de Idempotencia')
+    datos = models.JSONField(default=dict, verbose_name='Datos')
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADO_CHOICES,
+        default='pendiente',
+        verbose_name='Estado'
+    )
+    cursor = models.BigIntegerField(default=0, verbose_name='Último Usuario Notificado')
+    notificados = models.IntegerField(default=0, verbose_name='Notificaciones Creadas')
+    intentos = models.IntegerField(default=0, verbose_name='Intentos Fallidos')
+    ultimo_error = models.TextField(blank=True, null=True, verbose_name='Último Error')
+    bloqueado_hasta = models.DateTimeField(blank=True, null=True, verbose_name='Bloqueado Hasta')
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
+    fecha_procesado = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Procesado')
+
+    class Meta:
+        db_table = 'evento_notificacion'
+        verbose_name = 'Evento de Notificación'
+        verbose_name_plural = 'Eventos de Notificación'
+        ordering = ['fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} - {self.clave} ({self.estado})"
+
+
+class Recomendacion(models.Model):
+    """Ofertas recomendadas a cada postulante, precalculadas (ver recomendaciones.py)"""
+
+    perfil = models.ForeignKey(
+        PerfilPostulante,
+        on_delete=models.CASCADE,
+        related_name='recomendaciones',
+        verbose_name='Postulante'
+    )
+    oferta = models.ForeignKey(
+        OfertaTrabajo,
+        on_delete=models.CASCADE,
+        related_name='recomendaciones',
+        verbose_name='Oferta'
+    )
+    puntuacion = models.IntegerField(verbose_name='Puntuación')
+    fecha_calculo = models.DateTimeField(auto_now=True, verbose_name='Fecha de Cálculo')
+
+    class Meta:
+        db_table = 'recomendacion'
+        verbose_name = 'Recomendación'
+        verbose_name_plural = 'Recomendaciones'
+        unique_together = ['perfil', 'oferta']
+        ordering = ['-puntuacion']
+        indexes = [
+            models.Index(fields=['perfil', '-puntuacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.perfil_id} - {self.oferta_id} ({self.puntuacion})"
+
+
+class OfertaSimilar(models.Model):
+    """Ofertas parecidas a cada oferta activa, precalculadas (ver similares.py)"""
+
+    oferta = models.ForeignKey(
+        OfertaTrabajo,
+        on_delete=models.CASCADE,
+        related_name='similares',
+        verbose_name='Oferta'
+    )
+    similar = models.ForeignKey(
+        OfertaTrabajo,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Oferta Similar'
+    )
+    puntuacion = models.FloatField(verbose_name='Similitud')
+    fecha_calculo = models.DateTimeField(auto_now=True, verbose_name='Fecha de Cálculo')
+
+    class Meta:
+        db_table = 'oferta_similar'
+        verbose_name = 'Oferta Similar'
+        verbose_name_plural = 'Ofertas Similares'
+        unique_together = ['oferta', 'similar']
+        ordering = ['-puntuacion']
+        indexes = [
+            models.Index(fields=['oferta', '-puntuacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.oferta_id} ~ {self.similar_id} ({self.puntuacion:.2f})"
+
+
+class MetricaDiariaOferta(models.Model):
+    """Vistas, postulaciones y avance del embudo de cada oferta por día (ver metricas.py)"""
+
+    oferta = models.ForeignKey(
+        OfertaTrabajo,
+        on_delete=models.CASCADE,
+        related_name='metricas_diarias',
+        verbose_name='Oferta'
+    )
+    fecha = models.DateField(verbose_name='Fecha')
+    vistas = models.IntegerField(default=0, verbose_name='Vistas')
+    postulaciones = models.IntegerField(default=0, verbose_name='Postulaciones')
+    revisadas = models.IntegerField(default=0, verbose_name='Pasaron a Revisión')
+    entrevistas = models.IntegerField(default=0, verbose_name='Pasaron a Entrevista')
+    aceptadas = models.IntegerField(default=0, verbose_name='Aceptadas')
+    rechazadas = models.IntegerField(default=0, verbose_name='Rechazadas')
+
+    class Meta:
+        db_table = 'metrica_diaria_oferta'
+        verbose_name = 'Métrica Diaria de Oferta'
+        verbose_name_plural = 'Métricas Diarias de Ofertas'
+        unique_together = ['oferta', 'fecha']
+        ordering = ['oferta', 'fecha']
+
+    def __str__(self):
+        return f"{self.oferta_id} - {self.fecha}"
+
+
+class CampoBusqueda(models.TextField):
+    """Columna oculta de una tabla FTS5 que admite el operador MATCH"""
+
+
+@CampoBusqueda.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class IndiceBusquedaOferta(models.Model):
+    """
+    Índice de búsqueda de texto completo (SQLite FTS5) sobre las ofertas.
+    La tabla virtual se crea en la migración 0002 y se mantiene desde signals.py
+    """
+
+    oferta = models.OneToOneField(
+        OfertaTrabajo,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='indice_busqueda',
+        verbose_name='Oferta'
+    )
+    titulo = models.TextField(verbose_name='Título')
+    descripcion = models.TextField(verbose_name='Descripción')
+    requisitos = models.TextField(verbose_name='Requisitos')
+    empresa = models.TextField(verbose_name='Empresa')
+    documento = CampoBusqueda(db_column='oferta_busqueda', editable=False)
+
+    class Meta:
+        managed = False
+        db_table = 'oferta_busqueda'
+        verbose_name = 'Índice de Búsqueda'
+        verbose_name_plural = 'Índice de Búsqueda'
+
+    def __str__(self):
+        return f"Índice #{self.pk}"
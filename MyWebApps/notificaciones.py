@@ -0,0 +1,266 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Greatest
+from django.urls import reverse
+from django.utils import timezone
+
+from . import alertas
+from .models import (
+    BusquedaGuardada, CoincidenciaAlerta, EventoNotificacion, Notificacion, OfertaTrabajo, Postulacion, Usuario
+)
+
+logger = logging.getLogger(__name__)
+
+# Notificaciones generadas en segundo plano
+# Las vistas y signals solo registran un EventoNotificacion (un INSERT); el
+# comando procesar_notificaciones los convierte en filas de Notificacion con
+# bulk_create, por bloques de destinatarios ordenados por id. Después de cada
+# bloque se guarda en el evento el último usuario notificado (cursor), en la
+# misma transacción, así un evento interrumpido continúa donde quedó. Además
+# (evento, usuario) es único, por lo que reintentar nunca duplica notificaciones.
+#
+# Cada Usuario guarda cuántas notificaciones tiene sin leer; el contador se
+# ajusta con UPDATE ... SET n = n + k al crear y al marcar como leídas, y el
+# context processor lo expone sin consultar la tabla de notificaciones.
+
+BLOQUE = getattr(settings, 'NOTIFICACIONES_BLOQUE', 1000)
+MAXIMO_INTENTOS = getattr(settings, 'NOTIFICACIONES_MAXIMO_INTENTOS', 5)
+
+# Tiempo que un worker se reserva un evento; si muere, otro lo retoma después
+DURACION_BLOQUEO = timedelta(minutes=5)
+
+
+def encolar(tipo, clave, **datos):
+    """
+    Registrar un evento de notificación. `clave` identifica el hecho que lo
+    origina: encolar dos veces la misma clave no genera un segundo evento.
+    """
+    evento, _ = EventoNotificacion.objects.get_or_create(clave=clave, defaults={'tipo': tipo, 'datos': datos})
+    return evento
+
+
+def encolar_varios(tipo, eventos):
+    """Registrar varios eventos [(clave, datos)] en un INSERT, omitiendo las claves ya encoladas"""
+    EventoNotificacion.objects.bulk_create([
+        EventoNotificacion(tipo=tipo, clave=clave, datos=datos) for clave, datos in eventos
+    ], ignore_conflicts=True)
+
+
+# ==================== LECTURA ====================
+
+def _descontar(usuario_id, cantidad):
+    if cantidad:
+        Usuario.objects.filter(pk=usuario_id).update(
+            notificaciones_no_leidas=Greatest(F('notificaciones_no_leidas') - cantidad, Value(0))
+        )
+
+
+def marcar_leida(usuario, notificacion_id):
+    """Marcar una notificación del usuario como leída. Devuelve True si estaba sin leer"""
+    with transaction.atomic():
+        marcadas = Notificacion.objects.filter(
+            pk=notificacion_id, usuario=usuario, leida=False
+        ).update(leida=True, fecha_leida=timezone.now())
+        _descontar(usuario.pk, marcadas)
+    return bool(marcadas)
+
+
+def marcar_todas_leidas(usuario):
+    """Marcar todas las notificaciones del usuario como leídas en un solo UPDATE"""
+    with transaction.atomic():
+        marcadas = Notificacion.objects.filter(
+            usuario=usuario, leida=False
+        ).update(leida=True, fecha_leida=timezone.now())
+        _descontar(usuario.pk, marcadas)
+    return marcadas
+
+
+def recontar_no_leidas(usuario_ids):
+    """Recalcular el contador de los usuarios indicados a partir de las notificaciones"""
+    conteos = dict(
+        Notificacion.objects.filter(usuario_id__in=usuario_ids, leida=False)
+        .order_by().values_list('usuario_id').annotate(n=Count('id'))
+    )
+    with transaction.atomic():
+        for usuario_id in usuario_ids:
+            Usuario.objects.filter(pk=usuario_id).update(notificaciones_no_leidas=conteos.get(usuario_id, 0))
+
+
+# ==================== CONTENIDO POR TIPO ====================
+#
+# Cada función recibe los datos del evento y devuelve
+# (destinatarios, titulo, mensaje, enlace), donde destinatarios es un queryset
+# de Usuario; o None si lo que originó el evento ya no existe.
+
+def _nueva_postulacion(datos):
+    postulacion = Postulacion.objects.select_related(
+        'oferta__empresa', 'postulante__usuario'
+    ).filter(pk=datos['postulacion_id']).first()
+    if postulacion is None:
+        return None
+    oferta = postulacion.oferta
+    return (
+        Usuario.objects.filter(pk=oferta.empresa.usuario_id),
+        'Nueva postulación',
+        f'{postulacion.postulante.usuario.nombre_completo} postuló a "{oferta.titulo}"',
+        reverse('postulaciones_oferta', args=[oferta.pk]),
+    )
+
+
+def _cambio_estado(datos):
+    oferta = OfertaTrabajo.objects.filter(pk=datos['oferta_id']).first()
+    if oferta is None:
+        return None
+    estado = dict(Postulacion.ESTADO_CHOICES).get(datos['estado'], datos['estado'])
+    return (
+        Usuario.objects.filter(perfil_postulante__postulaciones__pk__in=datos['postulaciones']),
+        'Tu postulación cambió de estado',
+        f'Tu postulación a "{oferta.titulo}" ahora está: {estado}',
+        reverse('mis_postulaciones'),
+    )
+
+
+def _nueva_oferta(datos):
+    oferta = OfertaTrabajo.objects.select_related('empresa').filter(
+        pk=datos['oferta_id'], estado='activa', aprobada_admin=True
+    ).first()
+    if oferta is None:
+        return None
+    # Quien guardó búsquedas solo recibe las ofertas que coinciden con alguna;
+    # se guardan en una tabla para filtrar con una subconsulta en cada bloque
+    alertas.registrar_coincidencias(oferta)
+    interesados = CoincidenciaAlerta.objects.filter(oferta=oferta).values('usuario_id')
+    con_busquedas = BusquedaGuardada.objects.filter(usuario=OuterRef('pk'), activa=True)
+    return (
+        Usuario.objects.filter(tipo_usuario='postulante', is_active=True).filter(
+            Q(pk__in=interesados) | ~Exists(con_busquedas)
+        ),
+        f'Nueva oferta: {oferta.titulo}',
+        f'{oferta.empresa.nombre_empresa} publicó una nueva oferta en {oferta.ubicacion}',
+        reverse('oferta_detalle', args=[oferta.pk]),
+    )
+
+
+def _oferta_expirada(datos):
+    oferta = OfertaTrabajo.objects.select_related('empresa').filter(pk=datos['oferta_id']).first()
+    if oferta is None:
+        return None
+    return (
+        Usuario.objects.filter(pk=oferta.empresa.usuario_id),
+        'Tu oferta expiró',
+        f'La oferta "{oferta.titulo}" llegó a su fecha de expiración y ya no recibe postulaciones',
+        reverse('mis_ofertas'),
+    )
+
+
+CONTENIDOS = {
+    'postulacion': _nueva_postulacion,
+    'estado_postulacion': _cambio_estado,
+    'nueva_oferta': _nueva_oferta,
+    'oferta_expirada': _oferta_expirada,
+}
+
+
+# ==================== WORKER ====================
+
+def _reclamar(evento):
+    """Reservar un evento para este worker. False si otro lo tomó antes"""
+    ahora = timezone.now()
+    return EventoNotificacion.objects.filter(
+        Q(bloqueado_hasta__isnull=True) | Q(bloqueado_hasta__lt=ahora),
+        pk=evento.pk,
+        estado='pendiente',
+    ).update(bloqueado_hasta=ahora + DURACION_BLOQUEO) == 1
+
+
+def procesar_evento(evento, bloque=BLOQUE):
+    """Crear las notificaciones de un evento ya reservado. Devuelve cuántas se crearon"""
+    creadas = 0
+    contenido = CONTENIDOS[evento.tipo](evento.datos)
+
+    if contenido is not None:
+        destinatarios, titulo, mensaje, enlace = contenido
+        destinatarios = destinatarios.order_by('pk').values_list('pk', flat=True).distinct()
+        while True:
+            ids = list(destinatarios.filter(pk__gt=evento.cursor)[:bloque])
+            if not ids:
+                break
+            with transaction.atomic():
+                # Por si el bloque ya se había creado en un intento anterior
+                existentes = set(Notificacion.objects.filter(
+                    evento=evento, usuario_id__in=ids
+                ).values_list('usuario_id', flat=True))
+                nuevos = [usuario_id for usuario_id in ids if usuario_id not in existentes]
+                Notificacion.objects.bulk_create([
+                    Notificacion(
+                        usuario_id=usuario_id,
+                        evento=evento,
+                        tipo=evento.tipo,
+                        titulo=titulo,
+                        mensaje=mensaje,
+                        enlace=enlace,
+                    )
+                    for usuario_id in nuevos
+                ])
+                Usuario.objects.filter(pk__in=nuevos).update(
+                    notificaciones_no_leidas=F('notificaciones_no_leidas') + 1
+                )
+                evento.cursor = ids[-1]
+                EventoNotificacion.objects.filter(pk=evento.pk).update(
+                    cursor=evento.cursor,
+                    notificados=F('notificados') + len(nuevos),
+                    bloqueado_hasta=timezone.now() + DURACION_BLOQUEO,
+                )
+            creadas += len(nuevos)
+
+    EventoNotificacion.objects.filter(pk=evento.pk).update(
+        estado='procesado',
+        fecha_procesado=timezone.now(),
+        bloqueado_hasta=None,
+    )
+    return creadas
+
+
+def _registrar_error(evento, error):
+    intentos = evento.intentos + 1
+    EventoNotificacion.objects.filter(pk=evento.pk).update(
+        intentos=intentos,
+        ultimo_error=str(error)[:2000],
+        estado='error' if intentos >= MAXIMO_INTENTOS else 'pendiente',
+        # Esperar más entre reintentos sucesivos
+        bloqueado_hasta=timezone.now() + timedelta(minutes=intentos),
+    )
+
+
+def procesar_pendientes(bloque=BLOQUE, maximo_eventos=None):
+    """
+    Procesar los eventos pendientes en orden de llegada.
+    Devuelve (eventos procesados, notificaciones creadas).
+    """
+    eventos = notificaciones = 0
+    while maximo_eventos is None or eventos < maximo_eventos:
+        ahora = timezone.now()
+        candidatos = list(EventoNotificacion.objects.filter(
+            Q(bloqueado_hasta__isnull=True) | Q(bloqueado_hasta__lt=ahora),
+            estado='pendiente',
+        ).order_by('fecha_creacion', 'pk')[:50])
+        if not candidatos:
+            break
+
+        for evento in candidatos:
+            if maximo_eventos is not None and eventos >= maximo_eventos:
+                break
+            if not _reclamar(evento):
+                continue
+            try:
+                notificaciones += procesar_evento(evento, bloque)
+            except Exception as error:
+                logger.exception('Error al procesar el evento de notificación %s', evento.pk)
+                _registrar_error(evento, error)
+            eventos += 1
+
+    return eventos, notificaciones
@@ -0,0 +1,167 @@
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+
+# Paginación por cursor (keyset) para listados grandes
+# En lugar de COUNT(*) + OFFSET, cada página se pide a partir de la clave
+# (campo de orden, id) de la última fila vista, así que la página 5000
+# cuesta lo mismo que la primera.
+
+SALT_CURSOR = 'empleoya.paginacion.cursor'
+
+
+class PaginaCursor:
+    """Una página de resultados con sus tokens de navegación"""
+
+    def __init__(self, object_list, cursor_siguiente, cursor_anterior, total=None):
+        self.object_list = object_list
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+        self.total = total
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.cursor_siguiente is not None
+
+    @property
+    def has_previous(self):
+        return self.cursor_anterior is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class PaginadorCursor:
+    """
+    Paginador keyset sobre un queryset.
+    `orden` es un campo del modelo o una anotación, con '-' para orden descendente;
+    el id se usa siempre como desempate. Los nulos van al final.
+    """
+
+    def __init__(self, queryset, orden, por_pagina=12):
+        self.queryset = queryset
+        self.descendente = orden.startswith('-')
+        self.campo = orden.lstrip('-')
+        self.por_pagina = por_pagina
+
+        try:
+            self.modelo_campo = queryset.model._meta.get_field(self.campo)
+        except FieldDoesNotExist:
+            self.modelo_campo = None  # Anotación (p. ej. relevancia)
+        self.admite_nulos = bool(self.modelo_campo and self.modelo_campo.null)
+
+    # -------------------- Tokens --------------------
+
+    def _codificar(self, obj, direccion):
+        if isinstance(obj, dict):
+            # Filas de values() (API): solo hacen falta el campo de orden y el id
+            valor, pk = obj[self.campo], obj['id']
+            if self.modelo_campo is not None:
+                obj = self.queryset.model(**{self.modelo_campo.attname: valor})
+        else:
+            valor, pk = getattr(obj, self.campo), obj.pk
+        if self.modelo_campo is not None and valor is not None:
+            valor = self.modelo_campo.value_to_string(obj)
+        return signing.dumps(
+            {'c': self.campo, 'v': valor, 'id': pk, 'd': direccion},
+            salt=SALT_CURSOR,
+            compress=True,
+        )
+
+    def _decodificar(self, token):
+        try:
+            datos = signing.loads(token, salt=SALT_CURSOR)
+        except signing.BadSignature:
+            return None
+        if not isinstance(datos, dict) or datos.get('c') != self.campo or datos.get('d') not in ('s', 'a'):
+            return None
+        valor = datos['v']
+        if self.modelo_campo is not None and valor is not None:
+            valor = self.modelo_campo.to_python(valor)
+        return valor, datos['id'], datos['d'] == 's'
+
+    # -------------------- Consulta --------------------
+    #
+    # El listado es la concatenación de dos tramos: filas con valor (ordenadas por
+    # campo, id) y, si el campo admite nulos, filas sin valor (ordenadas por id).
+    # Cada tramo se consulta por separado para que la condición sea un rango
+    # sobre el índice y nunca un OR con IS NULL.
+
+    def _orden(self, descendente):
+        if descendente:
+            return [F(self.campo).desc(), '-pk']
+        return [F(self.campo).asc(), 'pk']
+
+    def _tramo_valores(self, valor, pk, hacia_adelante):
+        queryset = self.queryset
+        if self.admite_nulos:
+            queryset = queryset.filter(**{f'{self.campo}__isnull': False})
+        descendente = self.descendente == hacia_adelante
+        if valor is not None:
+            op = 'lt' if descendente else 'gt'
+            # campo <= v AND (campo < v OR id < pk): la primera condición usa el índice
+            queryset = queryset.filter(
+                Q(**{f'{self.campo}__{op[0]}te': valor}),
+                Q(**{f'{self.campo}__{op}': valor}) | Q(**{f'pk__{op}': pk}),
+            )
+        return queryset.order_by(*self._orden(descendente))
+
+    def _tramo_nulos(self, pk, hacia_adelante):
+        descendente = self.descendente == hacia_adelante
+        queryset = self.queryset.filter(**{f'{self.campo}__isnull': True})
+        if pk is not None:
+            queryset = queryset.filter(**{f'pk__{"lt" if descendente else "gt"}': pk})
+        return queryset.order_by('-pk' if descendente else 'pk')
+
+    def _consultar(self, cursor, limite):
+        """Filas a partir del cursor, en el sentido de recorrido"""
+        if cursor is None:
+            valor, pk, hacia_adelante = None, None, True
+            tramos = [self._tramo_valores(None, None, True)]
+            if self.admite_nulos:
+                tramos.append(self._tramo_nulos(None, True))
+        else:
+            valor, pk, hacia_adelante = cursor
+            if hacia_adelante and valor is not None:
+                tramos = [self._tramo_valores(valor, pk, True)]
+                if self.admite_nulos:
+                    tramos.append(self._tramo_nulos(None, True))
+            elif hacia_adelante:
+                tramos = [self._tramo_nulos(pk, True)]
+            elif valor is None:
+                tramos = [self._tramo_nulos(pk, False), self._tramo_valores(None, None, False)]
+            else:
+                tramos = [self._tramo_valores(valor, pk, False)]
+
+        filas = []
+        for tramo in tramos:
+            filas.extend(tramo[:limite - len(filas)])
+            if len(filas) >= limite:
+                break
+        return filas, hacia_adelante
+
+    def get_page(self, token=None):
+        """Obtener la página que sigue (o precede) al cursor indicado"""
+        cursor = self._decodificar(token) if token else None
+
+        filas, hacia_adelante = self._consultar(cursor, self.por_pagina + 1)
+        hay_mas = len(filas) > self.por_pagina
+        filas = filas[:self.por_pagina]
+        if not hacia_adelante:
+            filas.reverse()
+
+        cursor_siguiente = cursor_anterior = None
+        if filas:
+            if hay_mas or not hacia_adelante:
+                cursor_siguiente = self._codificar(filas[-1], 's')
+            if cursor is not None and (hay_mas or hacia_adelante):
+                cursor_anterior = self._codificar(filas[0], 'a')
+
+        return PaginaCursor(filas, cursor_siguiente, cursor_anterior)
@@ -0,0 +1,95 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Categoria, Empresa, OfertaTrabajo, PerfilPostulante
+
+# Datos de la página de inicio servidos desde caché
+# El snapshot (estadísticas, categorías y ofertas destacadas) se calcula una vez
+# y se guarda junto con la "generación" vigente. Los signals invalidan subiendo
+# la generación; el snapshot viejo se sigue sirviendo mientras un solo worker
+# (el que obtiene el candado) lo recalcula, así no hay estampida de consultas.
+
+CLAVE_SNAPSHOT = 'home:snapshot'
+CLAVE_GENERACION = 'home:generacion'
+CLAVE_CANDADO = 'home:snapshot:candado'
+
+DURACION_CANDADO = 30   # segundos máximos que puede durar un recálculo
+ESPERA_MAXIMA = 2       # segundos que espera un worker sin snapshot previo
+
+
+def calcular_snapshot():
+    """Consultar todos los datos de la página de inicio"""
+    # Ofertas destacadas (últimas 6 ofertas activas)
+    ofertas_destacadas = list(OfertaTrabajo.objects.filter(
+        estado='activa',
+        aprobada_admin=True
+    ).select_related('empresa', 'categoria').order_by('-fecha_publicacion')[:6])
+
+    # Categorías con conteo de ofertas
+    categorias = list(Categoria.objects.filter(activa=True).annotate(
+        num_ofertas=Count('ofertas', filter=Q(ofertas__estado='activa'))
+    )[:8])
+
+    # Estadísticas generales
+    stats = {
+        'total_ofertas': OfertaTrabajo.objects.filter(estado='activa').count(),
+        'total_empresas': Empresa.objects.count(),
+        'total_postulantes': PerfilPostulante.objects.count(),
+        'total_categorias': Categoria.objects.filter(activa=True).count(),
+    }
+
+    return {
+        'ofertas_destacadas': ofertas_destacadas,
+        'categorias': categorias,
+        'stats': stats,
+    }
+
+
+def invalidar():
+    """Marcar el snapshot como desactualizado (se recalcula en la siguiente visita)"""
+    try:
+        cache.incr(CLAVE_GENERACION)
+    except ValueError:
+        cache.set(CLAVE_GENERACION, 1, None)
+
+
+def _recalcular(generacion):
+    datos = calcular_snapshot()
+    cache.set(
+        CLAVE_SNAPSHOT,
+        {'generacion': generacion, 'datos': datos},
+        getattr(settings, 'HOME_SNAPSHOT_TTL', 600)
+    )
+    return datos
+
+
+def obtener_snapshot():
+    """Datos de la página de inicio, desde caché siempre que sea posible"""
+    valores = cache.get_many([CLAVE_SNAPSHOT, CLAVE_GENERACION])
+    snapshot = valores.get(CLAVE_SNAPSHOT)
+    generacion = valores.get(CLAVE_GENERACION, 0)
+
+    if snapshot is not None and snapshot['generacion'] == generacion:
+        return snapshot['datos']
+
+    # Solo un worker recalcula; los demás sirven la versión anterior
+    if cache.add(CLAVE_CANDADO, True, DURACION_CANDADO):
+        try:
+            return _recalcular(generacion)
+        finally:
+            cache.delete(CLAVE_CANDADO)
+
+    if snapshot is not None:
+        return snapshot['datos']
+
+    # Caché vacía y otro worker calculando: esperar un poco su resultado
+    limite = time.monotonic() + ESPERA_MAXIMA
+    while time.monotonic() < limite:
+        time.sleep(0.05)
+        snapshot = cache.get(CLAVE_SNAPSHOT)
+        if snapshot is not None:
+            return snapshot['datos']
+    return calcular_snapshot()
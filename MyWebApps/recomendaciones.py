@@ -0,0 +1,166 @@
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import match
+from .models import OfertaTrabajo, PerfilPostulante, Postulacion, Recomendacion
+
+# Recomendaciones de ofertas precalculadas por postulante
+# Para cada perfil se guardan las TOP_N ofertas activas con mayor puntuación
+# de match (ver match.py) a las que todavía no postuló. El dashboard las lee
+# con una sola consulta sobre el índice (perfil, -puntuacion).
+#
+# La tabla se mantiene de forma incremental:
+#   - al editar un perfil se borra su fecha_recomendaciones (signals.py) y
+#     actualizar_recomendaciones lo recalcula desde cero, fuera de la petición;
+#     hasta entonces el dashboard muestra las que ya tenía;
+#   - al postular, o cuando una oferta deja de estar activa, se borran sus filas;
+#   - las ofertas nuevas o editadas se incorporan a todos los perfiles con el
+#     comando actualizar_recomendaciones, que compara cada oferta contra la
+#     puntuación más baja guardada de cada perfil. El mismo comando calcula
+#     los perfiles pendientes: editados o que nunca se calcularon (nuevos,
+#     creados en bloque o importados).
+# La lectura del dashboard no calcula nada: un perfil sin calcular todavía no
+# tiene recomendaciones.
+
+TOP_N = getattr(settings, 'RECOMENDACIONES_TOP', 12)
+
+# Ofertas más recientes que se evalúan al calcular un perfil desde cero
+MAXIMO_CANDIDATAS = getattr(settings, 'RECOMENDACIONES_CANDIDATAS', 3000)
+
+
+def ofertas_recomendables():
+    return OfertaTrabajo.objects.filter(estado='activa', aprobada_admin=True)
+
+
+def candidatas(limite=MAXIMO_CANDIDATAS):
+    """Lista [(oferta_id, DatosOferta)] de las ofertas activas más recientes"""
+    ofertas = ofertas_recomendables().order_by('-fecha_publicacion').only(*match.CAMPOS_OFERTA)[:limite]
+    return [(oferta.pk, match.datos_oferta(oferta)) for oferta in ofertas.iterator(chunk_size=500)]
+
+
+def calcular_perfil(perfil, ofertas=None):
+    """
+    Recalcular desde cero las recomendaciones de un perfil.
+    `ofertas` permite reutilizar la lista de candidatas() al procesar muchos perfiles.
+    Devuelve el número de recomendaciones guardadas.
+    """
+    if ofertas is None:
+        ofertas = candidatas()
+
+    datos = match.datos_perfil(perfil)
+    postuladas = set(Postulacion.objects.filter(postulante=perfil).values_list('oferta_id', flat=True))
+    mejores = heapq.nlargest(TOP_N, (
+        (match.puntuar(datos, datos_oferta), oferta_id)
+        for oferta_id, datos_oferta in ofertas
+        if oferta_id not in postuladas
+    ))
+
+    with transaction.atomic():
+        Recomendacion.objects.filter(perfil=perfil).delete()
+        Recomendacion.objects.bulk_create([
+            Recomendacion(perfil=perfil, oferta_id=oferta_id, puntuacion=puntuacion)
+            for puntuacion, oferta_id in mejores
+        ])
+        PerfilPostulante.objects.filter(pk=perfil.pk).update(fecha_recomendaciones=timezone.now())
+    return len(mejores)
+
+
+def incorporar_ofertas(ids, bloque=1000):
+    """
+    Incorporar ofertas nuevas o editadas a las recomendaciones de todos los perfiles.
+    Cada perfil conserva sus TOP_N mejores entre lo que ya tenía y estas ofertas.
+    Devuelve el número de perfiles recorridos.
+    """
+    ofertas = [
+        (oferta.pk, match.datos_oferta(oferta))
+        for oferta in ofertas_recomendables().filter(pk__in=ids).only(*match.CAMPOS_OFERTA)
+    ]
+    ids = [oferta_id for oferta_id, _ in ofertas]
+    if not ids:
+        return 0
+
+    # Su puntuación pudo cambiar: se vuelven a evaluar contra cada perfil
+    Recomendacion.objects.filter(oferta_id__in=ids).delete()
+
+    perfiles = PerfilPostulante.objects.order_by('pk').only(*match.CAMPOS_PERFIL)
+    procesados = 0
+    ultimo_id = 0
+    while True:
+        lote = list(perfiles.filter(pk__gt=ultimo_id)[:bloque])
+        if not lote:
+            break
+        ultimo_id = lote[-1].pk
+        procesados += len(lote)
+        pks = [perfil.pk for perfil in lote]
+
+        actuales = defaultdict(list)
+        for fila in Recomendacion.objects.filter(perfil_id__in=pks).values_list('pk', 'perfil_id', 'puntuacion'):
+            actuales[fila[1]].append((fila[2], fila[0]))
+        postuladas = set(
+            Postulacion.objects.filter(postulante_id__in=pks, oferta_id__in=ids).values_list('postulante_id', 'oferta_id')
+        )
+
+        nuevas = []
+        sobrantes = []
+        for perfil in lote:
+            datos = match.datos_perfil(perfil)
+            guardadas = actuales[perfil.pk]
+            minima = min(guardadas)[0] if len(guardadas) >= TOP_N else -1
+            propuestas = [
+                (match.puntuar(datos, datos_oferta), oferta_id)
+                for oferta_id, datos_oferta in ofertas
+                if (perfil.pk, oferta_id) not in postuladas
+            ]
+            propuestas = [propuesta for propuesta in propuestas if propuesta[0] > minima]
+            if not propuestas:
+                continue
+
+            # Las guardadas se identifican por su pk, las propuestas por la oferta
+            mejores = heapq.nlargest(
+                TOP_N,
+                [(puntuacion, True, pk) for puntuacion, pk in guardadas] +
+                [(puntuacion, False, oferta_id) for puntuacion, oferta_id in propuestas],
+            )
+            elegidas = {(guardada, clave) for _, guardada, clave in mejores}
+            sobrantes.extend(pk for _, pk in guardadas if (True, pk) not in elegidas)
+            nuevas.extend(
+                Recomendacion(perfil_id=perfil.pk, oferta_id=oferta_id, puntuacion=puntuacion)
+                for puntuacion, oferta_id in propuestas if (False, oferta_id) in elegidas
+            )
+
+        with transaction.atomic():
+            if sobrantes:
+                Recomendacion.objects.filter(pk__in=sobrantes).delete()
+            if nuevas:
+                Recomendacion.objects.bulk_create(nuevas)
+
+    return procesados
+
+
+def retirar_ofertas(ids):
+    """Quitar de las recomendaciones ofertas que dejaron de estar activas"""
+    Recomendacion.objects.filter(oferta_id__in=ids).delete()
+
+
+def descartar(perfil_id, oferta_id):
+    """Quitar una oferta de las recomendaciones de un perfil (p. ej. porque ya postuló)"""
+    Recomendacion.objects.filter(perfil_id=perfil_id, oferta_id=oferta_id).delete()
+
+
+def marcar_pendiente(perfil_id):
+    """Dejar un perfil para que actualizar_recomendaciones lo recalcule"""
+    PerfilPostulante.objects.filter(pk=perfil_id).update(fecha_recomendaciones=None)
+
+
+def obtener(perfil, cantidad=6):
+    """Ofertas recomendadas para el dashboard, con una consulta sobre el índice (perfil, -puntuacion)"""
+    recomendaciones = Recomendacion.objects.filter(
+        perfil=perfil,
+        oferta__estado='activa',
+        oferta__aprobada_admin=True,
+    ).select_related('oferta__empresa', 'oferta__categoria').order_by('-puntuacion')
+    return [recomendacion.oferta for recomendacion in recomendaciones[:cantidad]]
@@ -0,0 +1,250 @@
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from . import (
+    alertas, busqueda, contadores, facetas, match, metricas, notificaciones, portada, recomendaciones,
+    similares, vistas
+)
+from .models import BusquedaGuardada, Categoria, Empresa, Notificacion, OfertaTrabajo, PerfilPostulante, Postulacion
+
+# Signals del sistema EMPLEOYA
+# Mantienen sincronizadas las estructuras derivadas (índices, contadores, cachés)
+
+CAMPOS_INDEXADOS = {'titulo', 'descripcion', 'requisitos', 'empresa', 'empresa_id'}
+
+# Campos que cambian los conteos por faceta del buscador
+CAMPOS_FACETAS = CAMPOS_INDEXADOS | {
+    'categoria', 'modalidad', 'tipo_contrato', 'nivel_experiencia', 'ubicacion', 'estado', 'aprobada_admin',
+}
+
+# Campos que se muestran en la página de inicio, por modelo
+CAMPOS_PORTADA = {
+    OfertaTrabajo: {
+        'titulo', 'empresa', 'categoria', 'estado', 'aprobada_admin', 'fecha_publicacion',
+        'modalidad', 'tipo_contrato', 'ubicacion', 'salario_min', 'salario_max', 'moneda',
+    },
+    Empresa: {'nombre_empresa'},
+    Categoria: {'nombre', 'icono', 'activa'},
+}
+
+
+def _afecta(update_fields, campos):
+    """True si un save() con update_fields puede haber cambiado alguno de los campos"""
+    return update_fields is None or bool(set(update_fields) & set(campos))
+
+
+# ==================== BÚSQUEDA ====================
+
+@receiver(post_save, sender=OfertaTrabajo)
+def indexar_oferta(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Mantener el índice de búsqueda al crear o editar una oferta"""
+    if raw or not _afecta(update_fields, CAMPOS_INDEXADOS):
+        return
+    busqueda.indexar_ofertas([instance.pk])
+
+
+@receiver(post_delete, sender=OfertaTrabajo)
+def desindexar_oferta(sender, instance, **kwargs):
+    """Quitar la oferta eliminada del índice de búsqueda"""
+    busqueda.eliminar_oferta(instance.pk)
+
+
+@receiver(post_save, sender=Empresa)
+def reindexar_empresa(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """El nombre de la empresa forma parte del índice de sus ofertas"""
+    if raw or created or not _afecta(update_fields, {'nombre_empresa'}):
+        return
+    busqueda.indexar_empresa(instance.pk)
+
+
+# ==================== FACETAS ====================
+
+@receiver(post_save, sender=OfertaTrabajo)
+def invalidar_facetas(sender, update_fields=None, raw=False, **kwargs):
+    """Las ofertas nuevas o editadas cambian los conteos del buscador"""
+    if raw or not _afecta(update_fields, CAMPOS_FACETAS):
+        return
+    facetas.invalidar()
+
+
+@receiver(post_save, sender=Empresa)
+def invalidar_facetas_empresa(sender, created=False, update_fields=None, raw=False, **kwargs):
+    """El nombre de la empresa también se busca como texto"""
+    if raw or created or not _afecta(update_fields, {'nombre_empresa'}):
+        return
+    facetas.invalidar()
+
+
+@receiver(post_delete, sender=OfertaTrabajo)
+def invalidar_facetas_eliminacion(sender, **kwargs):
+    facetas.invalidar()
+
+
+# ==================== CONTADORES DE POSTULACIONES ====================
+
+@receiver(post_save, sender=Postulacion)
+def contar_postulacion(sender, instance, created=False, raw=False, **kwargs):
+    """Mantener los contadores de la oferta al crear o cambiar de estado una postulación"""
+    if raw:
+        return
+    if created:
+        contadores.sumar_postulacion(instance.oferta_id, instance.estado)
+    else:
+        estado_anterior = getattr(instance, '_estado_anterior', None)
+        if estado_anterior:
+            contadores.mover_postulaciones(instance.oferta_id, estado_anterior, instance.estado)
+
+
+@receiver(post_delete, sender=Postulacion)
+def descontar_postulacion(sender, instance, **kwargs):
+    """Restar la postulación eliminada de los contadores de su oferta"""
+    contadores.sumar_postulacion(instance.oferta_id, instance.estado, -1)
+
+
+# ==================== MÉTRICAS DIARIAS ====================
+
+@receiver(post_save, sender=Postulacion)
+def medir_postulacion(sender, instance, created=False, raw=False, **kwargs):
+    """Sumar la postulación nueva o su avance en el embudo a las métricas del día de su oferta"""
+    if raw:
+        return
+    if created:
+        metricas.registrar_postulacion(instance.oferta_id, instance.estado)
+    else:
+        estado_anterior = getattr(instance, '_estado_anterior', None)
+        if estado_anterior:
+            metricas.registrar_transiciones(instance.oferta_id, {estado_anterior: 1}, instance.estado)
+
+
+# ==================== PÁGINA DE INICIO ====================
+# Se invalida al confirmar: antes, otra petición podría rearmar el snapshot con
+# los datos sin confirmar bajo la generación nueva y dejarlo viejo hasta su TTL
+
+@receiver(post_save, sender=OfertaTrabajo)
+@receiver(post_save, sender=Empresa)
+@receiver(post_save, sender=Categoria)
+def invalidar_portada(sender, update_fields=None, raw=False, **kwargs):
+    """Ofertas, empresas y categorías aparecen en el snapshot de la página de inicio"""
+    if raw or not _afecta(update_fields, CAMPOS_PORTADA[sender]):
+        return
+    transaction.on_commit(portada.invalidar)
+
+
+@receiver(post_save, sender=PerfilPostulante)
+def invalidar_portada_postulantes(sender, created=False, raw=False, **kwargs):
+    """De los postulantes solo se muestra el total"""
+    if created and not raw:
+        transaction.on_commit(portada.invalidar)
+
+
+@receiver(post_delete, sender=OfertaTrabajo)
+@receiver(post_delete, sender=Empresa)
+@receiver(post_delete, sender=Categoria)
+@receiver(post_delete, sender=PerfilPostulante)
+def invalidar_portada_eliminacion(sender, **kwargs):
+    transaction.on_commit(portada.invalidar)
+
+
+# ==================== MATCH ====================
+
+@receiver(post_save, sender=OfertaTrabajo)
+def recalcular_match(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Una oferta editada vuelve a puntuar sus postulaciones abiertas al confirmar la transacción"""
+    if raw or created or not _afecta(update_fields, match.CAMPOS_OFERTA):
+        return
+    transaction.on_commit(lambda: match.recalcular_ofertas([instance.pk]))
+
+
+# ==================== RECOMENDACIONES ====================
+
+@receiver(post_save, sender=PerfilPostulante)
+def recalcular_recomendaciones(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """Un perfil editado queda pendiente: actualizar_recomendaciones lo recalcula fuera de la petición"""
+    if raw or created or not _afecta(update_fields, match.CAMPOS_PERFIL):
+        return
+    recomendaciones.marcar_pendiente(instance.pk)
+
+
+@receiver(post_save, sender=OfertaTrabajo)
+def retirar_recomendaciones(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Las ofertas que dejan de estar activas salen de las recomendaciones"""
+    if raw or not _afecta(update_fields, {'estado', 'aprobada_admin'}):
+        return
+    if instance.estado != 'activa' or not instance.aprobada_admin:
+        recomendaciones.retirar_ofertas([instance.pk])
+
+
+@receiver(post_save, sender=Postulacion)
+def descartar_recomendacion(sender, instance, created=False, raw=False, **kwargs):
+    """No recomendar ofertas a las que el postulante ya postuló"""
+    if created and not raw:
+        recomendaciones.descartar(instance.postulante_id, instance.oferta_id)
+
+
+# ==================== OFERTAS SIMILARES ====================
+
+@receiver(post_save, sender=OfertaTrabajo)
+def recalcular_similares(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Recalcular las vecinas de una oferta nueva o editada, o quitarla si ya no está activa"""
+    if raw or not _afecta(update_fields, similares.CAMPOS_SIMILITUD):
+        return
+    if instance.estado == 'activa' and instance.aprobada_admin:
+        transaction.on_commit(lambda: similares.calcular_oferta(instance))
+    else:
+        similares.retirar_ofertas([instance.pk])
+
+
+# ==================== NOTIFICACIONES ====================
+# Solo se encola el evento; el comando procesar_notificaciones crea las notificaciones
+
+@receiver(post_save, sender=Postulacion)
+def notificar_postulacion(sender, instance, created=False, raw=False, **kwargs):
+    """Avisar al empleador de una postulación nueva y al postulante de un cambio de estado"""
+    if raw:
+        return
+    if created:
+        notificaciones.encolar('postulacion', f'postulacion:{instance.pk}', postulacion_id=instance.pk)
+        return
+    estado_anterior = getattr(instance, '_estado_anterior', None)
+    if estado_anterior and estado_anterior != instance.estado:
+        notificaciones.encolar(
+            'estado_postulacion',
+            f'estado_postulacion:{instance.pk}:{instance.estado}:{instance.fecha_cambio_estado.isoformat()}',
+            oferta_id=instance.oferta_id,
+            postulaciones=[instance.pk],
+            estado=instance.estado,
+        )
+
+
+@receiver(post_save, sender=OfertaTrabajo)
+def notificar_nueva_oferta(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Avisar a los postulantes cuando una oferta queda publicada (una sola vez por oferta)"""
+    if raw or not _afecta(update_fields, {'estado', 'aprobada_admin'}):
+        return
+    if instance.estado == 'activa' and instance.aprobada_admin:
+        notificaciones.encolar('nueva_oferta', f'nueva_oferta:{instance.pk}', oferta_id=instance.pk)
+
+
+@receiver(post_save, sender=Notificacion)
+@receiver(post_delete, sender=Notificacion)
+def recontar_notificaciones(sender, instance, raw=False, **kwargs):
+    """Altas, ediciones y bajas sueltas (p. ej. desde el admin) recalculan el contador del usuario"""
+    if not raw:
+        notificaciones.recontar_no_leidas([instance.usuario_id])
+
+
+@receiver(pre_save, sender=BusquedaGuardada)
+def indexar_busqueda_guardada(sender, instance, raw=False, **kwargs):
+    """Calcular la clave por la que una oferta nueva encuentra la búsqueda"""
+    instance.clave_indice = alertas.clave_indice(instance)
+
+
+# ==================== VISTAS ====================
+
+@receiver(request_finished)
+def volcar_vistas(sender, **kwargs):
+    """Volcar el contador de vistas cuando toca, después de enviar la respuesta"""
+    if vistas.contador.debe_volcar():
+        vistas.contador.volcar()
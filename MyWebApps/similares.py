@@ -0,0 +1,190 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import busqueda, match
+from .models import OfertaSimilar, OfertaTrabajo
+
+# Ofertas similares precalculadas (vecinos más cercanos por contenido)
+# Cada oferta se representa como un vector TF-IDF de las palabras de su título,
+# descripción y requisitos. Las frecuencias de documento salen de la tabla
+# fts5vocab del índice de búsqueda, y las candidatas de una consulta FTS5 con
+# los términos más pesados de la oferta, así que calcular los vecinos de una
+# oferta no requiere recorrer todas las demás. Sin FTS5 las candidatas son
+# ofertas recientes de la misma categoría.
+#
+# Se guardan las K más parecidas por oferta. Al crear o editar una oferta se
+# recalculan sus vecinas y ella entra en la lista de cada vecina si supera a
+# la peor guardada; al cerrarse se borran sus filas. El comando
+# recalcular_similares completa las listas que quedaron cortas.
+#
+# Solo se calcula desde el signal y el comando, nunca al mostrar el detalle:
+# leer las similares es una sola consulta por índice, aunque la lista esté
+# vacía. fecha_similares de cada oferta marca el último cambio de su lista
+# (None: nunca se calculó) y forma parte de la ETag del detalle.
+
+K = getattr(settings, 'SIMILARES_TOP', 6)
+
+TERMINOS_CONSULTA = 12      # Términos de la oferta usados para buscar candidatas
+MAXIMO_CANDIDATAS = 50      # Candidatas que se comparan con la oferta
+PESO_TITULO = 3             # Una palabra del título vale por tres
+
+# El total de ofertas solo ajusta el IDF: basta un valor de hace un rato
+CLAVE_TOTAL = 'similares:total_ofertas'
+TTL_TOTAL = 60 * 60
+
+CAMPOS_TEXTO = ['titulo', 'descripcion', 'requisitos']
+
+# Campos cuyo cambio obliga a recalcular las similares de una oferta
+CAMPOS_SIMILITUD = set(CAMPOS_TEXTO) | {'categoria', 'categoria_id', 'estado', 'aprobada_admin'}
+
+
+def ofertas_comparables():
+    return OfertaTrabajo.objects.filter(estado='activa', aprobada_admin=True)
+
+
+def terminos_oferta(oferta):
+    """Frecuencia de cada término de la oferta, con el título ponderado"""
+    conteo = Counter()
+    for campo, peso in (('titulo', PESO_TITULO), ('descripcion', 1), ('requisitos', 1)):
+        for palabra in re.findall(r'\w+', match.normalizar(getattr(oferta, campo))):
+            if len(palabra) > 1 and not palabra.isdigit() and palabra not in match.PALABRAS_VACIAS:
+                conteo[palabra] += peso
+    return conteo
+
+
+def _total_ofertas():
+    total = cache.get(CLAVE_TOTAL)
+    if total is None:
+        total = OfertaTrabajo.objects.count()
+        cache.set(CLAVE_TOTAL, total, TTL_TOTAL)
+    return total
+
+
+def _idf(terminos):
+    """Peso IDF de cada término según cuántas ofertas lo contienen"""
+    total = _total_ofertas()
+    frecuencias = busqueda.frecuencias(terminos)
+    return {termino: math.log((total + 1) / (frecuencias.get(termino, 0) + 1)) + 1 for termino in terminos}
+
+
+def vector(conteo, idf):
+    """Vector TF-IDF normalizado {termino: peso}"""
+    pesos = {termino: (1 + math.log(n)) * idf[termino] for termino, n in conteo.items()}
+    norma = math.sqrt(sum(peso * peso for peso in pesos.values()))
+    if not norma:
+        return {}
+    return {termino: peso / norma for termino, peso in pesos.items()}
+
+
+def similitud(a, b):
+    """Similitud coseno entre dos vectores normalizados"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(peso * b[termino] for termino, peso in a.items() if termino in b)
+
+
+def _candidatas(oferta, vector_oferta):
+    ofertas = ofertas_comparables().exclude(pk=oferta.pk).only(*CAMPOS_TEXTO)
+    if busqueda.disponible():
+        principales = heapq.nlargest(TERMINOS_CONSULTA, vector_oferta, key=vector_oferta.get)
+        consulta = ' OR '.join(f'"{termino}"' for termino in principales)
+        ofertas = busqueda.ordenar_por_relevancia(
+            ofertas.filter(indice_busqueda__documento__match=consulta)
+        ).order_by('relevancia')
+    else:
+        ofertas = ofertas.filter(categoria_id=oferta.categoria_id).order_by('-fecha_publicacion')
+    return list(ofertas[:MAXIMO_CANDIDATAS])
+
+
+def vecinas(oferta):
+    """Las K ofertas comparables más parecidas: [(similitud, oferta_id)]"""
+    conteo = terminos_oferta(oferta)
+    if not conteo:
+        return []
+    vector_oferta = vector(conteo, _idf(conteo))
+    candidatas = [(candidata.pk, terminos_oferta(candidata)) for candidata in _candidatas(oferta, vector_oferta)]
+
+    idf = _idf(set().union(conteo, *(terminos for _, terminos in candidatas)))
+    vector_oferta = vector(conteo, idf)
+    puntuadas = (
+        (similitud(vector_oferta, vector(terminos, idf)), candidata_id)
+        for candidata_id, terminos in candidatas
+    )
+    return heapq.nlargest(K, (fila for fila in puntuadas if fila[0] > 0))
+
+
+def calcular_oferta(oferta):
+    """
+    Recalcular las similares de una oferta y ofrecerla como similar a sus vecinas.
+    Devuelve el número de similares guardadas.
+    """
+    mejores = vecinas(oferta)
+    with transaction.atomic():
+        # Sus apariciones en otras listas tienen la similitud vieja
+        cambiadas = set(OfertaSimilar.objects.filter(similar_id=oferta.pk).values_list('oferta_id', flat=True))
+        OfertaSimilar.objects.filter(Q(oferta_id=oferta.pk) | Q(similar_id=oferta.pk)).delete()
+        OfertaSimilar.objects.bulk_create([
+            OfertaSimilar(oferta_id=oferta.pk, similar_id=similar_id, puntuacion=puntuacion)
+            for puntuacion, similar_id in mejores
+        ])
+        cambiadas |= _ofrecer(oferta.pk, mejores)
+        _marcar(cambiadas | {oferta.pk})
+    return len(mejores)
+
+
+def _marcar(ids):
+    """Registrar que cambió la lista de similares de estas ofertas"""
+    if ids:
+        OfertaTrabajo.objects.filter(pk__in=ids).update(fecha_similares=timezone.now())
+
+
+def _ofrecer(oferta_id, mejores):
+    """Agregar la oferta a la lista de cada vecina si mejora su peor similar; devuelve las vecinas que cambiaron"""
+    ids = [similar_id for _, similar_id in mejores]
+    guardadas = defaultdict(list)
+    for pk, vecina_id, puntuacion in OfertaSimilar.objects.filter(oferta_id__in=ids).values_list(
+        'pk', 'oferta_id', 'puntuacion'
+    ):
+        guardadas[vecina_id].append((puntuacion, pk))
+
+    nuevas = []
+    sobrantes = []
+    for puntuacion, vecina_id in mejores:
+        filas = guardadas[vecina_id]
+        if len(filas) >= K:
+            peor = min(filas)
+            if puntuacion <= peor[0]:
+                continue
+            sobrantes.append(peor[1])
+        nuevas.append(OfertaSimilar(oferta_id=vecina_id, similar_id=oferta_id, puntuacion=puntuacion))
+
+    if sobrantes:
+        OfertaSimilar.objects.filter(pk__in=sobrantes).delete()
+    OfertaSimilar.objects.bulk_create(nuevas)
+    return {nueva.oferta_id for nueva in nuevas}
+
+
+def retirar_ofertas(ids):
+    """Quitar ofertas que dejaron de estar activas, como origen y como similar"""
+    with transaction.atomic():
+        cambiadas = set(OfertaSimilar.objects.filter(similar_id__in=ids).values_list('oferta_id', flat=True))
+        OfertaSimilar.objects.filter(Q(oferta_id__in=ids) | Q(similar_id__in=ids)).delete()
+        _marcar(cambiadas | set(ids))
+
+
+def obtener(oferta, cantidad=4):
+    """Ofertas similares para el detalle (solo lee lo precalculado)"""
+    similares = OfertaSimilar.objects.filter(
+        oferta=oferta,
+        similar__estado='activa',
+        similar__aprobada_admin=True,
+    ).select_related('similar__empresa', 'similar__categoria').order_by('-puntuacion')
+    return [fila.similar for fila in similares[:cantidad]]
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+# Caché del HTML de las tarjetas de ofertas
+# Inicio, el listado, las recomendaciones del dashboard y las similares del
+# detalle muestran tarjetas que formatean salario, badges y get_*_display. Esa
+# parte se renderiza una vez y se guarda en caché con una clave que incluye la
+# fecha_actualizacion de la oferta, de su empresa y de su categoría: cualquier
+# cambio genera otra clave, así que no hace falta invalidar nada (las entradas
+# viejas caducan solas). Cada página pide todas sus tarjetas con un solo
+# get_many y renderiza solo las que faltan.
+#
+# Lo que cambia sin tocar fecha_actualizacion (vistas, "hace X días") queda
+# fuera del fragmento y se renderiza en la página.
+#
+# Las tarjetas usan su propio alias de caché (TARJETAS_CACHE), dimensionado
+# para el catálogo en settings.CACHES, así no desalojan las claves de 'default'.
+
+TTL = getattr(settings, 'TARJETAS_TTL', 60 * 60 * 24)
+ALIAS = getattr(settings, 'TARJETAS_CACHE', 'default')
+
+# Subir al cambiar las plantillas de tarjetas, así no se sirve HTML viejo
+VERSION = 1
+
+VARIANTES = {
+    'portada': 'MyWebApps/tarjetas/portada.html',
+    'listado': 'MyWebApps/tarjetas/listado.html',
+    'recomendada': 'MyWebApps/tarjetas/recomendada.html',
+    'similar': 'MyWebApps/tarjetas/similar.html',
+}
+
+
+def _marca(fecha):
+    return int(fecha.timestamp() * 1000000) if fecha else 0
+
+
+def clave(oferta, variante):
+    """Clave de caché de la tarjeta; cambia con la oferta, su empresa o su categoría"""
+    categoria = oferta.categoria if oferta.categoria_id else None
+    return (
+        f'tarjeta:{VERSION}:{variante}:{oferta.pk}:{_marca(oferta.fecha_actualizacion)}:'
+        f'{_marca(oferta.empresa.fecha_actualizacion)}:{_marca(categoria and categoria.fecha_actualizacion)}'
+    )
+
+
+def preparar(ofertas, variante):
+    """
+    Guardar en oferta.tarjeta el HTML de cada tarjeta, desde caché o renderizado.
+    Las ofertas deben venir con select_related('empresa', 'categoria').
+    """
+    ofertas = list(ofertas)
+    claves = {oferta.pk: clave(oferta, variante) for oferta in ofertas}
+    cache = caches[ALIAS]
+    guardadas = cache.get_many(claves.values())
+
+    nuevas = {}
+    for oferta in ofertas:
+        html = guardadas.get(claves[oferta.pk])
+        if html is None:
+            html = nuevas[claves[oferta.pk]] = render_to_string(VARIANTES[variante], {'oferta': oferta})
+        oferta.tarjeta = mark_safe(html)
+
+    if nuevas:
+        cache.set_many(nuevas, TTL)
+    return ofertas
@@ -1,3 +1,820 @@
-from django.test import TestCase
+import csv
+import gc
+import io
+import json
+import math
+import os
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from pathlib import Path
 
-# Create your tests here.
+from django.core import signing
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Count
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings, tag
+from django.urls import reverse
+from django.utils import timezone
+
+from . import (
+    alertas, concurrencia, condicional, expiracion, generador, importacion, match, notificaciones, paginacion,
+    portada, recomendaciones, similares, transiciones, urls, vistas
+)
+from .models import (
+    BusquedaGuardada, Categoria, CoincidenciaAlerta, Empresa, EventoNotificacion, MetricaDiariaOferta, Notificacion, OfertaTrabajo,
+    PerfilPostulante, Postulacion, Recomendacion, Usuario,
+)
+
+# Benchmarks de las vistas con presupuestos de consultas, filas y tiempo
+# Cada ruta de MyWebApps/urls.py se pide varias veces sobre un conjunto de datos
+# generado con generar_datos (semilla fija) a distintas escalas. Por cada ruta se
+# registran el número de consultas SQL, las filas que devuelven esas consultas y
+# los percentiles del tiempo de respuesta, y se comparan con los presupuestos de
+# presupuestos_rendimiento.json. Una vista que empieza a hacer una consulta por
+# fila (N+1) supera su presupuesto de consultas en la escala grande y el test
+# falla.
+#
+# Cada petición corre dentro de una transacción que se revierte, así las que
+# modifican datos (postular, cambiar estados...) se miden siempre sobre los
+# mismos datos.
+#
+# Los presupuestos de consultas y filas se comprueban siempre. Los de tiempo
+# dependen de la máquina, así que solo se comprueban con BENCHMARK_TIEMPOS=1
+# (en una máquina dedicada); sin esa variable los tiempos igual se miden y se
+# reportan.
+#
+# Al final del archivo (COMPORTAMIENTO) están las pruebas de la lógica de cada
+# módulo, sobre unos pocos objetos creados a mano.
+#
+#   python manage.py test MyWebApps                          # incluye los benchmarks
+#   BENCHMARK_TIEMPOS=1 python manage.py test MyWebApps      # comprobar también los tiempos
+#   python manage.py test MyWebApps --exclude-tag rendimiento
+#   BENCHMARK_REPORTE=- python manage.py test MyWebApps      # imprimir las mediciones
+#   BENCHMARK_ACTUALIZAR=1 python manage.py test MyWebApps   # reescribir los presupuestos
+
+ARCHIVO_PRESUPUESTOS = Path(__file__).with_name('presupuestos_rendimiento.json')
+PRESUPUESTOS = json.loads(ARCHIVO_PRESUPUESTOS.read_text(encoding='utf-8'))
+
+REPETICIONES = int(os.environ.get('BENCHMARK_REPETICIONES', PRESUPUESTOS['repeticiones']))
+# Comprobar también los presupuestos de tiempo (p95_ms)
+TIEMPOS = bool(os.environ.get('BENCHMARK_TIEMPOS'))
+# Multiplica los presupuestos de tiempo (máquinas más lentas, CI compartido)
+TOLERANCIA_TIEMPO = float(os.environ.get('BENCHMARK_TOLERANCIA_TIEMPO', 1))
+ACTUALIZAR = bool(os.environ.get('BENCHMARK_ACTUALIZAR'))
+REPORTE = os.environ.get('BENCHMARK_REPORTE')
+
+# Sentencias de control de transacción que no cuentan como consultas de la vista
+CONTROL_TRANSACCION = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+# (nombre de la ruta, usuario, método, argumentos de la URL, datos del POST)
+# El usuario, los argumentos y los datos se resuelven con los datos generados
+CASOS = [
+    ('home', None, 'get', None, None),
+    ('ofertas_lista', None, 'get', None, None),
+    ('oferta_detalle', None, 'get', lambda d: [d['oferta_popular'].pk], None),
+    ('login', None, 'get', None, None),
+    ('register', None, 'get', None, None),
+    ('logout', 'postulante', 'get', None, None),
+    ('dashboard', 'postulante', 'get', None, None),
+    ('dashboard_empleador', 'empleador', 'get', None, None),
+    ('dashboard_postulante', 'postulante', 'get', None, None),
+    ('mis_ofertas', 'empleador', 'get', None, None),
+    ('crear_oferta', 'empleador', 'get', None, None),
+    ('postulaciones_oferta', 'empleador', 'get', lambda d: [d['oferta_empresa'].pk], None),
+    ('cambiar_estado_postulaciones', 'empleador', 'post', lambda d: [d['oferta_empresa'].pk],
+     lambda d: {'postulaciones': d['pendientes'], 'nuevo_estado': 'en_revision'}),
+    ('exportar_postulaciones', 'empleador', 'get', lambda d: [d['oferta_empresa'].pk], None),
+    ('exportar_postulaciones_empresa', 'empleador', 'get', None, None),
+    ('analiticas', 'empleador', 'get', None, None),
+    ('postular_oferta', 'postulante', 'post', lambda d: [d['oferta_nueva'].pk],
+     lambda d: {'carta_presentacion': 'Me interesa el puesto'}),
+    ('mis_postulaciones', 'postulante', 'get', None, None),
+    ('mis_busquedas', 'postulante', 'get', None, None),
+    ('guardar_busqueda', 'postulante', 'post', None,
+     lambda d: {'search': 'analista', 'modalidad': 'remoto'}),
+    ('eliminar_busqueda', 'postulante', 'post', lambda d: [d['busqueda'].pk], None),
+    ('notificaciones', 'postulante', 'get', None, None),
+    ('marcar_notificacion_leida', 'postulante', 'post', lambda d: [d['notificacion'].pk], None),
+    ('marcar_todas_leidas', 'postulante', 'post', None, None),
+    ('mi_perfil', 'postulante', 'get', None, None),
+    ('perfil_empresa', 'empleador', 'get', None, None),
+    ('perfil_postulante', 'postulante', 'get', None, None),
+    ('api_ofertas', None, 'get', None, None),
+    ('api_oferta', None, 'get', lambda d: [d['oferta_popular'].pk], None),
+    ('api_categorias', None, 'get', None, None),
+    ('api_empresas', None, 'get', None, None),
+    ('api_empresa', None, 'get', lambda d: [d['empresa'].pk], None),
+    ('rendimiento', 'administrador', 'get', None, None),
+]
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano"""
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+class Captura:
+    """execute_wrapper que guarda las sentencias SQL ejecutadas"""
+
+    def __init__(self):
+        self.sentencias = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(CONTROL_TRANSACCION):
+            self.sentencias.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def filas(self):
+        """Filas que devolvieron las consultas SELECT capturadas"""
+        total = 0
+        with connection.cursor() as cursor:
+            for sql, params in self.sentencias:
+                if sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                    cursor.execute(f'SELECT COUNT(*) FROM ({sql}) AS consulta', params)
+                    total += cursor.fetchone()[0]
+        return total
+
+
+class RendimientoBase:
+    """Mide todas las rutas sobre un conjunto de datos de ESCALA postulantes"""
+
+    ESCALA = None
+    mediciones = None
+
+    @classmethod
+    def setUpTestData(cls):
+        generador.Generador(cls.ESCALA, bloque=1000).generar()
+
+        # La empresa con más ofertas y el postulante con más postulaciones: ahí se notan los N+1
+        empresa = Empresa.objects.annotate(n=Count('ofertas')).order_by('-n', 'pk').first()
+        oferta_empresa = empresa.ofertas.order_by('-postulaciones_total', 'pk').first()
+        perfil = PerfilPostulante.objects.annotate(n=Count('postulaciones')).order_by('-n', 'pk').first()
+        activas = OfertaTrabajo.objects.filter(estado='activa', aprobada_admin=True).order_by('pk')
+        oferta_nueva = activas.exclude(pk__in=perfil.postulaciones.values('oferta_id')).first()
+        if oferta_nueva is None:
+            # En la escala chica puede haber postulado a todas: se libera una
+            oferta_nueva = activas.first()
+            Postulacion.objects.filter(postulante=perfil, oferta=oferta_nueva).delete()
+        cls.datos = {
+            'empresa': empresa,
+            'empleador': empresa.usuario,
+            'postulante': perfil.usuario,
+            'administrador': Usuario.objects.create_superuser('admin@benchmark.test'),
+            'oferta_empresa': oferta_empresa,
+            'oferta_popular': OfertaTrabajo.objects.filter(
+                estado='activa', aprobada_admin=True
+            ).order_by('-vistas', 'pk').first(),
+            'oferta_nueva': oferta_nueva,
+            'pendientes': [str(pk) for pk in Postulacion.objects.filter(
+                oferta=oferta_empresa, estado='pendiente'
+            ).values_list('pk', flat=True)[:50]],
+            'busqueda': BusquedaGuardada.objects.create(usuario=perfil.usuario, texto='desarrollador'),
+            'notificacion': Notificacion.objects.create(
+                usuario=perfil.usuario, tipo='sistema', titulo='Aviso', mensaje='Mensaje de prueba'
+            ),
+        }
+        # El detalle y el dashboard solo leen similares y recomendaciones: las
+        # de la oferta y el postulante medidos se calculan acá
+        similares.calcular_oferta(cls.datos['oferta_popular'])
+        recomendaciones.calcular_perfil(perfil)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.mediciones = {}
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def medir(self, nombre, usuario, metodo, argumentos, datos):
+        """Pedir la ruta REPETICIONES veces; devuelve (tiempos en ms, consultas, filas)"""
+        url = reverse(nombre, args=argumentos(self.datos) if argumentos else None)
+        cuerpo = datos(self.datos) if datos else {}
+        tiempos, consultas, filas = [], [], []
+        for _ in range(REPETICIONES):
+            with transaction.atomic():
+                if usuario:
+                    self.client.force_login(self.datos[usuario])
+                # Sin vistas pendientes, el volcado diferido no cae dentro de la medición
+                vistas.contador.volcar()
+                # Como timeit: una recolección completa del GC (decenas de ms con los
+                # datos de la escala grande) no cae al azar dentro de una ruta
+                gc.collect()
+                gc.disable()
+                captura = Captura()
+                try:
+                    with connection.execute_wrapper(captura):
+                        inicio = time.perf_counter()
+                        respuesta = getattr(self.client, metodo)(url, cuerpo)
+                        if respuesta.streaming:
+                            b''.join(respuesta.streaming_content)
+                        tiempos.append((time.perf_counter() - inicio) * 1000)
+                finally:
+                    gc.enable()
+                self.assertLess(respuesta.status_code, 400, f'{nombre} respondió {respuesta.status_code}')
+                consultas.append(len(captura.sentencias))
+                filas.append(captura.filas())
+                transaction.set_rollback(True)
+            self.client.logout()
+        return tiempos, max(consultas), max(filas)
+
+    def test_todas_las_rutas_tienen_benchmark(self):
+        rutas = {patron.name for patron in urls.urlpatterns}
+        self.assertEqual(rutas, {nombre for nombre, *_ in CASOS})
+
+    def test_presupuestos(self):
+        presupuestos = PRESUPUESTOS['rutas'].get(str(self.ESCALA), {})
+        excedidos = []
+        for nombre, usuario, metodo, argumentos, datos in CASOS:
+            tiempos, consultas, filas = self.medir(nombre, usuario, metodo, argumentos, datos)
+            medicion = {
+                'consultas': consultas,
+                'filas': filas,
+                'p50_ms': round(percentil(tiempos, 50), 1),
+                'p95_ms': round(percentil(tiempos, 95), 1),
+            }
+            self.mediciones[nombre] = medicion
+
+            presupuesto = presupuestos.get(nombre)
+            if presupuesto is None:
+                excedidos.append(f'{nombre}: sin presupuesto para la escala {self.ESCALA}')
+                continue
+            limites = [('consultas', presupuesto['consultas']), ('filas', presupuesto['filas'])]
+            if TIEMPOS:
+                limites.append(('p95_ms', presupuesto['p95_ms'] * TOLERANCIA_TIEMPO))
+            for clave, limite in limites:
+                if medicion[clave] > limite:
+                    excedidos.append(f'{nombre}: {clave} = {medicion[clave]} (presupuesto {limite:g})')
+
+        if not ACTUALIZAR:
+            self.assertFalse(excedidos, f'Escala {self.ESCALA}:\n' + '\n'.join(excedidos))
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.mediciones:
+            if REPORTE:
+                cls._reportar()
+            if ACTUALIZAR:
+                cls._actualizar_presupuestos()
+        super().tearDownClass()
+
+    @classmethod
+    def _reportar(cls):
+        lineas = [f'\nEscala {cls.ESCALA} postulantes ({REPETICIONES} repeticiones)',
+                  f'{"ruta":<32}{"consultas":>10}{"filas":>10}{"p50 ms":>10}{"p95 ms":>10}']
+        for nombre, medicion in cls.mediciones.items():
+            lineas.append(f'{nombre:<32}{medicion["consultas"]:>10}{medicion["filas"]:>10}'
+                          f'{medicion["p50_ms"]:>10}{medicion["p95_ms"]:>10}')
+        texto = '\n'.join(lineas) + '\n'
+        if REPORTE == '-':
+            print(texto)
+        else:
+            with open(REPORTE, 'a', encoding='utf-8') as archivo:
+                archivo.write(texto)
+
+    @classmethod
+    def _actualizar_presupuestos(cls):
+        """Presupuestos a partir de las mediciones: consultas exactas, margen en filas y tiempo"""
+        presupuestos = json.loads(ARCHIVO_PRESUPUESTOS.read_text(encoding='utf-8'))
+        presupuestos['rutas'][str(cls.ESCALA)] = {
+            nombre: {
+                'consultas': medicion['consultas'],
+                'filas': math.ceil(medicion['filas'] * 1.1),
+                'p95_ms': max(50, math.ceil(medicion['p95_ms'] * 3 / 10) * 10),
+            }
+            for nombre, medicion in cls.mediciones.items()
+        }
+        ARCHIVO_PRESUPUESTOS.write_text(
+            json.dumps(presupuestos, indent=2, ensure_ascii=False) + '\n', encoding='utf-8'
+        )
+
+
+@tag('rendimiento')
+class RendimientoEscalaChicaTests(RendimientoBase, TestCase):
+    ESCALA = PRESUPUESTOS['escalas'][0]
+
+
+@tag('rendimiento')
+class RendimientoEscalaGrandeTests(RendimientoBase, TestCase):
+    ESCALA = PRESUPUESTOS['escalas'][1]
+
+
+class MedicionTests(TestCase):
+    """Las herramientas de medición de los benchmarks"""
+
+    def test_percentil(self):
+        valores = [5, 1, 4, 2, 3, 10, 9, 8, 7, 6]
+        self.assertEqual(percentil(valores, 50), 5)
+        self.assertEqual(percentil(valores, 95), 10)
+        self.assertEqual(percentil(valores, 0), 1)
+        self.assertEqual(percentil([7], 95), 7)
+
+    def test_captura_ignora_el_control_de_transaccion(self):
+        Categoria.objects.bulk_create([Categoria(nombre=nombre) for nombre in ('Ventas', 'Salud', 'Legal')])
+        captura = Captura()
+        with connection.execute_wrapper(captura):
+            with transaction.atomic():
+                list(Categoria.objects.filter(nombre__in=['Ventas', 'Salud']))
+                Categoria.objects.filter(nombre='Legal').exists()
+        self.assertEqual(len(captura.sentencias), 2)
+        self.assertEqual(captura.filas(), 3)
+
+
+# ==================== COMPORTAMIENTO ====================
+
+def crear_postulante(email='postulante@prueba.test', **campos):
+    usuario = Usuario.objects.create_user(email, '1234', first_name='Ana', last_name='Pérez')
+    return PerfilPostulante.objects.create(usuario=usuario, **campos)
+
+
+def crear_empresa(email='empresa@prueba.test'):
+    usuario = Usuario.objects.create_user(email, '1234', tipo_usuario='empleador', first_name='Luis', last_name='Soto')
+    return Empresa.objects.create(usuario=usuario, nombre_empresa=f'Empresa {email}')
+
+
+def crear_oferta(empresa, **campos):
+    valores = {
+        'titulo': 'Desarrollador Python',
+        'descripcion': 'Desarrollo de servicios web',
+        'requisitos': 'Python, Django',
+        'modalidad': 'presencial',
+        'tipo_contrato': 'tiempo_completo',
+        'nivel_experiencia': 'junior',
+        'ubicacion': 'Lima',
+        'estado': 'activa',
+        'aprobada_admin': True,
+        **campos,
+    }
+    return OfertaTrabajo.objects.create(empresa=empresa, **valores)
+
+
+class RecomendacionesTests(TestCase):
+    def setUp(self):
+        self.perfil = crear_postulante()
+        self.oferta = crear_oferta(
+            crear_empresa(), categoria=Categoria.objects.create(nombre='Tecnología'),
+            requisitos='Python, Django y 3 años de experiencia',
+        )
+
+    def test_guardar_perfil_lo_deja_pendiente_sin_calcular(self):
+        recomendaciones.calcular_perfil(self.perfil)
+        self.client.force_login(self.perfil.usuario)
+        # Con los hooks de on_commit ejecutados, como en una petición real
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.client.post(reverse('perfil_postulante'), {
+                'nivel_experiencia': 'junior', 'años_experiencia': '1', 'habilidades': 'Python, Django',
+                'ubicacion': 'Lima', 'salario_esperado': '2500', 'disponibilidad': 'inmediata',
+            })
+        self.assertEqual(respuesta.status_code, 302)
+        self.perfil.refresh_from_db()
+        self.assertIsNone(self.perfil.fecha_recomendaciones)
+        # Hasta que corre el comando se siguen mostrando las que tenía
+        self.assertEqual(recomendaciones.obtener(self.perfil), [self.oferta])
+
+    def test_comando_calcula_los_pendientes(self):
+        call_command('actualizar_recomendaciones', stdout=io.StringIO())
+        self.perfil.refresh_from_db()
+        self.assertIsNotNone(self.perfil.fecha_recomendaciones)
+        self.assertTrue(Recomendacion.objects.filter(perfil=self.perfil, oferta=self.oferta).exists())
+
+
+class MatchTests(TestCase):
+    def test_perfil_con_valores_de_formulario(self):
+        oferta = OfertaTrabajo(
+            titulo='Analista', descripcion='Datos', requisitos='SQL y 3 años de experiencia',
+            nivel_experiencia='junior', modalidad='presencial', salario_max=Decimal('3000'),
+        )
+        formulario = PerfilPostulante(
+            habilidades='SQL', nivel_experiencia='junior', años_experiencia='1', salario_esperado='2500',
+        )
+        guardado = PerfilPostulante(
+            habilidades='SQL', nivel_experiencia='junior', años_experiencia=1, salario_esperado=Decimal('2500'),
+        )
+        self.assertEqual(match.calcular_puntuacion(formulario, oferta), match.calcular_puntuacion(guardado, oferta))
+
+    def test_valores_invalidos_no_rompen_la_puntuacion(self):
+        oferta = OfertaTrabajo(titulo='Analista', descripcion='Datos', requisitos='3 años', salario_max=Decimal('3000'))
+        perfil = PerfilPostulante(años_experiencia='muchos', salario_esperado='abc')
+        datos = match.datos_perfil(perfil)
+        self.assertEqual((datos.años, datos.salario), (0, None))
+        self.assertGreaterEqual(match.calcular_puntuacion(perfil, oferta), 0)
+
+
+class GeneradorTests(TestCase):
+    def test_ofertas_activas_no_vencidas(self):
+        generador.Generador(50).generar()
+        self.assertTrue(OfertaTrabajo.objects.filter(estado='activa').exists())
+        self.assertFalse(expiracion.vencidas().exists())
+
+
+class TransicionesTests(TestCase):
+    def setUp(self):
+        self.empresa = crear_empresa()
+        self.oferta = crear_oferta(self.empresa)
+        self.pendiente = Postulacion.objects.create(oferta=self.oferta, postulante=crear_postulante('a@prueba.test'))
+        self.aceptada = Postulacion.objects.create(
+            oferta=self.oferta, postulante=crear_postulante('b@prueba.test'), estado='aceptado'
+        )
+
+    def test_cambio_en_bloque_omite_transiciones_no_permitidas(self):
+        ids = [self.pendiente.pk, self.aceptada.pk]
+        self.assertEqual(transiciones.cambiar_estado(self.oferta, ids, 'en_revision'), (1, 1))
+        self.pendiente.refresh_from_db()
+        self.aceptada.refresh_from_db()
+        self.assertEqual((self.pendiente.estado, self.aceptada.estado), ('en_revision', 'aceptado'))
+        self.assertIsNotNone(self.pendiente.fecha_cambio_estado)
+        self.oferta.refresh_from_db()
+        self.assertEqual((self.oferta.postulaciones_pendiente, self.oferta.postulaciones_en_revision), (0, 1))
+
+    def test_estado_desconocido(self):
+        with self.assertRaises(ValueError):
+            transiciones.cambiar_estado(self.oferta, [self.pendiente.pk], 'contratado')
+
+    def test_solo_las_que_pueden_cambiar_tienen_casilla(self):
+        self.client.force_login(self.empresa.usuario)
+        respuesta = self.client.get(reverse('postulaciones_oferta', args=[self.oferta.pk]))
+        self.assertContains(respuesta, f'name="postulaciones" value="{self.pendiente.pk}"')
+        self.assertNotContains(respuesta, f'name="postulaciones" value="{self.aceptada.pk}"')
+
+
+class PortadaTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_invalida_al_confirmar_la_transaccion(self):
+        with self.captureOnCommitCallbacks(execute=True) as hooks:
+            Categoria.objects.create(nombre='Diseño')
+            self.assertIsNone(caches['default'].get(portada.CLAVE_GENERACION))
+        self.assertTrue(hooks)
+        self.assertEqual(caches['default'].get(portada.CLAVE_GENERACION), 1)
+
+
+class ExportacionTests(TestCase):
+    def test_csv_neutraliza_formulas(self):
+        empresa = crear_empresa()
+        oferta = crear_oferta(empresa)
+        cartas = ['=HYPERLINK("http://ataque.test","clic")', '\t=1+1', '\r@SUM(A1)', 'Hola']
+        for i, carta in enumerate(cartas):
+            Postulacion.objects.create(
+                oferta=oferta, postulante=crear_postulante(f'p{i}@prueba.test'), carta_presentacion=carta
+            )
+        self.client.force_login(empresa.usuario)
+        respuesta = self.client.get(reverse('exportar_postulaciones', args=[oferta.pk]), {'formato': 'csv'})
+        contenido = b''.join(respuesta.streaming_content).decode('utf-8-sig')
+        columnas = [fila for fila in csv.DictReader(io.StringIO(contenido))]
+        exportadas = {fila['carta_presentacion'] for fila in columnas}
+        self.assertEqual(exportadas, {"'" + carta for carta in cartas[:3]} | {'Hola'})
+
+
+class PaginacionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        empresa = crear_empresa()
+        # Salarios repetidos y nulos: desempate por id y tramo de nulos al final
+        for i, salario in enumerate([1000, 2000, 2000, None, 3000, None, 2000]):
+            crear_oferta(empresa, titulo=f'Oferta {i}', salario_min=salario)
+
+    def recorrer(self, paginador):
+        paginas, token = [], None
+        while True:
+            pagina = paginador.get_page(token)
+            paginas.append([oferta.pk for oferta in pagina])
+            if not pagina.has_next:
+                return paginas
+            token = pagina.cursor_siguiente
+
+    def test_recorre_todo_en_orden_con_nulos_al_final(self):
+        ofertas = OfertaTrabajo.objects.all()
+        for orden in ('salario_min', '-salario_min'):
+            paginas = self.recorrer(paginacion.PaginadorCursor(ofertas, orden, por_pagina=2))
+            esperado = list(ofertas.filter(salario_min__isnull=False).order_by(
+                orden, '-pk' if orden.startswith('-') else 'pk'
+            ).values_list('pk', flat=True)) + list(ofertas.filter(salario_min__isnull=True).order_by(
+                '-pk' if orden.startswith('-') else 'pk'
+            ).values_list('pk', flat=True))
+            self.assertEqual([pk for pagina in paginas for pk in pagina], esperado)
+
+    def test_volver_a_la_pagina_anterior(self):
+        paginador = paginacion.PaginadorCursor(OfertaTrabajo.objects.all(), 'salario_min', por_pagina=2)
+        primera = paginador.get_page()
+        segunda = paginador.get_page(primera.cursor_siguiente)
+        tercera = paginador.get_page(segunda.cursor_siguiente)
+        anterior = paginador.get_page(tercera.cursor_anterior)
+        self.assertEqual(list(anterior), list(segunda))
+        self.assertTrue(anterior.has_previous)
+
+    def test_cursor_alterado_o_de_otro_orden_vuelve_al_inicio(self):
+        paginador = paginacion.PaginadorCursor(OfertaTrabajo.objects.all(), 'salario_min', por_pagina=2)
+        primera = paginador.get_page()
+        token = primera.cursor_siguiente
+        otro_orden = paginacion.PaginadorCursor(OfertaTrabajo.objects.all(), 'fecha_publicacion', por_pagina=2)
+        for invalido in (token[:-2] + 'xx', 'basura', otro_orden.get_page().cursor_siguiente):
+            pagina = paginador.get_page(invalido)
+            self.assertEqual(list(pagina), list(primera))
+            self.assertFalse(pagina.has_previous)
+
+    def test_cursor_fuera_de_rango(self):
+        paginador = paginacion.PaginadorCursor(OfertaTrabajo.objects.all(), 'salario_min', por_pagina=2)
+        token = signing.dumps({'c': 'salario_min', 'v': '999999.00', 'id': 10 ** 9, 'd': 's'},
+                              salt=paginacion.SALT_CURSOR, compress=True)
+        pagina = paginador.get_page(token)
+        # Más allá del último salario solo queda el tramo de nulos
+        self.assertEqual(len(pagina), 2)
+        self.assertTrue(all(oferta.salario_min is None for oferta in pagina))
+        self.assertFalse(pagina.has_next)
+
+    def test_listado_con_cursor_invalido(self):
+        respuesta = self.client.get(reverse('ofertas_lista'), {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(respuesta.status_code, 200)
+
+
+class VistasTests(TestCase):
+    def setUp(self):
+        caches['vistas'].clear()
+        empresa = crear_empresa()
+        self.oferta = crear_oferta(empresa)
+        self.otra = crear_oferta(empresa, titulo='Otra')
+
+    def test_volcado_en_lote(self):
+        contador = vistas.ContadorVistas(intervalo=3600, maximo_pendientes=3)
+        contador.registrar(self.oferta.pk)
+        contador.registrar(self.oferta.pk)
+        self.assertFalse(contador.debe_volcar())
+        contador.registrar(self.otra.pk)
+        self.assertTrue(contador.debe_volcar())
+
+        self.assertEqual(contador.volcar(), 2)
+        self.oferta.refresh_from_db()
+        self.otra.refresh_from_db()
+        self.assertEqual((self.oferta.vistas, self.otra.vistas), (2, 1))
+        self.assertEqual(contador.pendientes(self.oferta.pk), 0)
+        self.assertEqual(MetricaDiariaOferta.objects.get(oferta=self.oferta).vistas, 2)
+        self.assertEqual(contador.volcar(), 0)
+
+    def test_un_error_devuelve_las_vistas_al_buffer(self):
+        contador = vistas.ContadorVistas()
+        contador.registrar(self.oferta.pk, 5)
+        with mock.patch('MyWebApps.metricas.sumar_vistas', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                contador.volcar()
+        self.assertEqual(contador.pendientes(self.oferta.pk), 5)
+        self.oferta.refresh_from_db()
+        self.assertEqual(self.oferta.vistas, 0)
+
+    @override_settings(VISTAS_VENTANA_DEDUPE=60)
+    def test_una_vista_por_visitante_en_la_ventana(self):
+        fabrica = RequestFactory()
+        with mock.patch.object(vistas, 'contador', vistas.ContadorVistas()) as contador:
+            self.assertTrue(vistas.registrar_vista(fabrica.get('/', REMOTE_ADDR='10.0.0.1'), self.oferta))
+            self.assertFalse(vistas.registrar_vista(fabrica.get('/', REMOTE_ADDR='10.0.0.1'), self.oferta))
+            self.assertTrue(vistas.registrar_vista(fabrica.get('/', REMOTE_ADDR='10.0.0.2'), self.oferta))
+            self.assertTrue(vistas.registrar_vista(fabrica.get('/', REMOTE_ADDR='10.0.0.1'), self.otra))
+            self.assertEqual((contador.pendientes(self.oferta.pk), contador.pendientes(self.otra.pk)), (2, 1))
+
+
+class NotificacionesTests(TestCase):
+    def setUp(self):
+        self.empresa = crear_empresa()
+        self.oferta = crear_oferta(self.empresa)
+        self.postulacion = Postulacion.objects.create(oferta=self.oferta, postulante=crear_postulante())
+
+    def test_la_misma_clave_no_encola_dos_eventos(self):
+        primero = notificaciones.encolar('postulacion', 'clave:1', postulacion_id=self.postulacion.pk)
+        segundo = notificaciones.encolar('postulacion', 'clave:1', postulacion_id=self.postulacion.pk)
+        self.assertEqual(primero.pk, segundo.pk)
+        notificaciones.encolar_varios('postulacion', [('clave:1', {}), ('clave:2', {})])
+        self.assertEqual(EventoNotificacion.objects.filter(clave__startswith='clave:').count(), 2)
+
+    def test_postular_avisa_al_empleador_una_sola_vez(self):
+        # Dos eventos: la oferta publicada (al postulante) y la postulación (al empleador)
+        self.assertEqual(notificaciones.procesar_pendientes(), (2, 2))
+        evento = EventoNotificacion.objects.get(clave=f'postulacion:{self.postulacion.pk}')
+        self.assertEqual(evento.estado, 'procesado')
+
+        # Un reintento desde el principio no duplica ni vuelve a sumar al contador
+        EventoNotificacion.objects.filter(pk=evento.pk).update(estado='pendiente', cursor=0)
+        self.assertEqual(notificaciones.procesar_pendientes(), (1, 0))
+        usuario = Usuario.objects.get(pk=self.empresa.usuario_id)
+        self.assertEqual(Notificacion.objects.filter(usuario=usuario).count(), 1)
+        self.assertEqual(usuario.notificaciones_no_leidas, 1)
+
+    def test_marcar_leida_descuenta(self):
+        notificaciones.procesar_pendientes()
+        usuario = Usuario.objects.get(pk=self.empresa.usuario_id)
+        notificacion = Notificacion.objects.get(usuario=usuario)
+        notificaciones.marcar_leida(usuario, notificacion.pk)
+        notificaciones.marcar_leida(usuario, notificacion.pk)
+        usuario.refresh_from_db()
+        self.assertEqual(usuario.notificaciones_no_leidas, 0)
+
+
+class AlertasTests(TestCase):
+    def setUp(self):
+        self.empresa = crear_empresa()
+        self.oferta = crear_oferta(
+            self.empresa, titulo='Desarrollador Backend', requisitos='Python, Django',
+            modalidad='remoto', ubicacion='Lima, Perú',
+        )
+
+    def buscar(self, **campos):
+        usuario = crear_postulante(f'alerta{BusquedaGuardada.objects.count()}@prueba.test').usuario
+        return BusquedaGuardada.objects.create(usuario=usuario, **campos)
+
+    def test_coincidencias(self):
+        coinciden = [
+            self.buscar(texto='desarr pyth'),
+            self.buscar(texto='Désarrollador', modalidad='remoto'),
+            self.buscar(ubicacion='lima'),
+            self.buscar(),
+        ]
+        no_coinciden = [
+            self.buscar(texto='contador'),
+            self.buscar(texto='python', modalidad='presencial'),
+            self.buscar(texto='python', ubicacion='Cusco'),
+            self.buscar(texto='python', activa=False),
+        ]
+        encontradas = set(alertas.buscar_coincidencias(self.oferta))
+        self.assertEqual(encontradas, set(coinciden))
+        self.assertFalse(encontradas & set(no_coinciden))
+
+    def test_destinatarios_de_una_oferta_nueva(self):
+        interesado = self.buscar(texto='django').usuario
+        otro = self.buscar(texto='contador').usuario
+        sin_busquedas = crear_postulante('sin@prueba.test').usuario
+        evento = notificaciones.encolar('nueva_oferta', 'prueba:nueva_oferta', oferta_id=self.oferta.pk)
+        notificaciones.procesar_evento(evento)
+        notificados = set(Notificacion.objects.filter(evento=evento).values_list('usuario_id', flat=True))
+        self.assertEqual(notificados, {interesado.pk, sin_busquedas.pk})
+        self.assertEqual(
+            set(CoincidenciaAlerta.objects.filter(oferta=self.oferta).values_list('usuario_id', flat=True)),
+            {interesado.pk},
+        )
+        self.assertNotIn(otro.pk, notificados)
+
+
+class ImportacionTests(TestCase):
+    def setUp(self):
+        self.empresa = crear_empresa()
+
+    def fila(self, **campos):
+        return {
+            'titulo': 'Analista de Datos', 'descripcion': 'Reportes', 'requisitos': 'SQL',
+            'modalidad': 'Remoto', 'tipo_contrato': 'tiempo_completo', 'nivel_experiencia': 'junior',
+            'id_externo': 'EXT-1', **campos,
+        }
+
+    def importar(self, *filas):
+        return importacion.importar(enumerate(filas, start=2), empresa_defecto=self.empresa.pk, publicar=True)
+
+    def test_reimportar_actualiza_sin_duplicar(self):
+        resultado = self.importar(self.fila(), self.fila(id_externo=''))
+        self.assertEqual((resultado['creadas'], resultado['actualizadas']), (2, 0))
+
+        resultado = self.importar(self.fila(titulo='Analista de Datos Senior', modalidad='hibrido'))
+        self.assertEqual((resultado['creadas'], resultado['actualizadas']), (0, 1))
+        oferta = OfertaTrabajo.objects.get(empresa=self.empresa, id_externo='EXT-1')
+        self.assertEqual((oferta.titulo, oferta.modalidad), ('Analista de Datos Senior', 'hibrido'))
+        self.assertEqual(OfertaTrabajo.objects.filter(empresa=self.empresa).count(), 2)
+
+    def test_filas_invalidas_se_reportan(self):
+        resultado = self.importar(
+            self.fila(),
+            self.fila(id_externo='EXT-2', titulo=''),
+            self.fila(id_externo='EXT-3', modalidad='a veces'),
+            self.fila(id_externo='EXT-4', salario_min='5000', salario_max='3000'),
+            ValueError('JSON inválido'),
+        )
+        self.assertEqual((resultado['leidas'], resultado['creadas']), (5, 1))
+        self.assertEqual([linea for linea, _ in resultado['errores']], [3, 4, 5, 6])
+        self.assertIn('titulo', resultado['errores'][0][1])
+        self.assertEqual(OfertaTrabajo.objects.filter(empresa=self.empresa).count(), 1)
+
+    def test_actualizar_vuelve_a_puntuar_las_postulaciones_abiertas(self):
+        self.importar(self.fila())
+        oferta = OfertaTrabajo.objects.get(empresa=self.empresa, id_externo='EXT-1')
+        abierta = Postulacion.objects.create(oferta=oferta, postulante=crear_postulante(habilidades='SQL, Python'))
+        cerrada = Postulacion.objects.create(
+            oferta=oferta, postulante=crear_postulante('otro@prueba.test', habilidades='SQL, Python'),
+        )
+        Postulacion.objects.filter(pk=cerrada.pk).update(estado='rechazado')
+        Postulacion.objects.update(puntuacion_match=0)
+
+        self.importar(self.fila(requisitos='SQL, Python'))
+        oferta.refresh_from_db()
+        abierta.refresh_from_db()
+        cerrada.refresh_from_db()
+        self.assertEqual(abierta.puntuacion_match, match.calcular_puntuacion(abierta.postulante, oferta))
+        self.assertGreater(abierta.puntuacion_match, 0)
+        self.assertEqual(cerrada.puntuacion_match, 0)
+
+
+class CondicionalTests(TestCase):
+    def setUp(self):
+        self.oferta = crear_oferta(crear_empresa())
+        self.url = reverse('oferta_detalle', args=[self.oferta.pk])
+        # Un token con formato válido, si no el middleware lo reemplaza en la respuesta
+        self.client.cookies['csrftoken'] = 'a' * 32
+
+    def revalidar(self, url, respuesta):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+
+    def test_detalle_sin_cambios_responde_304_y_cuenta_la_vista(self):
+        respuesta = self.client.get(self.url)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn('Last-Modified', respuesta)
+        with mock.patch.object(vistas, 'registrar_vista') as registrar:
+            revalidada = self.revalidar(self.url, respuesta)
+        self.assertEqual(revalidada.status_code, 304)
+        self.assertEqual(revalidada['ETag'], respuesta['ETag'])
+        registrar.assert_called_once()
+
+    def test_detalle_cambia_con_la_oferta_y_sus_similares(self):
+        respuesta = self.client.get(self.url)
+        despues = timezone.now() + timedelta(seconds=1)
+        OfertaTrabajo.objects.filter(pk=self.oferta.pk).update(fecha_actualizacion=despues)
+        nueva = self.revalidar(self.url, respuesta)
+        self.assertEqual(nueva.status_code, 200)
+
+        OfertaTrabajo.objects.filter(pk=self.oferta.pk).update(fecha_similares=despues)
+        self.assertEqual(self.revalidar(self.url, nueva).status_code, 200)
+
+    def test_cambio_de_cookie_csrf_genera_la_pagina(self):
+        respuesta = self.client.get(self.url)
+        self.client.cookies['csrftoken'] = 'b' * 32
+        self.assertEqual(self.revalidar(self.url, respuesta).status_code, 200)
+
+    def test_usuario_con_sesion(self):
+        usuario = crear_postulante().usuario
+        self.client.force_login(usuario)
+        respuesta = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', respuesta)
+        self.assertIn('private', respuesta['Cache-Control'])
+        self.assertEqual(self.revalidar(self.url, respuesta).status_code, 304)
+
+        # Tras salir y volver a entrar la sesión es otra y la copia anterior no vale
+        self.client.logout()
+        self.client.cookies['csrftoken'] = 'a' * 32
+        self.client.force_login(usuario)
+        self.assertEqual(self.revalidar(self.url, respuesta).status_code, 200)
+
+    def test_listado_sin_cambios_responde_304(self):
+        url = reverse('ofertas_lista')
+        respuesta = self.client.get(url, {'modalidad': 'presencial'})
+        self.assertEqual(respuesta.status_code, 200)
+        revalidada = self.client.get(url, {'modalidad': 'presencial'}, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(revalidada.status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=respuesta['ETag']).status_code, 200)
+
+        crear_oferta(self.oferta.empresa, titulo='Otra')
+        self.assertEqual(
+            self.client.get(url, {'modalidad': 'presencial'}, HTTP_IF_NONE_MATCH=respuesta['ETag']).status_code, 200,
+        )
+
+
+class ConcurrenciaTests(TransactionTestCase):
+    """Sin la transacción de TestCase los dashboards consultan desde los hilos del pool"""
+
+    def setUp(self):
+        caches['tarjetas'].clear()
+        self.empresa = crear_empresa()
+        self.perfil = crear_postulante(habilidades='Python, Django')
+        oferta = crear_oferta(self.empresa)
+        crear_oferta(self.empresa, titulo='Otra', estado='pausada')
+        Postulacion.objects.create(oferta=oferta, postulante=self.perfil)
+
+    def pedir(self, usuario, ruta):
+        """Pedir la ruta anotando en qué hilos se cerraron las conexiones"""
+        hilos = []
+        cerrar = BaseDatabaseWrapper.close_if_unusable_or_obsolete
+
+        def cerrar_y_anotar(conexion):
+            hilos.append(threading.current_thread().name)
+            return cerrar(conexion)
+
+        self.client.force_login(usuario)
+        with mock.patch.object(concurrencia, 'HABILITADA', True), \
+                mock.patch.object(BaseDatabaseWrapper, 'close_if_unusable_or_obsolete', cerrar_y_anotar):
+            respuesta = self.client.get(reverse(ruta))
+        self.assertEqual(respuesta.status_code, 200)
+        # Cada una de las tres consultas del panel en un hilo del pool, que cierra su conexión
+        self.assertGreaterEqual(len(hilos), 3)
+        self.assertTrue(all(hilo.startswith('consultas') for hilo in hilos))
+        return respuesta
+
+    def test_dashboard_empleador(self):
+        respuesta = self.pedir(self.empresa.usuario, 'dashboard_empleador')
+        self.assertEqual(respuesta.context['stats']['total_ofertas'], 2)
+        self.assertEqual(respuesta.context['stats']['ofertas_activas'], 1)
+        self.assertEqual(len(respuesta.context['ultimas_postulaciones']), 1)
+
+    def test_dashboard_postulante(self):
+        respuesta = self.pedir(self.perfil.usuario, 'dashboard_postulante')
+        self.assertEqual(respuesta.context['stats']['total_postulaciones'], 1)
+        self.assertEqual(len(respuesta.context['ultimas_postulaciones']), 1)
@@ -0,0 +1,63 @@
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import contadores, metricas, notificaciones
+from .models import Postulacion
+
+# Cambios de estado de postulaciones en bloque
+# El empleador puede mover muchas postulaciones de una oferta a la vez: se leen
+# sus estados actuales (una consulta), se cambian con un solo UPDATE que también
+# fija fecha_cambio_estado, los contadores de la oferta y sus métricas del día
+# se ajustan con un UPDATE cada uno y se encola un único evento para avisar a los postulantes.
+# Solo cambian las postulaciones cuyo estado actual permite la transición
+# (Postulacion.TRANSICIONES_PERMITIDAS); el resto se omite.
+
+
+def estados_origen(estado_nuevo):
+    """Estados desde los que se puede pasar a estado_nuevo"""
+    return [
+        estado for estado, destinos in Postulacion.TRANSICIONES_PERMITIDAS.items()
+        if estado_nuevo in destinos
+    ]
+
+
+def estados_modificables():
+    """Estados desde los que una postulación todavía puede cambiar (los finales no)"""
+    return {estado for estado, destinos in Postulacion.TRANSICIONES_PERMITIDAS.items() if destinos}
+
+
+def cambiar_estado(oferta, ids, estado_nuevo):
+    """
+    Pasar las postulaciones `ids` de la oferta al estado indicado.
+    Devuelve (cambiadas, omitidas).
+    """
+    if estado_nuevo not in Postulacion.TRANSICIONES_PERMITIDAS:
+        raise ValueError(f'Estado desconocido: {estado_nuevo}')
+
+    ids = {int(pk) for pk in ids}
+    postulaciones = Postulacion.objects.filter(
+        oferta=oferta,
+        pk__in=ids,
+        estado__in=estados_origen(estado_nuevo),
+    )
+
+    with transaction.atomic():
+        filas = list(postulaciones.select_for_update().values_list('pk', 'estado'))
+        ahora = timezone.now()
+        cambiadas = postulaciones.update(estado=estado_nuevo, fecha_cambio_estado=ahora)
+        conteos = Counter(estado for _, estado in filas)
+        contadores.mover_conteos(oferta.pk, conteos, estado_nuevo)
+        metricas.registrar_transiciones(oferta.pk, conteos, estado_nuevo)
+        if filas:
+            # Un solo evento para todo el bloque; los avisos se crean en segundo plano
+            notificaciones.encolar(
+                'estado_postulacion',
+                f'estado_postulacion:oferta:{oferta.pk}:{estado_nuevo}:{ahora.isoformat()}',
+                oferta_id=oferta.pk,
+                postulaciones=[pk for pk, _ in filas],
+                estado=estado_nuevo,
+            )
+
+    return cambiadas, len(ids) - cambiadas
@@ -21,13 +21,37 @@ urlpatterns = [
     path('mis-ofertas/', views.mis_ofertas, name='mis_ofertas'),
     path('crear-oferta/', views.crear_oferta, name='crear_oferta'),
     path('ofertas/<int:oferta_id>/postulaciones/', views.postulaciones_oferta, name='postulaciones_oferta'),
+    path('ofertas/<int:oferta_id>/postulaciones/estado/', views.cambiar_estado_postulaciones, name='cambiar_estado_postulaciones'),
+    path('ofertas/<int:oferta_id>/postulaciones/exportar/', views.exportar_postulaciones, name='exportar_postulaciones'),
+    path('mis-ofertas/postulaciones/exportar/', views.exportar_postulaciones_empresa, name='exportar_postulaciones_empresa'),
+    path('mis-ofertas/analiticas/', views.analiticas, name='analiticas'),
 
     # Postulaciones (Postulante)
     path('postular/<int:oferta_id>/', views.postular_oferta, name='postular_oferta'),
     path('mis-postulaciones/', views.mis_postulaciones, name='mis_postulaciones'),
 
+    # Búsquedas guardadas (alertas)
+    path('busquedas/', views.mis_busquedas, name='mis_busquedas'),
+    path('busquedas/guardar/', views.guardar_busqueda, name='guardar_busqueda'),
+    path('busquedas/<int:busqueda_id>/eliminar/', views.eliminar_busqueda, name='eliminar_busqueda'),
+
+    # Notificaciones
+    path('notificaciones/', views.notificaciones_lista, name='notificaciones'),
+    path('notificaciones/<int:notificacion_id>/leer/', views.marcar_notificacion_leida, name='marcar_notificacion_leida'),
+    path('notificaciones/leer-todas/', views.marcar_todas_leidas, name='marcar_todas_leidas'),
+
     # Perfiles
     path('perfil/', views.mi_perfil, name='mi_perfil'),
     path('perfil/empresa/', views.perfil_empresa, name='perfil_empresa'),
     path('perfil/postulante/', views.perfil_postulante_view, name='perfil_postulante'),
+
+    # API JSON (solo lectura)
+    path('api/ofertas/', views.api_ofertas, name='api_ofertas'),
+    path('api/ofertas/<int:oferta_id>/', views.api_oferta, name='api_oferta'),
+    path('api/categorias/', views.api_categorias, name='api_categorias'),
+    path('api/empresas/', views.api_empresas, name='api_empresas'),
+    path('api/empresas/<int:empresa_id>/', views.api_empresa, name='api_empresa'),
+
+    # Administración
+    path('rendimiento/', views.rendimiento, name='rendimiento'),
 ]
@@ -1,14 +1,22 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count
-from django.core.paginator import Paginator
+from django.db.models import Q, Count, F, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 from .models import (
     Usuario, Categoria, Empresa, PerfilPostulante,
-    OfertaTrabajo, Postulacion, Favorito, Notificacion
+    OfertaTrabajo, Postulacion, Favorito, Notificacion, BusquedaGuardada, MetricaDiariaOferta
 )
+from . import (
+    alertas, api, busqueda, concurrencia, condicional, exportacion, facetas, instrumentacion, match,
+    metricas, notificaciones, portada, recomendaciones, similares, tarjetas, transiciones, vistas
+)
+from .paginacion import PaginadorCursor
 
 # Views del sistema EMPLEOYA
 # Acá están todas las funciones para mostrar las páginas web
@@ -17,35 +25,21 @@ from .models import (
 
 def home(request):
     """Página de inicio pública"""
-    # Obtener ofertas destacadas (últimas 6 ofertas activas)
-    ofertas_destacadas = OfertaTrabajo.objects.filter(
-        estado='activa',
-        aprobada_admin=True
-    ).select_related('empresa', 'categoria').order_by('-fecha_publicacion')[:6]
-
-    # Obtener categorías con conteo de ofertas
-    categorias = Categoria.objects.filter(activa=True).annotate(
-        num_ofertas=Count('ofertas', filter=Q(ofertas__estado='activa'))
-    )[:8]
-
-    # Estadísticas generales
-    stats = {
-        'total_ofertas': OfertaTrabajo.objects.filter(estado='activa').count(),
-        'total_empresas': Empresa.objects.count(),
-        'total_postulantes': PerfilPostulante.objects.count(),
-        'total_categorias': Categoria.objects.filter(activa=True).count(),
-    }
-
-    context = {
-        'ofertas_destacadas': ofertas_destacadas,
-        'categorias': categorias,
-        'stats': stats,
-    }
+    # Estadísticas, categorías y ofertas destacadas desde caché (ver portada.py)
+    context = portada.obtener_snapshot()
+    # HTML de las tarjetas desde caché (ver tarjetas.py)
+    tarjetas.preparar(context['ofertas_destacadas'], 'portada')
     return render(request, 'MyWebApps/home.html', context)
 
 
 def ofertas_lista(request):
     """Lista de ofertas con filtros y búsqueda"""
+    # Si el cliente ya tiene esta versión del listado, 304 sin más consultas (ver condicional.py)
+    validadores = condicional.validadores_listado(request)
+    respuesta = condicional.no_modificada(request, validadores)
+    if respuesta is not None:
+        return respuesta
+
     ofertas = OfertaTrabajo.objects.filter(
         estado='activa',
         aprobada_admin=True
@@ -57,13 +51,26 @@ def ofertas_lista(request):
     modalidad = request.GET.get('modalidad', '')
     ubicacion = request.GET.get('ubicacion', '')
     tipo_contrato = request.GET.get('tipo_contrato', '')
+    nivel_experiencia = request.GET.get('nivel_experiencia', '')
+
+    # Ordenamiento
+    orden = request.GET.get('orden', '-fecha_publicacion')
+    if orden not in api.ORDENES_OFERTAS or (orden == 'relevancia' and not search):
+        orden = '-fecha_publicacion'
 
     if search:
-        ofertas = ofertas.filter(
-            Q(titulo__icontains=search) |
-            Q(descripcion__icontains=search) |
-            Q(empresa__nombre_empresa__icontains=search)
-        )
+        ofertas = busqueda.filtrar_ofertas(ofertas, search, relevancia=(orden == 'relevancia'))
+
+    if ubicacion:
+        ofertas = ofertas.filter(ubicacion__icontains=ubicacion)
+
+    # Conteos por faceta (una consulta agrupada, en caché por filtros)
+    conteos, total = facetas.contar(ofertas, search, ubicacion, {
+        'categoria': categoria_id,
+        'modalidad': modalidad,
+        'tipo_contrato': tipo_contrato,
+        'nivel_experiencia': nivel_experiencia,
+    })
 
     if categoria_id:
         ofertas = ofertas.filter(categoria_id=categoria_id)
@@ -71,48 +78,66 @@ def ofertas_lista(request):
     if modalidad:
         ofertas = ofertas.filter(modalidad=modalidad)
 
-    if ubicacion:
-        ofertas = ofertas.filter(ubicacion__icontains=ubicacion)
-
     if tipo_contrato:
         ofertas = ofertas.filter(tipo_contrato=tipo_contrato)
 
-    # Ordenamiento
-    orden = request.GET.get('orden', '-fecha_publicacion')
-    ofertas = ofertas.order_by(orden)
+    if nivel_experiencia:
+        ofertas = ofertas.filter(nivel_experiencia=nivel_experiencia)
 
-    # Paginación
-    paginator = Paginator(ofertas, 12)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    # Paginación por cursor (sin COUNT ni OFFSET por página)
+    paginador = PaginadorCursor(ofertas, orden, por_pagina=12)
+    page_obj = paginador.get_page(request.GET.get('cursor'))
+    page_obj.total = total
+    tarjetas.preparar(page_obj, 'listado')
 
-    # Datos para filtros
-    categorias = Categoria.objects.filter(activa=True)
+    # Filtros actuales para los enlaces de navegación
+    filtros = request.GET.copy()
+    filtros.pop('cursor', None)
+    filtros.pop('page', None)
+
+    # Datos para filtros, con el número de ofertas de cada opción
+    categorias = list(Categoria.objects.filter(activa=True))
+    for cat in categorias:
+        cat.num_ofertas = conteos['categoria'].get(str(cat.id), 0)
 
     context = {
         'page_obj': page_obj,
         'categorias': categorias,
+        'opciones_modalidad': facetas.opciones(OfertaTrabajo.MODALIDAD_CHOICES, conteos['modalidad']),
+        'opciones_tipo_contrato': facetas.opciones(OfertaTrabajo.TIPO_CONTRATO_CHOICES, conteos['tipo_contrato']),
+        'opciones_nivel_experiencia': facetas.opciones(
+            OfertaTrabajo.NIVEL_EXPERIENCIA_CHOICES, conteos['nivel_experiencia']
+        ),
         'search': search,
         'categoria_id': categoria_id,
         'modalidad': modalidad,
         'ubicacion': ubicacion,
         'tipo_contrato': tipo_contrato,
+        'nivel_experiencia': nivel_experiencia,
         'orden': orden,
+        'filtros_qs': filtros.urlencode(),
     }
-    return render(request, 'MyWebApps/ofertas_lista.html', context)
+    return condicional.marcar(request, render(request, 'MyWebApps/ofertas_lista.html', context), validadores)
 
 
 def oferta_detalle(request, oferta_id):
     """Detalle de una oferta específica"""
+    validadores = condicional.validadores_oferta(request, oferta_id)
+    respuesta = condicional.no_modificada(request, validadores)
+    if respuesta is not None:
+        # La visita cuenta aunque la página no se vuelva a enviar
+        vistas.registrar_vista(request, OfertaTrabajo(pk=oferta_id))
+        return respuesta
+
     oferta = get_object_or_404(
         OfertaTrabajo.objects.select_related('empresa', 'categoria'),
         id=oferta_id,
         estado='activa'
     )
 
-    # Incrementar vistas
-    oferta.vistas += 1
-    oferta.save(update_fields=['vistas'])
+    # Registrar la vista (se escribe en lote, fuera de la petición)
+    vistas.registrar_vista(request, oferta)
+    oferta.vistas = vistas.vistas_actuales(oferta)
 
     # Verificar si el usuario ya postuló
     ya_postulo = False
@@ -122,19 +147,15 @@ def oferta_detalle(request, oferta_id):
             postulante=request.user.perfil_postulante
         ).exists()
 
-    # Ofertas similares
-    ofertas_similares = OfertaTrabajo.objects.filter(
-        categoria=oferta.categoria,
-        estado='activa',
-        aprobada_admin=True
-    ).exclude(id=oferta.id).select_related('empresa')[:4]
+    # Ofertas similares (vecinas por contenido, precalculadas)
+    ofertas_similares = tarjetas.preparar(similares.obtener(oferta, 4), 'similar')
 
     context = {
         'oferta': oferta,
         'ya_postulo': ya_postulo,
         'ofertas_similares': ofertas_similares,
     }
-    return render(request, 'MyWebApps/oferta_detalle.html', context)
+    return condicional.marcar(request, render(request, 'MyWebApps/oferta_detalle.html', context), validadores)
 
 
 # ==================== AUTENTICACIÓN ====================
@@ -229,33 +250,31 @@ def dashboard(request):
 
 
 @login_required
-def dashboard_empleador(request):
-    """Dashboard para empleadores"""
-    if request.user.tipo_usuario != 'empleador':
+async def dashboard_empleador(request):
+    """Dashboard para empleadores (las tres consultas del panel van a la vez)"""
+    usuario = await concurrencia.usuario(request)
+    if usuario.tipo_usuario != 'empleador':
         messages.error(request, 'No tienes permiso para acceder a esta página')
         return redirect('dashboard')
 
-    empresa = get_object_or_404(Empresa, usuario=request.user)
-
-    # Estadísticas
+    empresa = await aget_object_or_404(Empresa, usuario=usuario)
     ofertas = OfertaTrabajo.objects.filter(empresa=empresa)
-    stats = {
-        'total_ofertas': ofertas.count(),
-        'ofertas_activas': ofertas.filter(estado='activa').count(),
-        'total_postulaciones': Postulacion.objects.filter(oferta__empresa=empresa).count(),
-        'postulaciones_pendientes': Postulacion.objects.filter(
-            oferta__empresa=empresa,
-            estado='pendiente'
-        ).count(),
-    }
-
-    # Últimas ofertas
-    ultimas_ofertas = ofertas.order_by('-fecha_creacion')[:5]
 
-    # Últimas postulaciones
-    ultimas_postulaciones = Postulacion.objects.filter(
-        oferta__empresa=empresa
-    ).select_related('postulante__usuario', 'oferta').order_by('-fecha_postulacion')[:10]
+    stats, ultimas_ofertas, ultimas_postulaciones = await concurrencia.simultaneas(
+        # Estadísticas (en una sola consulta, desde los contadores de cada oferta)
+        lambda: ofertas.aggregate(
+            total_ofertas=Count('id'),
+            ofertas_activas=Count('id', filter=Q(estado='activa')),
+            total_postulaciones=Coalesce(Sum('postulaciones_total'), 0),
+            postulaciones_pendientes=Coalesce(Sum('postulaciones_pendiente'), 0),
+        ),
+        # Últimas ofertas
+        lambda: list(ofertas.select_related('categoria').order_by('-fecha_creacion')[:5]),
+        # Últimas postulaciones
+        lambda: list(Postulacion.objects.filter(
+            oferta__empresa=empresa
+        ).select_related('postulante__usuario', 'oferta').order_by('-fecha_postulacion')[:10]),
+    )
 
     context = {
         'empresa': empresa,
@@ -263,37 +282,33 @@ def dashboard_empleador(request):
         'ultimas_ofertas': ultimas_ofertas,
         'ultimas_postulaciones': ultimas_postulaciones,
     }
-    return render(request, 'MyWebApps/dashboard_empleador.html', context)
+    return await concurrencia.renderizar(request, 'MyWebApps/dashboard_empleador.html', context)
 
 
 @login_required
-def dashboard_postulante(request):
-    """Dashboard para postulantes"""
-    if request.user.tipo_usuario != 'postulante':
+async def dashboard_postulante(request):
+    """Dashboard para postulantes (estadísticas, postulaciones y recomendaciones van a la vez)"""
+    usuario = await concurrencia.usuario(request)
+    if usuario.tipo_usuario != 'postulante':
         messages.error(request, 'No tienes permiso para acceder a esta página')
         return redirect('dashboard')
 
-    perfil = get_object_or_404(PerfilPostulante, usuario=request.user)
-
-    # Estadísticas
+    perfil = await aget_object_or_404(PerfilPostulante, usuario=usuario)
     postulaciones = Postulacion.objects.filter(postulante=perfil)
-    stats = {
-        'total_postulaciones': postulaciones.count(),
-        'en_proceso': postulaciones.filter(estado__in=['pendiente', 'en_revision', 'preseleccionado', 'entrevista']).count(),
-        'aceptadas': postulaciones.filter(estado='aceptado').count(),
-        'rechazadas': postulaciones.filter(estado='rechazado').count(),
-    }
 
-    # Últimas postulaciones
-    ultimas_postulaciones = postulaciones.select_related('oferta__empresa').order_by('-fecha_postulacion')[:10]
-
-    # Ofertas recomendadas (según categoría de interés o ubicación)
-    ofertas_recomendadas = OfertaTrabajo.objects.filter(
-        estado='activa',
-        aprobada_admin=True
-    ).exclude(
-        postulaciones__postulante=perfil
-    ).select_related('empresa', 'categoria')[:6]
+    stats, ultimas_postulaciones, ofertas_recomendadas = await concurrencia.simultaneas(
+        # Estadísticas (en una sola consulta)
+        lambda: postulaciones.aggregate(
+            total_postulaciones=Count('id'),
+            en_proceso=Count('id', filter=Q(estado__in=['pendiente', 'en_revision', 'preseleccionado', 'entrevista'])),
+            aceptadas=Count('id', filter=Q(estado='aceptado')),
+            rechazadas=Count('id', filter=Q(estado='rechazado')),
+        ),
+        # Últimas postulaciones
+        lambda: list(postulaciones.select_related('oferta__empresa').order_by('-fecha_postulacion')[:10]),
+        # Ofertas recomendadas (precalculadas según el match con el perfil)
+        lambda: tarjetas.preparar(recomendaciones.obtener(perfil, 6), 'recomendada'),
+    )
 
     context = {
         'perfil': perfil,
@@ -301,7 +316,7 @@ def dashboard_postulante(request):
         'ultimas_postulaciones': ultimas_postulaciones,
         'ofertas_recomendadas': ofertas_recomendadas,
     }
-    return render(request, 'MyWebApps/dashboard_postulante.html', context)
+    return await concurrencia.renderizar(request, 'MyWebApps/dashboard_postulante.html', context)
 
 
 # ==================== GESTIÓN DE OFERTAS (EMPLEADOR) ====================
@@ -314,7 +329,9 @@ def mis_ofertas(request):
         return redirect('dashboard')
 
     empresa = get_object_or_404(Empresa, usuario=request.user)
-    ofertas = OfertaTrabajo.objects.filter(empresa=empresa).order_by('-fecha_creacion')
+    ofertas = OfertaTrabajo.objects.filter(
+        empresa=empresa
+    ).select_related('categoria').order_by('-fecha_creacion')
 
     context = {'ofertas': ofertas, 'empresa': empresa}
     return render(request, 'MyWebApps/mis_ofertas.html', context)
@@ -373,24 +390,140 @@ def postulaciones_oferta(request, oferta_id):
         postulacion_id = request.POST.get('postulacion_id')
         nuevo_estado = request.POST.get('nuevo_estado')
         postulacion = get_object_or_404(Postulacion, id=postulacion_id, oferta=oferta)
+        if not postulacion.puede_cambiar_a(nuevo_estado):
+            messages.error(request, f'No se puede pasar una postulación de "{postulacion.get_estado_display()}" a ese estado')
+            return redirect('postulaciones_oferta', oferta_id=oferta_id)
         postulacion.estado = nuevo_estado
-        if nuevo_estado != 'pendiente':
-            postulacion.fecha_revision = timezone.now()
         postulacion.save()
         messages.success(request, f'Estado actualizado a: {postulacion.get_estado_display()}')
         return redirect('postulaciones_oferta', oferta_id=oferta_id)
 
+    # Ordenar por fecha o por puntuación de match
+    orden = request.GET.get('orden', 'fecha')
+    if orden == 'match':
+        criterio = [F('puntuacion_match').desc(nulls_last=True), '-fecha_postulacion']
+    else:
+        criterio = ['-fecha_postulacion']
+
     postulaciones = Postulacion.objects.filter(
         oferta=oferta
-    ).select_related('postulante__usuario').order_by('-fecha_postulacion')
+    ).select_related('postulante__usuario').order_by(*criterio)
 
     context = {
         'oferta': oferta,
         'postulaciones': postulaciones,
+        'orden': orden,
+        'estados': Postulacion.ESTADO_CHOICES,
+        'estados_modificables': transiciones.estados_modificables(),
     }
     return render(request, 'MyWebApps/postulaciones_oferta.html', context)
 
 
+def _exportar(request, consulta, nombre):
+    """Respuesta en streaming con las postulaciones en el formato pedido (?formato=csv|jsonl)"""
+    formato = request.GET.get('formato', 'csv')
+    if formato not in exportacion.GENERADORES:
+        formato = 'csv'
+    estado = request.GET.get('estado')
+    if estado in dict(Postulacion.ESTADO_CHOICES):
+        consulta = consulta.filter(estado=estado)
+
+    response = StreamingHttpResponse(
+        exportacion.GENERADORES[formato](exportacion.filas(consulta)),
+        content_type=exportacion.TIPOS_CONTENIDO[formato],
+    )
+    fecha = timezone.localdate().isoformat()
+    response['Content-Disposition'] = f'attachment; filename="{nombre}-{fecha}.{formato}"'
+    return response
+
+
+@login_required
+def exportar_postulaciones(request, oferta_id):
+    """Descargar las postulaciones de una oferta"""
+    if request.user.tipo_usuario != 'empleador':
+        messages.error(request, 'No tienes permiso para acceder a esta página')
+        return redirect('dashboard')
+
+    empresa = get_object_or_404(Empresa, usuario=request.user)
+    oferta = get_object_or_404(OfertaTrabajo, id=oferta_id, empresa=empresa)
+    return _exportar(request, exportacion.postulaciones(oferta=oferta), f'postulaciones-oferta-{oferta.id}')
+
+
+@login_required
+def exportar_postulaciones_empresa(request):
+    """Descargar las postulaciones de todas las ofertas de la empresa"""
+    if request.user.tipo_usuario != 'empleador':
+        messages.error(request, 'No tienes permiso para acceder a esta página')
+        return redirect('dashboard')
+
+    empresa = get_object_or_404(Empresa, usuario=request.user)
+    return _exportar(request, exportacion.postulaciones(empresa=empresa), 'postulaciones')
+
+
+@login_required
+def cambiar_estado_postulaciones(request, oferta_id):
+    """Cambiar el estado de varias postulaciones de una oferta a la vez"""
+    if request.user.tipo_usuario != 'empleador':
+        messages.error(request, 'No tienes permiso para acceder a esta página')
+        return redirect('dashboard')
+
+    empresa = get_object_or_404(Empresa, usuario=request.user)
+    oferta = get_object_or_404(OfertaTrabajo, id=oferta_id, empresa=empresa)
+
+    if request.method == 'POST':
+        ids = [pk for pk in request.POST.getlist('postulaciones') if pk.isdigit()]
+        nuevo_estado = request.POST.get('nuevo_estado')
+
+        if not ids:
+            messages.warning(request, 'Selecciona al menos una postulación')
+        elif nuevo_estado not in Postulacion.TRANSICIONES_PERMITIDAS:
+            messages.error(request, 'Estado no válido')
+        else:
+            cambiadas, omitidas = transiciones.cambiar_estado(oferta, ids, nuevo_estado)
+            estado_display = dict(Postulacion.ESTADO_CHOICES)[nuevo_estado]
+            if cambiadas:
+                messages.success(request, f'{cambiadas} postulaciones pasaron a: {estado_display}')
+            if omitidas:
+                messages.warning(request, f'{omitidas} postulaciones no se cambiaron porque su estado actual no lo permite')
+
+    return redirect('postulaciones_oferta', oferta_id=oferta_id)
+
+
+@login_required
+def analiticas(request):
+    """Vistas, postulaciones y embudo por día de las ofertas del empleador (o de una con ?oferta=)"""
+    if request.user.tipo_usuario != 'empleador':
+        messages.error(request, 'No tienes permiso para acceder a esta página')
+        return redirect('dashboard')
+
+    empresa = get_object_or_404(Empresa, usuario=request.user)
+    dias = request.GET.get('dias', '')
+    dias = int(dias) if dias.isdigit() and int(dias) in metricas.PERIODOS else 30
+    desde, hasta = metricas.rango(dias)
+
+    # Solo se leen las métricas diarias, no las postulaciones
+    consulta = MetricaDiariaOferta.objects.filter(oferta__empresa=empresa)
+    oferta = None
+    if request.GET.get('oferta', '').isdigit():
+        oferta = get_object_or_404(OfertaTrabajo.objects.only('titulo'), pk=request.GET['oferta'], empresa=empresa)
+        consulta = consulta.filter(oferta=oferta)
+
+    serie, totales = metricas.serie_diaria(consulta, desde, hasta)
+    context = {
+        'empresa': empresa,
+        'oferta': oferta,
+        'dias': dias,
+        'periodos': metricas.PERIODOS,
+        'desde': desde,
+        'hasta': hasta,
+        'serie': serie,
+        'totales': totales,
+        'embudo': metricas.embudo(totales),
+        'por_oferta': None if oferta else metricas.por_oferta(consulta, desde, hasta),
+    }
+    return render(request, 'MyWebApps/analiticas.html', context)
+
+
 # ==================== POSTULACIONES (POSTULANTE) ====================
 
 @login_required
@@ -413,7 +546,8 @@ def postular_oferta(request, oferta_id):
             oferta=oferta,
             postulante=perfil,
             carta_presentacion=request.POST.get('carta_presentacion', ''),
-            cv_url_postulacion=perfil.cv_url
+            cv_url_postulacion=perfil.cv_url,
+            puntuacion_match=match.calcular_puntuacion(perfil, oferta)
         )
 
         messages.success(request, '¡Postulación enviada exitosamente!')
@@ -439,6 +573,85 @@ def mis_postulaciones(request):
     return render(request, 'MyWebApps/mis_postulaciones.html', context)
 
 
+# ==================== BÚSQUEDAS GUARDADAS ====================
+
+@login_required
+def guardar_busqueda(request):
+    """Guardar los filtros actuales del listado de ofertas como alerta"""
+    if request.user.tipo_usuario != 'postulante':
+        messages.error(request, 'Solo los postulantes pueden guardar búsquedas')
+        return redirect('ofertas_lista')
+
+    if request.method == 'POST':
+        if request.user.busquedas_guardadas.count() >= alertas.MAXIMO_POR_USUARIO:
+            messages.error(request, f'Puedes guardar hasta {alertas.MAXIMO_POR_USUARIO} búsquedas')
+            return redirect('mis_busquedas')
+
+        categoria_id = request.POST.get('categoria', '')
+        modalidad = request.POST.get('modalidad', '')
+        tipo_contrato = request.POST.get('tipo_contrato', '')
+        BusquedaGuardada.objects.create(
+            usuario=request.user,
+            texto=request.POST.get('search', '').strip()[:200],
+            categoria=Categoria.objects.filter(id=categoria_id).first() if categoria_id.isdigit() else None,
+            modalidad=modalidad if modalidad in dict(OfertaTrabajo.MODALIDAD_CHOICES) else '',
+            tipo_contrato=tipo_contrato if tipo_contrato in dict(OfertaTrabajo.TIPO_CONTRATO_CHOICES) else '',
+            ubicacion=request.POST.get('ubicacion', '').strip()[:200],
+        )
+        messages.success(request, 'Búsqueda guardada. Te avisaremos cuando se publiquen ofertas que coincidan')
+
+    return redirect('mis_busquedas')
+
+
+@login_required
+def mis_busquedas(request):
+    """Búsquedas guardadas del usuario"""
+    busquedas = request.user.busquedas_guardadas.select_related('categoria')
+    context = {'busquedas': busquedas}
+    return render(request, 'MyWebApps/mis_busquedas.html', context)
+
+
+@login_required
+def eliminar_busqueda(request, busqueda_id):
+    """Eliminar una búsqueda guardada"""
+    busqueda_guardada = get_object_or_404(BusquedaGuardada, id=busqueda_id, usuario=request.user)
+    if request.method == 'POST':
+        busqueda_guardada.delete()
+        messages.success(request, 'Búsqueda eliminada')
+    return redirect('mis_busquedas')
+
+
+# ==================== NOTIFICACIONES ====================
+
+@login_required
+def notificaciones_lista(request):
+    """Últimas notificaciones del usuario"""
+    lista = Notificacion.objects.filter(usuario=request.user).order_by('-fecha_creacion')[:50]
+    context = {'notificaciones': lista}
+    return render(request, 'MyWebApps/notificaciones.html', context)
+
+
+@login_required
+def marcar_notificacion_leida(request, notificacion_id):
+    """Marcar una notificación como leída y abrir su enlace"""
+    notificacion = get_object_or_404(Notificacion, id=notificacion_id, usuario=request.user)
+    if request.method == 'POST':
+        notificaciones.marcar_leida(request.user, notificacion.id)
+        if notificacion.enlace and url_has_allowed_host_and_scheme(notificacion.enlace, allowed_hosts={request.get_host()}):
+            return redirect(notificacion.enlace)
+    return redirect('notificaciones')
+
+
+@login_required
+def marcar_todas_leidas(request):
+    """Marcar todas las notificaciones como leídas"""
+    if request.method == 'POST':
+        marcadas = notificaciones.marcar_todas_leidas(request.user)
+        if marcadas:
+            messages.success(request, f'{marcadas} notificaciones marcadas como leídas')
+    return redirect('notificaciones')
+
+
 # ==================== PERFILES ====================
 
 @login_required
@@ -504,3 +717,57 @@ def perfil_postulante_view(request):
 
     context = {'perfil': perfil}
     return render(request, 'MyWebApps/perfil_postulante.html', context)
+
+
+# ==================== API JSON ====================
+# Solo lectura; ?fields= elige los campos y ?cursor= pagina (ver api.py)
+
+@require_GET
+def api_ofertas(request):
+    """Ofertas publicadas con los mismos filtros y órdenes que el listado"""
+    return api.responder(request, lambda: api.listar_ofertas(request.GET))
+
+
+@require_GET
+def api_oferta(request, oferta_id):
+    """Detalle de una oferta publicada"""
+    return api.responder(request, lambda: api.detalle_oferta(request.GET, oferta_id))
+
+
+@require_GET
+def api_categorias(request):
+    """Categorías activas"""
+    return api.responder(request, lambda: api.listar_categorias(request.GET))
+
+
+@require_GET
+def api_empresas(request):
+    """Empresas, paginadas por cursor"""
+    return api.responder(request, lambda: api.listar_empresas(request.GET))
+
+
+@require_GET
+def api_empresa(request, empresa_id):
+    """Detalle de una empresa"""
+    return api.responder(request, lambda: api.detalle_empresa(request.GET, empresa_id))
+
+
+# ==================== ADMINISTRACIÓN ====================
+
+@login_required
+def rendimiento(request):
+    """Tiempos y consultas por ruta medidos en este proceso (solo administradores)"""
+    if request.user.tipo_usuario != 'admin':
+        messages.error(request, 'No tienes permiso para acceder a esta página')
+        return redirect('dashboard')
+
+    if request.method == 'POST':
+        instrumentacion.reiniciar()
+        messages.success(request, 'Mediciones reiniciadas')
+        return redirect('rendimiento')
+
+    context = {
+        'rutas': instrumentacion.resumen(),
+        'limites': instrumentacion.LIMITES_MS,
+    }
+    return render(request, 'MyWebApps/rendimiento.html', context)
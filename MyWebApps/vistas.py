@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+# Contador de vistas con escritura diferida (write-behind)
+# Cada visita al detalle de una oferta solo incrementa un contador en memoria;
+# los incrementos se vuelcan en lote con UPDATE ... SET vistas = vistas + n
+# cuando pasa el intervalo configurado o se acumulan demasiados pendientes.
+# El volcado se hace al terminar la petición (ver signals.py), fuera del tiempo
+# de respuesta. Si el proceso se detiene se pierden como mucho los incrementos
+# de un intervalo. En la misma transacción se suman a las métricas del día
+# (ver metricas.py).
+#
+# Con VISTAS_VENTANA_DEDUPE > 0 cada visitante (su cookie de sesión o, si no
+# tiene, su IP, siempre como hash) cuenta una vista por oferta dentro de la
+# ventana. La marca es una clave de caché con esa duración (alias
+# VISTAS_CACHE), así contar una vista nunca escribe la sesión.
+
+CLAVE_VISTO = 'vistas:visto'
+
+
+class ContadorVistas:
+    """Acumula vistas por oferta dentro del proceso y las vuelca en lote"""
+
+    def __init__(self, intervalo=10, maximo_pendientes=200):
+        self.intervalo = intervalo
+        self.maximo_pendientes = maximo_pendientes
+        self._lock = threading.Lock()
+        self._pendientes = Counter()
+        self._total_pendiente = 0
+        self._ultimo_volcado = time.monotonic()
+
+    def registrar(self, oferta_id, cantidad=1):
+        """Sumar vistas a una oferta (sin tocar la base de datos)"""
+        with self._lock:
+            self._pendientes[oferta_id] += cantidad
+            self._total_pendiente += cantidad
+
+    def pendientes(self, oferta_id):
+        """Vistas aún no volcadas de una oferta"""
+        with self._lock:
+            return self._pendientes.get(oferta_id, 0)
+
+    def debe_volcar(self):
+        with self._lock:
+            if not self._total_pendiente:
+                return False
+            return (
+                self._total_pendiente >= self.maximo_pendientes or
+                time.monotonic() - self._ultimo_volcado >= self.intervalo
+            )
+
+    def volcar(self):
+        """Escribir los incrementos pendientes. Devuelve el número de ofertas actualizadas"""
+        from . import metricas
+        from .models import OfertaTrabajo
+
+        with self._lock:
+            pendientes = self._pendientes
+            self._pendientes = Counter()
+            self._total_pendiente = 0
+            self._ultimo_volcado = time.monotonic()
+
+        if not pendientes:
+            return 0
+
+        # Un UPDATE por cada cantidad distinta, no uno por oferta
+        por_cantidad = defaultdict(list)
+        for oferta_id, cantidad in pendientes.items():
+            por_cantidad[cantidad].append(oferta_id)
+
+        try:
+            with transaction.atomic():
+                for cantidad, ids in por_cantidad.items():
+                    OfertaTrabajo.objects.filter(pk__in=ids).update(vistas=F('vistas') + cantidad)
+                metricas.sumar_vistas(por_cantidad)
+        except Exception:
+            # Devolver los incrementos al buffer para el siguiente intento
+            with self._lock:
+                self._pendientes.update(pendientes)
+                self._total_pendiente += sum(pendientes.values())
+            raise
+
+        return len(pendientes)
+
+
+contador = ContadorVistas(
+    intervalo=getattr(settings, 'VISTAS_INTERVALO_VOLCADO', 10),
+    maximo_pendientes=getattr(settings, 'VISTAS_MAXIMO_PENDIENTES', 200),
+)
+
+
+def _visitante(request):
+    """Hash de la cookie de sesión o, sin sesión, de la IP"""
+    origen = request.COOKIES.get(settings.SESSION_COOKIE_NAME) or request.META.get('REMOTE_ADDR', '')
+    return hashlib.md5(origen.encode()).hexdigest()
+
+
+def registrar_vista(request, oferta):
+    """
+    Registrar la vista de una oferta desde una petición.
+    Si VISTAS_VENTANA_DEDUPE > 0, el mismo visitante no suma otra vista de
+    la misma oferta dentro de esa ventana (en segundos).
+    Devuelve True si la vista se contó.
+    """
+    ventana = getattr(settings, 'VISTAS_VENTANA_DEDUPE', 0)
+    if ventana:
+        cache = caches[getattr(settings, 'VISTAS_CACHE', 'default')]
+        # add() no pisa una marca vigente: False si ya contó dentro de la ventana
+        if not cache.add(f'{CLAVE_VISTO}:{_visitante(request)}:{oferta.pk}', True, ventana):
+            return False
+
+    contador.registrar(oferta.pk)
+    return True
+
+
+def vistas_actuales(oferta):
+    """Vistas guardadas más las pendientes de volcar en este proceso"""
+    return oferta.vistas + contador.pendientes(oferta.pk)
+
@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Para servir con ASGI (ver "Despliegue con ASGI" en el README):
+    uvicorn empleoya_django.asgi:application --workers 4
 """
 
 import os
@@ -41,7 +41,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero, para que sus tiempos incluyan a todos los demás middlewares
+    'MyWebApps.instrumentacion.InstrumentacionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Archivos de STATIC_ROOT precomprimidos y con caché larga (ver MyWebApps/estaticos.py)
+    'MyWebApps.estaticos.EstaticosMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -54,7 +58,8 @@ ROOT_URLCONF = 'empleoya_django.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates que además mide el tiempo de render (ver MyWebApps/instrumentacion.py)
+        'BACKEND': 'MyWebApps.instrumentacion.PlantillasInstrumentadas',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -62,6 +67,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'MyWebApps.context_processors.notificaciones',
             ],
         },
     },
@@ -116,15 +122,82 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic minifica el CSS, agrega el hash del contenido al nombre y
+# precomprime con gzip (y brotli si está instalado)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'MyWebApps.estaticos.AlmacenEstaticos',
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMemCache es por proceso; con varios workers conviene un backend compartido
+# (Redis o Memcached) para que el snapshot y los candados sean comunes.
+
+# LocMemCache borra un tercio de las entradas (las menos usadas) cuando pasa
+# MAX_ENTRIES, que por defecto es 300. Las tarjetas van en su propio alias para
+# que no desplacen a las claves chicas de 'default' (generaciones de facetas y
+# portada, candado del snapshot, conteos, respuestas de la API).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'empleoya',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Hasta 4 variantes por oferta activa: 20000 entradas cubren unas 5000
+    # ofertas activas, unos 20 MB por proceso (~1 KB por tarjeta). Subirlo
+    # junto con el catálogo.
+    'tarjetas': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'empleoya-tarjetas',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    # Marcas de VISTAS_VENTANA_DEDUPE, una por visitante y oferta vista en la
+    # ventana; son chicas. Si se llena solo se cuenta alguna vista de más
+    'vistas': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'empleoya-vistas',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+# Segundos que vive el snapshot de la página de inicio (además se invalida con cada cambio)
+HOME_SNAPSHOT_TTL = 600
+
+# Segundos que vive en caché el HTML de cada tarjeta de oferta (la clave cambia con cada edición)
+TARJETAS_TTL = 60 * 60 * 24
+
+# Alias de CACHES donde se guarda el HTML de las tarjetas
+TARJETAS_CACHE = 'tarjetas'
+
 # Custom User Model
 AUTH_USER_MODEL = 'MyWebApps.Usuario'
 
 # Media Files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Contador de vistas de ofertas (escritura diferida, ver MyWebApps/vistas.py)
+VISTAS_INTERVALO_VOLCADO = 10      # segundos entre volcados a la base de datos
+VISTAS_MAXIMO_PENDIENTES = 200     # volcar antes si se acumulan tantas vistas
+VISTAS_VENTANA_DEDUPE = 0          # segundos; > 0 cuenta una vista por visitante y oferta
+VISTAS_CACHE = 'vistas'            # alias de CACHES con las marcas de vistas ya contadas
+
+# Medición por petición: Server-Timing, log y histogramas (ver MyWebApps/instrumentacion.py)
+INSTRUMENTACION_HABILITADA = True
+INSTRUMENTACION_SERVER_TIMING = True    # agregar la cabecera Server-Timing a cada respuesta
+
+# Consultas independientes de los dashboards en paralelo (ver MyWebApps/concurrencia.py)
+CONSULTAS_SIMULTANEAS = True
+CONSULTAS_SIMULTANEAS_HILOS = 8         # hilos (y conexiones a la base) por proceso